@@ -0,0 +1,153 @@
+# PromptCraft - Activity Calendar
+# Días con actividad en un bitset indexado por día (rachas y heatmap)
+
+from datetime import date
+
+
+# Bits por palabra: enteros de 30 bits se guardan sin pérdida en JSON
+WORD_BITS = 30
+FULL_WORD = (1 << WORD_BITS) - 1
+
+# Día del bit 0
+ORIGIN = date(2020, 1, 1).toordinal()
+
+
+def empty_calendar():
+    """Calendario vacío tal como se guarda en el estado."""
+    return {'active': [], 'frozen': [], 'days': 0}
+
+
+def count_days(words):
+    """Bits encendidos en una lista de palabras (recuento completo)."""
+    return sum(bin(word).count('1') for word in words)
+
+
+def _locate(day):
+    offset = day - ORIGIN
+    return offset // WORD_BITS, offset % WORD_BITS
+
+
+def _run_length_down(word, bit):
+    """Unos consecutivos en `word` desde `bit` hacia abajo."""
+    mask = (1 << (bit + 1)) - 1
+    zeros = ~word & mask
+    if not zeros:
+        return bit + 1
+    return bit - (zeros.bit_length() - 1)
+
+
+class ActivityCalendar:
+    """
+    Días con actividad como bitset: bit = día - 2020-01-01.
+
+    'active' marca los días practicados y 'frozen' los cubiertos por un
+    freeze de racha; la racha cuenta ambos. 'days' es el total de días
+    activos, mantenido en mark(). Una década ocupa ~120 palabras. Las
+    rachas se calculan palabra a palabra: una palabra llena suma 30 días
+    de una vez y una vacía corta la racha sin mirar sus bits.
+
+    Args:
+        data: dict persistido {'active', 'frozen', 'days'}; se modifica
+            en sitio
+    """
+
+    def __init__(self, data):
+        self.data = data
+
+    def mark(self, day, frozen=False):
+        """
+        Marca un día (ordinal) como activo o cubierto por freeze.
+
+        Returns:
+            bool: True si el día no estaba marcado
+        """
+        if day < ORIGIN:
+            return False
+        words = self.data['frozen' if frozen else 'active']
+        index, bit = _locate(day)
+        if index >= len(words):
+            words.extend([0] * (index + 1 - len(words)))
+        if words[index] >> bit & 1:
+            return False
+        words[index] |= 1 << bit
+        if not frozen:
+            self.data['days'] = self.data.get('days', 0) + 1
+        return True
+
+    def _word(self, kind, index):
+        words = self.data[kind]
+        return words[index] if 0 <= index < len(words) else 0
+
+    def _covered(self, index):
+        return self._word('active', index) | self._word('frozen', index)
+
+    def is_active(self, day):
+        index, bit = _locate(day)
+        return day >= ORIGIN and bool(self._word('active', index) >> bit & 1)
+
+    def is_frozen(self, day):
+        index, bit = _locate(day)
+        return day >= ORIGIN and bool(self._word('frozen', index) >> bit & 1)
+
+    def run_ending(self, day):
+        """Días consecutivos (activos o con freeze) que terminan en `day`."""
+        if day < ORIGIN:
+            return 0
+        index, bit = _locate(day)
+        run = 0
+        while index >= 0:
+            word = self._covered(index)
+            if bit == WORD_BITS - 1 and word == FULL_WORD:
+                run += WORD_BITS
+            else:
+                length = _run_length_down(word, bit)
+                run += length
+                if length <= bit:
+                    break
+            index -= 1
+            bit = WORD_BITS - 1
+        return run
+
+    def current_streak(self, today):
+        """Racha vigente: termina hoy, o ayer si hoy aún no hay actividad."""
+        return self.run_ending(today) or self.run_ending(today - 1)
+
+    def active_days(self):
+        """Total de días activos. O(1)."""
+        return self.data.get('days', 0)
+
+    def days(self, count, today):
+        """
+        Estado de los últimos `count` días, del más antiguo a hoy.
+
+        Returns:
+            Lista de (día, 'active' | 'frozen' | None)
+        """
+        return [(day, self._status(day)) for day in range(today - count + 1, today + 1)]
+
+    def weeks(self, count, today):
+        """
+        Rejilla de `count` semanas (lunes a domingo) que termina en la
+        semana actual, para el heatmap. Coste fijo: count * 7 días.
+
+        Returns:
+            Lista de semanas; cada una, 7 tuplas (día, estado). Los días
+            futuros tienen estado 'future'.
+        """
+        first = today - date.fromordinal(today).weekday() - 7 * (count - 1)
+        grid = []
+        for week in range(count):
+            start = first + week * 7
+            grid.append([
+                (day, 'future' if day > today else self._status(day))
+                for day in range(start, start + 7)
+            ])
+        return grid
+
+    def _status(self, day):
+        if self.is_active(day):
+            return 'active'
+        if self.is_frozen(day):
+            return 'frozen'
+        return None
+
@@ -199,9 +199,16 @@ def get_badges(on_success=None, on_error=None):
 
 
 def get_leaderboard(type="weekly", on_success=None, on_error=None):
-    """No hay leaderboard en modo local."""
+    """Leaderboard local por ventana ('weekly', 'monthly', 'all_time')."""
+    from .gamification.leaderboard import get_windowed_leaderboard
+
+    board = get_windowed_leaderboard()
+    if type not in board.WINDOWS:
+        if on_error:
+            on_error({"error": f"Tipo de leaderboard desconocido: {type}"})
+        return
     if on_success:
-        on_success({"leaderboard": []})
+        on_success({"leaderboard": board.get_top(type, 10)})
 
 
 def get_streak_status(on_success=None, on_error=None):
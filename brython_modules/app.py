@@ -5,6 +5,7 @@ from browser import document, html, window
 
 from .state import get_state
 from .router import get_router, navigate
+from .scheduler import get_scheduler
 
 
 class App:
@@ -204,6 +205,13 @@ class App:
         router.on_not_found(self._not_found_page)
 
     def _update_navbar_display(self):
+        """
+        Programa la actualización del navbar.
+        Varios cambios en el mismo evento producen un solo render.
+        """
+        get_scheduler().schedule('navbar-xp', self._render_navbar_display)
+
+    def _render_navbar_display(self):
         """Actualiza el display del navbar con stats actuales."""
         state = self.state
         level_info = state.get_level_info()
@@ -256,6 +264,12 @@ class App:
         # Actualizar streak al iniciar
         self.state.update_streak()
 
+        # Logros de data/achievements.json (la racha se evalúa al cargar)
+        from .gamification.achievement_engine import get_achievement_engine
+        achievements = get_achievement_engine()
+        achievements.load()
+        achievements.on_event('activity')
+
         # Crear layout
         self.setup_layout()
 
@@ -265,16 +279,17 @@ class App:
         # Iniciar router
         self.router.start("app")
 
-        # Suscribirse a cambios de estado
-        self.state.subscribe(self._on_state_change)
+        # Suscribirse solo a los cambios que muestra el navbar
+        for path in ('progress.xp', 'progress.level'):
+            self.state.subscribe(self._on_state_change, path)
 
         self.initialized = True
         print("PromptCraft initialized!")
 
         return self
 
-    def _on_state_change(self, data):
-        """Callback cuando cambia el estado."""
+    def _on_state_change(self, changes):
+        """Callback cuando cambia el estado (dict {key: (new, old)})."""
         self._update_navbar_display()
 
 
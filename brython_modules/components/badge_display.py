@@ -3,9 +3,10 @@
 
 from browser import html
 from .base import Component
+from .memo import PureComponent
 
 
-class BadgeDisplay(Component):
+class BadgeDisplay(PureComponent):
     """
     Muestra un badge individual.
 
@@ -62,13 +63,12 @@ class BadgeDisplay(Component):
         'lg': {'container': 'w-24 h-24', 'icon': 'text-4xl', 'padding': 'p-4'},
     }
 
-    def render(self):
+    def render_pure(self):
         badge = self.props.get('badge', {})
         size = self.props.get('size', 'md')
         show_tooltip = self.props.get('show_tooltip', True)
         on_click = self.props.get('on_click')
 
-        badge_id = badge.get('id', '')
         name = badge.get('name', 'Badge')
         description = badge.get('description', '')
         badge_icon = badge.get('icon', '🏆')
@@ -94,7 +94,6 @@ class BadgeDisplay(Component):
 
         if on_click:
             badge_elem.Class += " cursor-pointer hover:scale-110 transition-transform"
-            badge_elem.bind('click', lambda e: on_click(badge_id))
 
         container <= badge_elem
 
@@ -133,6 +132,13 @@ class BadgeDisplay(Component):
 
         return container
 
+    def bind_events(self, element):
+        on_click = self.props.get('on_click')
+        if on_click:
+            badge_id = self.props.get('badge', {}).get('id', '')
+            # El círculo del badge es el primer hijo del contenedor
+            element.children[0].bind('click', lambda e: on_click(badge_id))
+
 
 class BadgeGrid(Component):
     """
@@ -186,7 +192,7 @@ class BadgeGrid(Component):
         return grid
 
 
-class BadgeProgress(Component):
+class BadgeProgress(PureComponent):
     """
     Muestra el progreso hacia un badge.
 
@@ -196,7 +202,7 @@ class BadgeProgress(Component):
         target: Valor objetivo
     """
 
-    def render(self):
+    def render_pure(self):
         badge = self.props.get('badge', {})
         current = self.props.get('current', 0)
         target = self.props.get('target', 1)
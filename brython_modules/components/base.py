@@ -1,19 +1,28 @@
 # PromptCraft - Base Component
 # Clase base para todos los componentes
 
-from browser import document, html
+from browser import document, html, timer
+from ..scheduler import get_scheduler
+from .lifecycle import get_lifecycle
 
 
 class Component:
     """
     Clase base para componentes UI.
     Proporciona métodos comunes para crear y gestionar elementos DOM.
+
+    Los componentes montados se registran en el ciclo de vida de la ruta
+    actual (ver lifecycle.py); scoped = False los mantiene entre rutas.
     """
 
+    scoped = True
+
     def __init__(self, **props):
         self.props = props
         self.element = None
         self._mounted = False
+        self._scope = None
+        self._resources = []
 
     def render(self):
         """
@@ -38,29 +47,51 @@ class Component:
         self.element = self.render()
         parent <= self.element
         self._mounted = True
+        get_lifecycle().register(self)
         self.on_mount()
         return self
 
     def unmount(self):
-        """Desmonta el componente del DOM."""
+        """Desmonta el componente del DOM y libera sus recursos."""
         if self.element and self._mounted:
+            get_scheduler().cancel_component(self)
             self.on_unmount()
+            self.release_resources()
             self.element.remove()
             self._mounted = False
+            get_lifecycle().unregister(self)
         return self
 
     def update(self, **new_props):
         """
-        Actualiza las props y re-renderiza el componente.
+        Actualiza las props y programa un re-render.
+        Varias llamadas en el mismo evento producen un solo render
+        en el siguiente frame (ver scheduler.py).
         """
         self.props.update(new_props)
         if self._mounted and self.element:
-            parent = self.element.parentNode
-            old_element = self.element
-            self.element = self.render()
-            parent.replaceChild(self.element, old_element)
+            get_scheduler().schedule_component(self)
         return self
 
+    def render_now(self):
+        """
+        Re-renderiza inmediatamente reemplazando el elemento actual.
+
+        Returns:
+            Elemento reemplazado, o None si no se pudo re-renderizar
+        """
+        if not (self._mounted and self.element):
+            return None
+
+        parent = self.element.parentNode
+        if not parent:
+            return None
+
+        old_element = self.element
+        self.element = self.render()
+        parent.replaceChild(self.element, old_element)
+        return old_element
+
     def on_mount(self):
         """Callback cuando el componente se monta. Override en subclases."""
         pass
@@ -69,6 +100,77 @@ class Component:
         """Callback cuando el componente se desmonta. Override en subclases."""
         pass
 
+    # =========================================================================
+    # RECURSOS (liberados automáticamente al desmontar)
+    # =========================================================================
+
+    def set_interval(self, callback, ms):
+        """Crea un interval asociado al componente."""
+        interval_id = timer.set_interval(callback, ms)
+        self._resources.append(('interval', interval_id))
+        get_lifecycle().track('intervals', 1)
+        return interval_id
+
+    def clear_interval(self, interval_id):
+        """Cancela un interval creado con set_interval."""
+        self._release(('interval', interval_id))
+
+    def set_timeout(self, callback, ms):
+        """Crea un timeout asociado al componente."""
+        resource = ['timeout', None]
+
+        def fire():
+            self._forget(tuple(resource))
+            callback()
+
+        resource[1] = timer.set_timeout(fire, ms)
+        self._resources.append(tuple(resource))
+        get_lifecycle().track('timeouts', 1)
+        return resource[1]
+
+    def clear_timeout(self, timeout_id):
+        """Cancela un timeout creado con set_timeout."""
+        self._release(('timeout', timeout_id))
+
+    def listen(self, target, event, handler):
+        """Enlaza un listener global (document/window) asociado al componente."""
+        target.bind(event, handler)
+        self._resources.append(('listener', (target, event, handler)))
+        get_lifecycle().track('listeners', 1)
+        return handler
+
+    def unlisten(self, target, event, handler):
+        """Desenlaza un listener creado con listen."""
+        self._release(('listener', (target, event, handler)))
+
+    def release_resources(self):
+        """Libera todos los intervals, timeouts y listeners del componente."""
+        for resource in list(self._resources):
+            self._release(resource)
+
+    def _release(self, resource):
+        """Libera un recurso concreto si sigue activo."""
+        if not self._forget(resource):
+            return
+
+        kind, handle = resource
+        if kind == 'interval':
+            timer.clear_interval(handle)
+        elif kind == 'timeout':
+            timer.clear_timeout(handle)
+        elif kind == 'listener':
+            target, event, handler = handle
+            target.unbind(event, handler)
+
+    def _forget(self, resource):
+        """Quita un recurso del registro sin liberarlo."""
+        if resource not in self._resources:
+            return False
+        self._resources.remove(resource)
+        kind = resource[0]
+        get_lifecycle().track(kind + 's', -1)
+        return True
+
     @staticmethod
     def create_icon(path_d, size="w-5 h-5", **attrs):
         """
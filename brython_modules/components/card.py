@@ -2,10 +2,11 @@
 # Tarjetas para mostrar contenido
 
 from browser import html
-from .base import Component, icon
+from .base import icon
+from .memo import PureComponent
 
 
-class Card(Component):
+class Card(PureComponent):
     """
     Componente de tarjeta genérica.
 
@@ -19,14 +20,13 @@ class Card(Component):
         on_click: Callback al hacer clic
     """
 
-    def render(self):
+    def render_pure(self):
         title = self.props.get('title')
         subtitle = self.props.get('subtitle')
         content = self.props.get('content')
         footer = self.props.get('footer')
         padding = self.props.get('padding', True)
         hover = self.props.get('hover', False)
-        on_click = self.props.get('on_click')
         extra_class = self.props.get('class', '')
 
         # Clases base
@@ -65,13 +65,15 @@ class Card(Component):
                 footer_div <= footer
             card <= footer_div
 
-        if on_click:
-            card.bind('click', on_click)
-
         return card
 
+    def bind_events(self, element):
+        on_click = self.props.get('on_click')
+        if on_click:
+            element.bind('click', on_click)
+
 
-class LessonCard(Component):
+class LessonCard(PureComponent):
     """
     Tarjeta para mostrar una lección.
 
@@ -107,11 +109,9 @@ class LessonCard(Component):
         'casos': '💼',
     }
 
-    def render(self):
+    def render_pure(self):
         lesson = self.props.get('lesson', {})
-        on_click = self.props.get('on_click')
 
-        lesson_id = lesson.get('id', '')
         title = lesson.get('title', 'Sin título')
         description = lesson.get('description', '')
         category = lesson.get('category', 'fundamentos')
@@ -186,14 +186,19 @@ class LessonCard(Component):
         content <= meta
         card <= content
 
-        # Bind click si no está bloqueada
-        if on_click and not locked:
-            card.bind('click', lambda e: on_click(lesson_id))
-
         return card
 
+    def bind_events(self, element):
+        lesson = self.props.get('lesson', {})
+        on_click = self.props.get('on_click')
+        lesson_id = lesson.get('id', '')
+
+        # Bind click si no está bloqueada
+        if on_click and not lesson.get('locked', False):
+            element.bind('click', lambda e: on_click(lesson_id))
+
 
-class PuzzleCard(Component):
+class PuzzleCard(PureComponent):
     """
     Tarjeta para mostrar un puzzle.
 
@@ -209,11 +214,9 @@ class PuzzleCard(Component):
         on_click: Callback al hacer clic
     """
 
-    def render(self):
+    def render_pure(self):
         puzzle = self.props.get('puzzle', {})
-        on_click = self.props.get('on_click')
 
-        puzzle_id = puzzle.get('id', '')
         title = puzzle.get('title', 'Puzzle')
         description = puzzle.get('description', '')
         difficulty = puzzle.get('difficulty', 1)
@@ -271,11 +274,14 @@ class PuzzleCard(Component):
 
         card <= content
 
-        if on_click:
-            card.bind('click', lambda e: on_click(puzzle_id))
-
         return card
 
+    def bind_events(self, element):
+        puzzle_id = self.props.get('puzzle', {}).get('id', '')
+        on_click = self.props.get('on_click')
+        if on_click:
+            element.bind('click', lambda e: on_click(puzzle_id))
+
 
 def card(**props):
     """Helper para crear tarjetas rápidamente."""
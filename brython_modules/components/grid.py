@@ -128,11 +128,8 @@ class LogicGrid(Component):
         if callback:
             callback(row_idx, col_idx, new_state)
 
-        # Re-render
-        if self._mounted and self.element:
-            parent = self.element.parentNode
-            self.unmount()
-            self.mount(parent)
+        # Re-render (agrupado por frame)
+        self.update()
 
     def _truncate_label(self, label, max_len=12):
         """Trunca un label si es muy largo."""
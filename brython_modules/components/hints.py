@@ -93,11 +93,8 @@ class HintSystem(Component):
             if callback:
                 callback(self.revealed_hints, hints[self.revealed_hints - 1])
 
-            # Re-render
-            if self._mounted and self.element:
-                parent = self.element.parentNode
-                self.unmount()
-                self.mount(parent)
+            # Re-render (agrupado por frame)
+            self.update()
 
     def get_revealed_count(self):
         """Obtiene el número de pistas reveladas."""
@@ -193,11 +190,8 @@ class ClueList(Component):
         if callback:
             callback(idx, idx in self.checked_clues)
 
-        # Re-render
-        if self._mounted and self.element:
-            parent = self.element.parentNode
-            self.unmount()
-            self.mount(parent)
+        # Re-render (agrupado por frame)
+        self.update()
 
     def get_checked(self):
         """Obtiene las pistas marcadas."""
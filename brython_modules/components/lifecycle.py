@@ -0,0 +1,115 @@
+# PromptCraft - Component Lifecycle
+# Registro de componentes montados y de sus recursos (intervals, listeners)
+
+from browser import console
+
+
+class LifecycleRegistry:
+    """
+    Registro global de componentes montados.
+
+    Cada componente montado pertenece a un scope (normalmente la ruta
+    actual). Al cambiar de ruta, el router llama a teardown_scope() para
+    desmontar el árbol de la página anterior, lo que ejecuta sus
+    on_unmount y libera intervals y listeners registrados.
+
+    Los componentes con scoped = False (p. ej. toasts) viven en el
+    scope 'global' y sobreviven a la navegación.
+    """
+
+    GLOBAL_SCOPE = 'global'
+
+    def __init__(self):
+        self.current_scope = None
+        self._components = {}
+        self.counters = {
+            'intervals': 0,
+            'timeouts': 0,
+            'listeners': 0,
+        }
+        self.totals = {
+            'mounted': 0,
+            'unmounted': 0,
+            'torn_down': 0,
+        }
+
+    def begin_scope(self, scope):
+        """Inicia un nuevo scope (ruta) para los siguientes montajes."""
+        self.current_scope = scope
+
+    def register(self, component):
+        """Registra un componente recién montado."""
+        scope = self.current_scope if component.scoped else self.GLOBAL_SCOPE
+        component._scope = scope
+        self._components.setdefault(scope, []).append(component)
+        self.totals['mounted'] += 1
+
+    def unregister(self, component):
+        """Elimina un componente del registro."""
+        scope = getattr(component, '_scope', None)
+        components = self._components.get(scope)
+        if components and component in components:
+            components.remove(component)
+            self.totals['unmounted'] += 1
+            if not components:
+                del self._components[scope]
+
+    def teardown_scope(self, scope=None):
+        """
+        Desmonta todos los componentes de un scope, hijos primero.
+
+        Args:
+            scope: Scope a desmontar (por defecto el actual)
+        """
+        if scope is None:
+            scope = self.current_scope
+
+        components = list(self._components.get(scope, []))
+        # Orden inverso de montaje: los hijos se montan después que el padre
+        for component in reversed(components):
+            try:
+                component.unmount()
+            except Exception as e:
+                console.log(f"[Lifecycle] Teardown error: {e}")
+            # Garantizar que no queda registrado aunque unmount falle
+            self.unregister(component)
+            self.totals['torn_down'] += 1
+
+        self._components.pop(scope, None)
+        return len(components)
+
+    def track(self, kind, delta):
+        """Actualiza el contador de un tipo de recurso."""
+        self.counters[kind] = max(0, self.counters.get(kind, 0) + delta)
+
+    def live_components(self, scope=None):
+        """Número de componentes montados (en un scope o en total)."""
+        if scope is not None:
+            return len(self._components.get(scope, []))
+        return sum(len(c) for c in self._components.values())
+
+    def debug_counters(self):
+        """Contadores de depuración: componentes vivos y recursos activos."""
+        return {
+            'components': self.live_components(),
+            'by_scope': {scope: len(c) for scope, c in self._components.items()},
+            'intervals': self.counters['intervals'],
+            'timeouts': self.counters['timeouts'],
+            'listeners': self.counters['listeners'],
+            'totals': dict(self.totals),
+        }
+
+
+# Instancia global del registro
+_lifecycle_instance = None
+
+def get_lifecycle():
+    """Obtiene la instancia singleton del registro de ciclo de vida."""
+    global _lifecycle_instance
+    if _lifecycle_instance is None:
+        _lifecycle_instance = LifecycleRegistry()
+    return _lifecycle_instance
+
+def debug_counters():
+    """Atajo para obtener los contadores de depuración."""
+    return get_lifecycle().debug_counters()
@@ -0,0 +1,182 @@
+# PromptCraft - Memoized Components
+# Componentes puros cacheados por huella de props
+
+import json
+from collections import OrderedDict
+from functools import wraps
+
+from .base import Component
+
+
+class LRUCache:
+    """
+    Caché LRU acotada.
+
+    Args:
+        maxsize: Número máximo de entradas
+    """
+
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Obtiene un valor y lo marca como usado recientemente."""
+        if key not in self._data:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._data.move_to_end(key)
+        return self._data[key]
+
+    def put(self, key, value):
+        """Guarda un valor, expulsando el menos usado si se excede el límite."""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key):
+        """Elimina y retorna un valor (o None)."""
+        return self._data.pop(key, None)
+
+    def clear(self):
+        """Vacía la caché."""
+        self._data.clear()
+
+    def keys(self):
+        """Claves en orden de uso (menos reciente primero)."""
+        return list(self._data.keys())
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+
+def _fingerprint_default(value):
+    """Serializa valores no-JSON para la huella."""
+    if callable(value):
+        # Solo importa si hay callback, no cuál (se re-enlaza en cada clon)
+        return '__callable__'
+    if isinstance(value, (set, frozenset, tuple)):
+        return sorted(value, key=str)
+    # Elementos DOM u objetos arbitrarios no son cacheables
+    raise TypeError(f"Unhashable prop: {type(value).__name__}")
+
+
+def props_fingerprint(props):
+    """
+    Calcula una huella estable de las props.
+
+    Returns:
+        str con la huella, o None si las props no son cacheables
+        (p. ej. contienen elementos DOM)
+    """
+    try:
+        return json.dumps(props, sort_keys=True, default=_fingerprint_default)
+    except (TypeError, ValueError):
+        return None
+
+
+# Cachés por clase de componente
+_component_caches = {}
+
+
+def _cache_for(cls):
+    """Obtiene (o crea) la caché de una clase de componente."""
+    cache = _component_caches.get(cls)
+    if cache is None:
+        cache = LRUCache(cls.CACHE_SIZE)
+        _component_caches[cls] = cache
+    return cache
+
+
+class PureComponent(Component):
+    """
+    Componente cuyo render depende solo de sus props.
+
+    El elemento se construye una vez por huella de props y se guarda
+    como plantilla desconectada; cada render entrega un clon
+    (cloneNode) y vuelve a enlazar los eventos con bind_events().
+
+    Las subclases implementan render_pure() en lugar de render().
+    """
+
+    CACHE_SIZE = 64
+
+    def render(self):
+        key = props_fingerprint(self.props)
+
+        if key is None:
+            element = self.render_pure()
+        else:
+            cache = _cache_for(type(self))
+            template = cache.get(key)
+            if template is None:
+                template = self.render_pure()
+                cache.put(key, template)
+            element = template.cloneNode(True)
+
+        self.bind_events(element)
+        return element
+
+    def render_pure(self):
+        """
+        Construye el elemento a partir de las props, sin enlazar eventos.
+        Debe ser sobrescrito por subclases.
+        """
+        raise NotImplementedError("Subclasses must implement render_pure()")
+
+    def bind_events(self, element):
+        """Enlaza eventos sobre el elemento (o su clon). Override en subclases."""
+        pass
+
+    @classmethod
+    def clear_cache(cls):
+        """Vacía la caché de la clase."""
+        _component_caches.pop(cls, None)
+
+
+def memo_render(maxsize=64):
+    """
+    Decorador para funciones de render puras.
+
+    Cachea el elemento por huella de argumentos y retorna un clon.
+    Los eventos deben enlazarse sobre el elemento retornado.
+
+    Uso:
+        @memo_render(maxsize=32)
+        def _render_item(item):
+            return html.DIV(item['name'])
+    """
+    def decorator(func):
+        cache = LRUCache(maxsize)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = props_fingerprint({'args': list(args), 'kwargs': kwargs})
+            if key is None:
+                return func(*args, **kwargs)
+
+            template = cache.get(key)
+            if template is None:
+                template = func(*args, **kwargs)
+                cache.put(key, template)
+            return template.cloneNode(True)
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+def get_memo_stats():
+    """Estadísticas de las cachés de componentes (debug)."""
+    return {
+        cls.__name__: {'size': len(cache), 'hits': cache.hits, 'misses': cache.misses}
+        for cls, cache in _component_caches.items()
+    }
@@ -116,16 +116,14 @@ class Modal(Component):
                 on_close = self.props.get('on_close')
                 self._close(on_close)
 
-        self._bound_key_handler = key_handler
-        document.bind('keydown', key_handler)
+        self._bound_key_handler = self.listen(document, 'keydown', key_handler)
 
         # Prevenir scroll del body
         document.body.style.overflow = 'hidden'
 
     def on_unmount(self):
-        """Al desmontar, limpiar listeners."""
-        if self._bound_key_handler:
-            document.unbind('keydown', self._bound_key_handler)
+        """Al desmontar, restaurar el scroll (el listener se libera solo)."""
+        self._bound_key_handler = None
 
         # Restaurar scroll
         document.body.style.overflow = ''
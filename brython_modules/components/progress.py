@@ -2,10 +2,10 @@
 # Barras de progreso, XP y nivel
 
 from browser import html
-from .base import Component
+from .memo import PureComponent
 
 
-class ProgressBar(Component):
+class ProgressBar(PureComponent):
     """
     Barra de progreso genérica.
 
@@ -34,7 +34,7 @@ class ProgressBar(Component):
         'lg': 'h-4',
     }
 
-    def render(self):
+    def render_pure(self):
         value = self.props.get('value', 0)
         max_value = self.props.get('max_value', 100)
         color = self.props.get('color', 'indigo')
@@ -78,7 +78,7 @@ class ProgressBar(Component):
         return container
 
 
-class XPBar(Component):
+class XPBar(PureComponent):
     """
     Barra de experiencia con información de nivel.
 
@@ -88,7 +88,7 @@ class XPBar(Component):
         compact: Modo compacto
     """
 
-    def render(self):
+    def render_pure(self):
         current_xp = self.props.get('current_xp', 0)
         level_info = self.props.get('level_info', {})
         compact = self.props.get('compact', False)
@@ -159,7 +159,7 @@ class XPBar(Component):
         return container
 
 
-class LevelBadge(Component):
+class LevelBadge(PureComponent):
     """
     Badge que muestra el nivel del usuario.
 
@@ -188,7 +188,7 @@ class LevelBadge(Component):
         'lg': {'badge': 'w-16 h-16', 'text': 'text-2xl'},
     }
 
-    def render(self):
+    def render_pure(self):
         level = self.props.get('level', 1)
         title = self.props.get('title', '')
         size = self.props.get('size', 'md')
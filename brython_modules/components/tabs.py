@@ -7,60 +7,85 @@ from .base import Component
 
 class Tabs(Component):
     """
-    Componente de pestañas.
+    Componente de pestañas con paneles perezosos.
+
+    Cada panel se renderiza la primera vez que se activa y después se
+    conserva oculto: cambiar de pestaña solo alterna clases.
 
     Props:
         tabs: Lista de dicts con {id, label, icon?, content}
         active_tab: ID de la pestaña activa
         on_change: Callback al cambiar de pestaña
         variant: 'underline' | 'pills' | 'boxed'
+        max_panels: Máximo de paneles retenidos (None = todos); al
+            excederlo se descarta el panel usado hace más tiempo
     """
 
+    VARIANT_STYLES = {
+        'underline': {
+            'container': 'flex border-b border-gray-200',
+            'tab': 'px-4 py-2 text-sm font-medium border-b-2 -mb-px transition-colors',
+            'active': 'border-indigo-500 text-indigo-600',
+            'inactive': 'border-transparent text-gray-500 hover:text-gray-700 hover:border-gray-300',
+        },
+        'pills': {
+            'container': 'flex gap-2 p-1 bg-gray-100 rounded-lg',
+            'tab': 'px-4 py-2 text-sm font-medium rounded-md transition-colors',
+            'active': 'bg-white text-gray-900 shadow-sm',
+            'inactive': 'text-gray-500 hover:text-gray-700',
+        },
+        'boxed': {
+            'container': 'flex',
+            'tab': 'px-4 py-2 text-sm font-medium border border-gray-200 first:rounded-l-lg last:rounded-r-lg -ml-px first:ml-0 transition-colors',
+            'active': 'bg-indigo-50 border-indigo-200 text-indigo-700 z-10',
+            'inactive': 'bg-white text-gray-500 hover:bg-gray-50',
+        },
+    }
+
     def __init__(self, **props):
         super().__init__(**props)
         self.active_tab = props.get('active_tab') or (props.get('tabs', [{}])[0].get('id') if props.get('tabs') else None)
+        self._buttons = {}
+        self._panels = {}
+        self._recent = []
+        self._content = None
 
     def render(self):
         tabs = self.props.get('tabs', [])
         variant = self.props.get('variant', 'underline')
         on_change = self.props.get('on_change')
 
+        # Un render nuevo descarta los paneles anteriores
+        self._buttons = {}
+        self._panels = {}
+        self._recent = []
+
         container = html.DIV(Class="w-full")
 
         # Tab headers
         headers = self._render_headers(tabs, variant, on_change)
         container <= headers
 
-        # Tab content
-        content = self._render_content(tabs)
-        container <= content
+        # Tab content (solo la pestaña activa)
+        self._content = html.DIV(Class="mt-4", id="tab-content")
+        self._show_panel(self.active_tab)
+        container <= self._content
 
         return container
 
+    def _styles(self):
+        """Estilos de la variante actual."""
+        variant = self.props.get('variant', 'underline')
+        return self.VARIANT_STYLES.get(variant, self.VARIANT_STYLES['underline'])
+
+    def _tab_class(self, is_active):
+        """Clases de un botón de pestaña."""
+        styles = self._styles()
+        return f"{styles['tab']} {styles['active'] if is_active else styles['inactive']} cursor-pointer"
+
     def _render_headers(self, tabs, variant, on_change):
         """Renderiza los headers de las pestañas."""
-        variant_styles = {
-            'underline': {
-                'container': 'flex border-b border-gray-200',
-                'tab': 'px-4 py-2 text-sm font-medium border-b-2 -mb-px transition-colors',
-                'active': 'border-indigo-500 text-indigo-600',
-                'inactive': 'border-transparent text-gray-500 hover:text-gray-700 hover:border-gray-300',
-            },
-            'pills': {
-                'container': 'flex gap-2 p-1 bg-gray-100 rounded-lg',
-                'tab': 'px-4 py-2 text-sm font-medium rounded-md transition-colors',
-                'active': 'bg-white text-gray-900 shadow-sm',
-                'inactive': 'text-gray-500 hover:text-gray-700',
-            },
-            'boxed': {
-                'container': 'flex',
-                'tab': 'px-4 py-2 text-sm font-medium border border-gray-200 first:rounded-l-lg last:rounded-r-lg -ml-px first:ml-0 transition-colors',
-                'active': 'bg-indigo-50 border-indigo-200 text-indigo-700 z-10',
-                'inactive': 'bg-white text-gray-500 hover:bg-gray-50',
-            },
-        }
-
-        styles = variant_styles.get(variant, variant_styles['underline'])
+        styles = self._styles()
         headers = html.DIV(Class=styles['container'])
 
         for tab in tabs:
@@ -69,8 +94,6 @@ class Tabs(Component):
             icon_emoji = tab.get('icon', '')
             is_active = tab_id == self.active_tab
 
-            tab_class = f"{styles['tab']} {styles['active'] if is_active else styles['inactive']} cursor-pointer"
-
             tab_content = []
             if icon_emoji:
                 tab_content.append(html.SPAN(icon_emoji, Class="mr-2"))
@@ -78,7 +101,7 @@ class Tabs(Component):
 
             tab_btn = html.BUTTON(
                 tab_content,
-                Class=tab_class,
+                Class=self._tab_class(is_active),
                 data_tab=tab_id
             )
 
@@ -88,38 +111,77 @@ class Tabs(Component):
                 return handler
 
             tab_btn.bind('click', make_handler(tab_id))
+            self._buttons[tab_id] = tab_btn
             headers <= tab_btn
 
         return headers
 
-    def _render_content(self, tabs):
-        """Renderiza el contenido de la pestaña activa."""
-        content_container = html.DIV(Class="mt-4", id="tab-content")
+    def _render_panel(self, tab_id):
+        """Renderiza el panel de una pestaña (primera activación)."""
+        panel = html.DIV(data_panel=tab_id)
 
-        for tab in tabs:
-            if tab.get('id') == self.active_tab:
+        for tab in self.props.get('tabs', []):
+            if tab.get('id') == tab_id:
                 content = tab.get('content', '')
                 if isinstance(content, str):
-                    content_container <= html.P(content)
+                    panel <= html.P(content)
                 elif callable(content):
-                    content_container <= content()
+                    panel <= content()
                 else:
-                    content_container <= content
+                    panel <= content
                 break
 
-        return content_container
+        return panel
+
+    def _show_panel(self, tab_id):
+        """Muestra el panel de una pestaña, renderizándolo si hace falta."""
+        if tab_id is None or self._content is None:
+            return
+
+        panel = self._panels.get(tab_id)
+        if panel is None:
+            panel = self._render_panel(tab_id)
+            self._panels[tab_id] = panel
+            self._content <= panel
+        else:
+            panel.classList.remove('hidden')
+
+        if tab_id in self._recent:
+            self._recent.remove(tab_id)
+        self._recent.append(tab_id)
+        self._evict()
+
+    def _evict(self):
+        """Descarta los paneles menos recientes si se excede max_panels."""
+        max_panels = self.props.get('max_panels')
+        if not max_panels:
+            return
+
+        while len(self._recent) > max(1, max_panels):
+            oldest = self._recent.pop(0)
+            panel = self._panels.pop(oldest, None)
+            if panel is not None:
+                panel.remove()
 
     def _switch_tab(self, tab_id, on_change):
-        """Cambia a otra pestaña."""
-        if tab_id != self.active_tab:
-            self.active_tab = tab_id
-            if on_change:
-                on_change(tab_id)
-            # Re-render
-            if self.element:
-                parent = self.element.parentNode
-                self.unmount()
-                self.mount(parent)
+        """Cambia a otra pestaña alternando clases (sin re-render)."""
+        if tab_id == self.active_tab:
+            return
+
+        previous = self.active_tab
+        self.active_tab = tab_id
+
+        if previous in self._buttons:
+            self._buttons[previous].className = self._tab_class(False)
+        if tab_id in self._buttons:
+            self._buttons[tab_id].className = self._tab_class(True)
+
+        if previous in self._panels:
+            self._panels[previous].classList.add('hidden')
+        self._show_panel(tab_id)
+
+        if on_change:
+            on_change(tab_id)
 
 
 class TabPanel(Component):
@@ -1,144 +1,310 @@
 # PromptCraft - Toast Notifications
 # Sistema de notificaciones toast
 
-from browser import document, html, timer
-from .base import Component, icon
+from collections import deque
 
+from browser import document, html, timer, window
+from .base import icon, ICONS
 
-class Toast(Component):
+
+# Sistema global de toasts
+
+class ToastManager:
     """
-    Notificación toast.
+    Gestor único de toasts.
 
-    Props:
-        message: Mensaje a mostrar
-        type: 'success' | 'error' | 'warning' | 'info'
-        duration: Duración en ms (0 = sin auto-dismiss)
-        position: 'top-right' | 'top-center' | 'bottom-right' | 'bottom-center'
-        dismissible: Mostrar botón de cerrar
-        on_dismiss: Callback al cerrar
+    - Como máximo MAX_VISIBLE toasts visibles; el resto espera en una
+      cola FIFO acotada.
+    - Toasts idénticos se fusionan ("+25 XP ×3") en lugar de apilarse.
+    - Los elementos DOM se reciclan desde un pool.
+    - Un solo timer gestiona la expiración de todos los toasts.
     """
 
-    TYPES = {
+    MAX_VISIBLE = 4
+    MAX_QUEUE = 20
+    POOL_SIZE = 8
+    CONTAINER_ID = 'toast-container'
+
+    STYLES = {
         'success': {
-            'icon': 'check',
-            'bg': 'bg-green-50',
-            'border': 'border-green-200',
-            'text': 'text-green-800',
-            'icon_color': 'text-green-500',
+            'shell': 'bg-green-50 border-green-200 animate-slide-in',
+            'icon': ICONS['check'],
+            'icon_class': 'text-green-500',
+            'title': 'text-xs text-green-700',
+            'text': 'text-sm font-medium text-green-800',
         },
         'error': {
-            'icon': 'x',
-            'bg': 'bg-red-50',
-            'border': 'border-red-200',
-            'text': 'text-red-800',
-            'icon_color': 'text-red-500',
+            'shell': 'bg-red-50 border-red-200 animate-slide-in',
+            'icon': ICONS['x'],
+            'icon_class': 'text-red-500',
+            'title': 'text-xs text-red-700',
+            'text': 'text-sm font-medium text-red-800',
         },
         'warning': {
-            'icon': 'info',
-            'bg': 'bg-yellow-50',
-            'border': 'border-yellow-200',
-            'text': 'text-yellow-800',
-            'icon_color': 'text-yellow-500',
+            'shell': 'bg-yellow-50 border-yellow-200 animate-slide-in',
+            'icon': ICONS['info'],
+            'icon_class': 'text-yellow-500',
+            'title': 'text-xs text-yellow-700',
+            'text': 'text-sm font-medium text-yellow-800',
         },
         'info': {
-            'icon': 'info',
-            'bg': 'bg-blue-50',
-            'border': 'border-blue-200',
-            'text': 'text-blue-800',
-            'icon_color': 'text-blue-500',
+            'shell': 'bg-blue-50 border-blue-200 animate-slide-in',
+            'icon': ICONS['info'],
+            'icon_class': 'text-blue-500',
+            'title': 'text-xs text-blue-700',
+            'text': 'text-sm font-medium text-blue-800',
+        },
+        'xp': {
+            'shell': 'bg-indigo-600 border-indigo-700 animate-bounce-in',
+            'icon': '⭐',
+            'icon_class': 'text-xl',
+            'title': 'text-xs text-indigo-200',
+            'text': 'text-sm font-bold text-white',
+        },
+        'badge': {
+            'shell': 'bg-gradient-to-r from-yellow-400 to-amber-500 border-yellow-600 animate-bounce-in',
+            'icon': '🏆',
+            'icon_class': 'text-2xl',
+            'title': 'text-xs text-yellow-900',
+            'text': 'text-sm font-bold text-white',
         },
     }
 
-    POSITIONS = {
-        'top-right': 'top-4 right-4',
-        'top-center': 'top-4 left-1/2 -translate-x-1/2',
-        'bottom-right': 'bottom-4 right-4',
-        'bottom-center': 'bottom-4 left-1/2 -translate-x-1/2',
+    DURATIONS = {
+        'xp': 2500,
+        'badge': 4000,
     }
+    DEFAULT_DURATION = 3000
 
-    def __init__(self, **props):
-        super().__init__(**props)
+    def __init__(self):
+        self._visible = []
+        self._queue = deque()
+        self._by_key = {}
+        self._pool = []
         self._timer_id = None
-
-    def render(self):
-        message = self.props.get('message', '')
-        toast_type = self.props.get('type', 'info')
-        dismissible = self.props.get('dismissible', True)
-        on_dismiss = self.props.get('on_dismiss')
-
-        type_config = self.TYPES.get(toast_type, self.TYPES['info'])
-
-        toast = html.DIV(
-            Class=f"flex items-center gap-3 px-4 py-3 rounded-lg border shadow-lg {type_config['bg']} {type_config['border']} animate-slide-in"
+        self._timer_due = None
+        self.stats = {'shown': 0, 'merged': 0, 'queued': 0, 'dropped': 0, 'recycled': 0}
+
+    def show(self, message, kind='info', title='', icon=None, duration=None, on_dismiss=None):
+        """
+        Muestra (o fusiona) un toast.
+
+        Args:
+            message: Texto principal
+            kind: Estilo ('success', 'error', 'warning', 'info', 'xp', 'badge')
+            title: Texto secundario sobre el mensaje (opcional)
+            icon: Emoji/ícono (por defecto el del estilo)
+            duration: Duración en ms (0 = sin auto-dismiss)
+            on_dismiss: Callback al cerrarse
+
+        Returns:
+            Dict con la entrada del toast
+        """
+        if kind not in self.STYLES:
+            kind = 'info'
+        if duration is None:
+            duration = self.DURATIONS.get(kind, self.DEFAULT_DURATION)
+
+        key = (kind, title, message, icon)
+        entry = self._by_key.get(key)
+        if entry is not None:
+            # Fusionar con un toast idéntico visible o en cola
+            entry['count'] += 1
+            self.stats['merged'] += 1
+            if entry['shell'] is not None:
+                entry['expires_at'] = self._expiry(entry['duration'])
+                self._paint_count(entry)
+                self._schedule_tick()
+            return entry
+
+        entry = {
+            'key': key,
+            'kind': kind,
+            'title': title,
+            'message': message,
+            'icon': icon,
+            'duration': duration,
+            'on_dismiss': on_dismiss,
+            'count': 1,
+            'expires_at': None,
+            'shell': None,
+        }
+        self._by_key[key] = entry
+
+        if len(self._visible) < self.MAX_VISIBLE:
+            self._display(entry)
+        else:
+            self._queue.append(entry)
+            self.stats['queued'] += 1
+            if len(self._queue) > self.MAX_QUEUE:
+                dropped = self._queue.popleft()
+                self._by_key.pop(dropped['key'], None)
+                self.stats['dropped'] += 1
+
+        return entry
+
+    def dismiss(self, entry):
+        """Cierra un toast visible y muestra el siguiente de la cola."""
+        if entry not in self._visible:
+            return
+
+        self._visible.remove(entry)
+        self._by_key.pop(entry['key'], None)
+        self._release_shell(entry)
+
+        if entry['on_dismiss']:
+            entry['on_dismiss']()
+
+        self._fill_from_queue()
+        self._schedule_tick()
+
+    def clear(self):
+        """Cierra todos los toasts y vacía la cola."""
+        self._queue.clear()
+        for entry in list(self._visible):
+            self.dismiss(entry)
+        self._by_key = {}
+
+    def _display(self, entry):
+        """Pinta una entrada usando un elemento del pool."""
+        shell = self._acquire_shell()
+        style = self.STYLES[entry['kind']]
+
+        shell['entry'] = entry
+        shell['element'].className = f"flex items-center gap-3 px-4 py-3 rounded-lg border shadow-lg {style['shell']}"
+        shell['icon'].className = style['icon_class']
+        shell['icon'].text = entry['icon'] or style['icon']
+        shell['title'].className = style['title']
+        shell['title'].text = entry['title']
+        shell['title'].style.display = 'block' if entry['title'] else 'none'
+        shell['text'].className = style['text']
+        shell['text'].text = entry['message']
+        shell['count'].className = style['text']
+
+        entry['shell'] = shell
+        entry['expires_at'] = self._expiry(entry['duration'])
+        self._paint_count(entry)
+
+        self._get_container() <= shell['element']
+        self._visible.append(entry)
+        self.stats['shown'] += 1
+        self._schedule_tick()
+
+    def _paint_count(self, entry):
+        """Actualiza el contador de toasts fusionados."""
+        count_elem = entry['shell']['count']
+        if entry['count'] > 1:
+            count_elem.text = f"×{entry['count']}"
+            count_elem.style.display = 'inline'
+        else:
+            count_elem.text = ''
+            count_elem.style.display = 'none'
+
+    def _fill_from_queue(self):
+        """Promueve toasts de la cola mientras haya espacio."""
+        while self._queue and len(self._visible) < self.MAX_VISIBLE:
+            self._display(self._queue.popleft())
+
+    def _acquire_shell(self):
+        """Obtiene un elemento de toast del pool (o crea uno)."""
+        if self._pool:
+            self.stats['recycled'] += 1
+            return self._pool.pop()
+
+        shell = {'entry': None}
+        shell['icon'] = html.SPAN()
+        shell['title'] = html.P()
+        shell['text'] = html.P()
+        shell['count'] = html.SPAN()
+        shell['close'] = html.BUTTON(
+            icon('x', 'w-4 h-4'),
+            Class="p-1 rounded hover:bg-black/10 transition-colors opacity-60"
         )
-
-        # Icono
-        toast <= html.DIV(
-            icon(type_config['icon'], 'w-5 h-5'),
-            Class=type_config['icon_color']
+        shell['element'] = html.DIV(
+            shell['icon'] +
+            html.DIV(shell['title'] + shell['text'], Class="flex-1") +
+            shell['count'] +
+            shell['close']
         )
 
-        # Mensaje
-        toast <= html.P(
-            message,
-            Class=f"flex-1 text-sm font-medium {type_config['text']}"
-        )
+        def on_close(event):
+            if shell['entry'] is not None:
+                self.dismiss(shell['entry'])
+
+        shell['close'].bind('click', on_close)
+        return shell
+
+    def _release_shell(self, entry):
+        """Devuelve el elemento de la entrada al pool."""
+        shell = entry['shell']
+        if shell is None:
+            return
+        entry['shell'] = None
+        shell['entry'] = None
+        shell['element'].remove()
+        if len(self._pool) < self.POOL_SIZE:
+            self._pool.append(shell)
+
+    def _expiry(self, duration):
+        """Calcula el instante de expiración (None = sin auto-dismiss)."""
+        if not duration or duration <= 0:
+            return None
+        return window.Date.now() + duration
+
+    def _schedule_tick(self):
+        """Programa el único timer para la próxima expiración."""
+        due = None
+        for entry in self._visible:
+            if entry['expires_at'] is not None and (due is None or entry['expires_at'] < due):
+                due = entry['expires_at']
+
+        if due == self._timer_due:
+            return
+
+        if self._timer_id is not None:
+            timer.clear_timeout(self._timer_id)
+            self._timer_id = None
+        self._timer_due = due
 
-        # Botón cerrar
-        if dismissible:
-            close_btn = html.BUTTON(
-                icon('x', 'w-4 h-4'),
-                Class=f"p-1 rounded hover:bg-black/10 transition-colors {type_config['text']}"
-            )
-            close_btn.bind('click', lambda e: self._dismiss(on_dismiss))
-            toast <= close_btn
+        if due is not None:
+            delay = max(0, due - window.Date.now())
+            self._timer_id = timer.set_timeout(self._tick, delay)
 
-        return toast
+    def _tick(self):
+        """Cierra los toasts expirados y reprograma el timer."""
+        self._timer_id = None
+        self._timer_due = None
+        now = window.Date.now()
 
-    def show(self, container_id='toast-container'):
-        """Muestra el toast."""
-        # Asegurar que existe el contenedor
-        container = document.getElementById(container_id)
-        if not container:
-            position = self.props.get('position', 'top-right')
-            pos_classes = self.POSITIONS.get(position, self.POSITIONS['top-right'])
+        expired = [e for e in self._visible
+                   if e['expires_at'] is not None and e['expires_at'] <= now]
+        for entry in expired:
+            self.dismiss(entry)
 
+        self._schedule_tick()
+
+    def _get_container(self):
+        """Obtiene (o crea) el contenedor de toasts."""
+        container = document.getElementById(self.CONTAINER_ID)
+        if not container:
             container = html.DIV(
-                Class=f"fixed {pos_classes} z-50 space-y-2",
-                id=container_id
+                Class="fixed top-4 right-4 z-50 space-y-2",
+                id=self.CONTAINER_ID
             )
             document.body <= container
+        return container
 
-        self.mount(container)
 
-        # Auto-dismiss
-        duration = self.props.get('duration', 3000)
-        if duration > 0:
-            self._timer_id = timer.set_timeout(
-                lambda: self._dismiss(self.props.get('on_dismiss')),
-                duration
-            )
+# Instancia global del gestor
+_toast_manager = None
 
-        return self
-
-    def _dismiss(self, callback=None):
-        """Cierra el toast."""
-        if self._timer_id:
-            timer.clear_timeout(self._timer_id)
+def get_toast_manager():
+    """Obtiene la instancia singleton del gestor de toasts."""
+    global _toast_manager
+    if _toast_manager is None:
+        _toast_manager = ToastManager()
+    return _toast_manager
 
-        if callback:
-            callback()
-
-        self.unmount()
-
-    def on_unmount(self):
-        """Limpia timer al desmontar."""
-        if self._timer_id:
-            timer.clear_timeout(self._timer_id)
-
-
-# Sistema global de toasts
-_toast_queue = []
 
 def show_toast(message, type='info', **props):
     """
@@ -147,11 +313,16 @@ def show_toast(message, type='info', **props):
     Args:
         message: Mensaje a mostrar
         type: 'success' | 'error' | 'warning' | 'info'
-        **props: Props adicionales
+        **props: Props adicionales (duration, title, icon, on_dismiss)
     """
-    toast = Toast(message=message, type=type, **props)
-    toast.show()
-    return toast
+    return get_toast_manager().show(
+        message,
+        kind=type,
+        title=props.get('title', ''),
+        icon=props.get('icon'),
+        duration=props.get('duration'),
+        on_dismiss=props.get('on_dismiss')
+    )
 
 
 def success(message, **props):
@@ -186,32 +357,7 @@ def xp_toast(xp_amount, reason=''):
     if reason:
         message += f" - {reason}"
 
-    toast = html.DIV(
-        Class="flex items-center gap-3 px-4 py-3 rounded-lg border shadow-lg bg-indigo-600 border-indigo-700 animate-bounce-in"
-    )
-
-    toast <= html.SPAN("⭐", Class="text-xl")
-    toast <= html.P(message, Class="text-sm font-bold text-white")
-
-    # Mostrar directamente
-    container = document.getElementById('toast-container')
-    if not container:
-        container = html.DIV(
-            Class="fixed top-4 right-4 z-50 space-y-2",
-            id="toast-container"
-        )
-        document.body <= container
-
-    container <= toast
-
-    # Auto remove
-    def remove():
-        try:
-            toast.remove()
-        except:
-            pass
-
-    timer.set_timeout(remove, 2500)
+    return get_toast_manager().show(message, kind='xp')
 
 
 def badge_toast(badge_name, badge_icon='🏆'):
@@ -222,30 +368,9 @@ def badge_toast(badge_name, badge_icon='🏆'):
         badge_name: Nombre del badge
         badge_icon: Emoji del badge
     """
-    toast = html.DIV(
-        Class="flex items-center gap-3 px-4 py-3 rounded-lg border shadow-lg bg-gradient-to-r from-yellow-400 to-amber-500 border-yellow-600 animate-bounce-in"
-    )
-
-    toast <= html.SPAN(badge_icon, Class="text-2xl")
-    toast <= html.DIV(
-        html.P("¡Nuevo Badge!", Class="text-xs text-yellow-900") +
-        html.P(badge_name, Class="text-sm font-bold text-white"),
+    return get_toast_manager().show(
+        badge_name,
+        kind='badge',
+        title="¡Nuevo Badge!",
+        icon=badge_icon
     )
-
-    container = document.getElementById('toast-container')
-    if not container:
-        container = html.DIV(
-            Class="fixed top-4 right-4 z-50 space-y-2",
-            id="toast-container"
-        )
-        document.body <= container
-
-    container <= toast
-
-    def remove():
-        try:
-            toast.remove()
-        except:
-            pass
-
-    timer.set_timeout(remove, 4000)
@@ -0,0 +1,116 @@
+# PromptCraft - Achievement Counters
+# Contadores de progreso mantenidos por evento y su verificación
+
+# Actualizaciones entre verificaciones completas (ver AppState)
+CHECK_EVERY = 100
+
+# Categoría de puzzles sin metadatos cargados
+UNKNOWN_CATEGORY = 'otros'
+
+
+def empty_counters():
+    """Contadores vacíos tal como se guardan en el estado ('counters')."""
+    return {
+        'puzzles_solved': 0,
+        'three_star': 0,
+        'no_hint': 0,
+        'fastest_time': None,
+        'lessons_completed': 0,
+        'lessons_by_category': {},
+        'puzzles_by_category': {},
+    }
+
+
+def lesson_category(lesson_id):
+    """Categoría de una lección del contenido embebido."""
+    from .lessons.content import EMBEDDED_LESSONS
+    return EMBEDDED_LESSONS.get(lesson_id, {}).get('category', UNKNOWN_CATEGORY)
+
+
+def puzzle_category(puzzle_id):
+    """Categoría de un puzzle (si el índice de puzzles está cargado)."""
+    from .puzzles.loader import get_puzzle_by_id
+    puzzle = get_puzzle_by_id(puzzle_id) or {}
+    return puzzle.get('category', UNKNOWN_CATEGORY)
+
+
+def _had_no_hint(record):
+    """Si el puzzle ya se resolvió alguna vez sin pistas."""
+    return bool(record.get('no_hints')) or (record.get('solved') and record.get('hints_used', 1) == 0)
+
+
+def _bump(counts, key):
+    counts[key] = counts.get(key, 0) + 1
+
+
+def count_lesson(counters, lesson_id):
+    """Suma una lección nueva. O(1)."""
+    counters['lessons_completed'] += 1
+    _bump(counters['lessons_by_category'], lesson_category(lesson_id))
+
+
+def puzzle_marks(record):
+    """Marcas de un registro de puzzle antes de actualizarlo."""
+    return {
+        'solved': bool(record.get('solved')),
+        'three_star': record.get('best_stars', 0) >= 3,
+        'no_hint': _had_no_hint(record),
+    }
+
+
+def count_puzzle(counters, before, record, time_seconds):
+    """
+    Aplica un resultado de puzzle. O(1).
+
+    Args:
+        counters: Contadores (se modifican en sitio)
+        before: puzzle_marks() del registro antes del intento
+        record: Registro ya actualizado
+        time_seconds: Tiempo del intento
+    """
+    if not before['solved']:
+        counters['puzzles_solved'] += 1
+        _bump(counters['puzzles_by_category'], record.get('category', UNKNOWN_CATEGORY))
+    if not before['three_star'] and record.get('best_stars', 0) >= 3:
+        counters['three_star'] += 1
+    if not before['no_hint'] and _had_no_hint(record):
+        counters['no_hint'] += 1
+    if time_seconds and (counters['fastest_time'] is None or time_seconds < counters['fastest_time']):
+        counters['fastest_time'] = time_seconds
+
+
+def recount(progress):
+    """Contadores calculados desde cero a partir de progress. O(n)."""
+    counters = empty_counters()
+    for lesson_id in progress.get('lessons_completed', []):
+        count_lesson(counters, lesson_id)
+
+    for record in progress.get('puzzles_solved', {}).values():
+        if not record.get('solved', True):
+            continue
+        counters['puzzles_solved'] += 1
+        _bump(counters['puzzles_by_category'], record.get('category', UNKNOWN_CATEGORY))
+        if record.get('best_stars', 0) >= 3:
+            counters['three_star'] += 1
+        if record.get('no_hints') or record.get('hints_used', 1) == 0:
+            counters['no_hint'] += 1
+        best_time = record.get('best_time')
+        if best_time and (counters['fastest_time'] is None or best_time < counters['fastest_time']):
+            counters['fastest_time'] = best_time
+    return counters
+
+
+def verify(counters, progress):
+    """
+    Compara los contadores mantenidos con un recuento completo.
+
+    Returns:
+        (recuento, diferencias): diferencias es {campo: (mantenido, real)}
+    """
+    expected = recount(progress)
+    differences = {
+        key: (counters.get(key), value)
+        for key, value in expected.items()
+        if counters.get(key) != value
+    }
+    return expected, differences
@@ -0,0 +1,77 @@
+# PromptCraft - Daily Ring
+# Totales por día en un buffer circular de tamaño fijo
+
+from datetime import date
+
+
+# Días que cubre el buffer (alcanza para semana y mes)
+RING_DAYS = 35
+
+
+def today_index():
+    """Día actual como ordinal (días desde 0001-01-01)."""
+    return date.today().toordinal()
+
+
+def empty_ring(days=RING_DAYS):
+    """Buffer vacío tal como se guarda en el estado."""
+    return {'day': today_index(), 'totals': [0] * days}
+
+
+class DailyRing:
+    """
+    Totales por día indexados por día ordinal: totals[día % N].
+
+    Sumar es O(1) (más limpiar los días saltados desde la última
+    escritura); consultar un rango de k días es O(k) y no depende del
+    número de eventos. Los días fuera de las últimas N posiciones
+    cuentan como 0.
+
+    Args:
+        data: dict persistido {'day', 'totals'}; se modifica en sitio
+    """
+
+    def __init__(self, data):
+        self.data = data
+
+    @property
+    def size(self):
+        return len(self.data['totals'])
+
+    def _advance(self, today):
+        """Limpia las posiciones de los días transcurridos sin escrituras."""
+        last = self.data['day']
+        if today <= last:
+            return
+        totals = self.data['totals']
+        if today - last >= self.size:
+            totals[:] = [0] * self.size
+        else:
+            for day in range(last + 1, today + 1):
+                totals[day % self.size] = 0
+        self.data['day'] = today
+
+    def add(self, amount, day=None):
+        """Suma a un día (por defecto hoy)."""
+        today = today_index()
+        self._advance(today)
+        day = today if day is None else day
+        if today - self.size < day <= today:
+            self.data['totals'][day % self.size] += amount
+
+    def get(self, day):
+        """Total de un día (0 si está fuera del buffer)."""
+        last = self.data['day']
+        if last - self.size < day <= last:
+            return self.data['totals'][day % self.size]
+        return 0
+
+    def total(self, days, today=None):
+        """Suma de los últimos `days` días, incluyendo hoy."""
+        today = today_index() if today is None else today
+        return sum(self.get(day) for day in range(today - days + 1, today + 1))
+
+    def series(self, days, today=None):
+        """Lista [(día, total)] de los últimos `days` días, del más antiguo al actual."""
+        today = today_index() if today is None else today
+        return [(day, self.get(day)) for day in range(today - days + 1, today + 1)]
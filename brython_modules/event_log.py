@@ -0,0 +1,279 @@
+# PromptCraft - Progress Event Log
+# Registro append-only de actividades con agregados por reducers y snapshots
+
+import copy
+from datetime import datetime
+from browser import console
+from .persistence import get_history_db
+
+
+# Eventos en la cola antes de consolidar un snapshot
+SNAPSHOT_EVERY = 50
+
+# Reducers registrados: nombre -> (valor inicial, función)
+REDUCERS = {}
+
+
+def reducer(name, initial):
+    """
+    Registra un agregado derivado del log.
+
+    La función recibe (agregado, evento) y retorna el agregado nuevo;
+    puede mutar el agregado recibido. Debe ser determinista: el mismo
+    log produce siempre el mismo resultado.
+
+    Uso:
+        @reducer('puzzles_today', 0)
+        def _puzzles_today(total, event):
+            ...
+
+    Un reducer nuevo no aparece en los snapshots existentes: al cargar,
+    el log se reconstruye desde el historial completo (IndexedDB).
+    El evento 'baseline' (migración v3) resume el progreso anterior al
+    log; los reducers que lo ignoren parten de cero.
+    """
+    def decorator(func):
+        REDUCERS[name] = (initial, func)
+        return func
+    return decorator
+
+
+def empty_log():
+    """Log vacío tal como se guarda en el estado ('event_log')."""
+    return {
+        'seq': 0,
+        'snapshot': {'seq': 0, 'aggregates': {}},
+        'tail': [],
+    }
+
+
+def make_event(event_type, seq, **payload):
+    """Crea un evento {seq, type, ts, ...payload}."""
+    event = dict(payload)
+    event['seq'] = seq
+    event['type'] = event_type
+    event['ts'] = datetime.now().isoformat()
+    return event
+
+
+class EventLog:
+    """
+    Log de eventos de progreso (lesson_completed, puzzle_solved,
+    hint_used, xp_awarded, badge_unlocked, ...).
+
+    El log persistido (state['event_log']) contiene un snapshot de los
+    agregados y la cola de eventos posteriores. Al cargar se parte del
+    snapshot y se re-aplica solo la cola; cada SNAPSHOT_EVERY eventos la
+    cola se consolida en un nuevo snapshot. Los eventos locales también
+    se guardan en IndexedDB (kind='event') para auditoría y
+    reconstrucción, marcados con la pestaña que los creó ('origin'); los
+    eventos recibidos de otra pestaña ya los guardó su pestaña de origen.
+
+    Args:
+        data: dict persistido (ver empty_log()); se modifica en sitio
+        snapshot_every: Tamaño máximo de la cola
+        origin: Id de esta pestaña (ver persistence/tab_sync.py)
+    """
+
+    def __init__(self, data=None, snapshot_every=SNAPSHOT_EVERY, origin=None):
+        self.data = data if data is not None else empty_log()
+        self.snapshot_every = snapshot_every
+        self.origin = origin
+        self.aggregates = {}
+        self.replayed = 0
+        self._restore()
+
+    def _restore(self):
+        """Agregados = snapshot + cola re-aplicada."""
+        self.aggregates = copy.deepcopy(self.data['snapshot']['aggregates'])
+        for name, (initial, _) in REDUCERS.items():
+            if name not in self.aggregates:
+                self.aggregates[name] = copy.deepcopy(initial)
+
+        tail = self.data['tail']
+        for event in tail:
+            self._apply(event)
+        self.replayed = len(tail)
+
+    def missing_reducers(self):
+        """Reducers registrados que el snapshot guardado no conoce."""
+        if self.data['snapshot']['seq'] == 0:
+            return []
+        known = self.data['snapshot']['aggregates']
+        return [name for name in REDUCERS if name not in known]
+
+    def _apply(self, event):
+        """Aplica un evento a todos los agregados."""
+        for name, (initial, func) in REDUCERS.items():
+            try:
+                self.aggregates[name] = func(self.aggregates[name], event)
+            except Exception as e:
+                console.log(f"[EventLog] Reducer {name} error: {e}")
+
+    def append(self, event_type, **payload):
+        """
+        Añade un evento y actualiza los agregados.
+
+        Returns:
+            El evento registrado
+        """
+        self.data['seq'] += 1
+        event = make_event(event_type, self.data['seq'], **payload)
+
+        self.data['tail'].append(event)
+        self._apply(event)
+        if 'origin' not in payload:
+            self._archive(event)
+
+        if len(self.data['tail']) >= self.snapshot_every:
+            self.snapshot()
+
+        return event
+
+    def snapshot(self):
+        """Consolida los agregados actuales y vacía la cola."""
+        self.data['snapshot'] = {
+            'seq': self.data['seq'],
+            'aggregates': copy.deepcopy(self.aggregates),
+        }
+        self.data['tail'] = []
+
+    def archive_tail(self):
+        """Copia la cola a IndexedDB (eventos creados por una migración)."""
+        for event in self.data['tail']:
+            if 'origin' not in event:
+                self._archive(event)
+
+    def _archive(self, event):
+        """Guarda un evento local en IndexedDB con la pestaña de origen."""
+        get_history_db().append('event', dict(event, origin=self.origin), event['type'])
+
+    def get(self, name, default=None):
+        """Valor de un agregado."""
+        return self.aggregates.get(name, default)
+
+    def replay(self, events):
+        """
+        Recalcula todos los agregados desde cero a partir de una lista
+        de eventos y consolida el resultado en un snapshot. Un evento
+        repetido (misma pestaña de origen y seq) se aplica una vez.
+        """
+        self.aggregates = {name: copy.deepcopy(initial) for name, (initial, _) in REDUCERS.items()}
+        seen = set()
+        for event in sorted(events, key=lambda e: e.get('seq', 0)):
+            event_id = (event.get('origin'), event.get('seq'))
+            if event_id in seen:
+                continue
+            seen.add(event_id)
+            self._apply(event)
+        self.snapshot()
+
+    def rebuild(self, callback=None):
+        """
+        Reconstruye los agregados desde el log completo de IndexedDB.
+        Sin IndexedDB (o si le faltan eventos) conserva los agregados.
+        """
+        def on_events(events):
+            # El historial (sin repetidos) debe cubrir todo el log para ser confiable
+            unique = {(event.get('origin'), event.get('seq')) for event in events}
+            if len(unique) >= self.data['seq']:
+                self.replay(events)
+                console.log(f"[EventLog] Rebuilt from {len(unique)} events")
+            if callback:
+                callback(self.aggregates)
+
+        get_history_db().query('event', 0, None, on_events)
+
+
+# =============================================================================
+# REDUCERS BASE
+# =============================================================================
+
+@reducer('xp', 0)
+def _xp(total, event):
+    if event['type'] in ('xp_awarded', 'baseline'):
+        total += event.get('amount', 0)
+    return total
+
+
+@reducer('event_counts', {})
+def _event_counts(counts, event):
+    counts[event['type']] = counts.get(event['type'], 0) + 1
+    return counts
+
+
+@reducer('lessons_completed', 0)
+def _lessons_completed(total, event):
+    if event['type'] == 'lesson_completed':
+        total += 1
+    elif event['type'] == 'baseline':
+        total += event.get('lessons', 0)
+    return total
+
+
+@reducer('exercises_completed', 0)
+def _exercises_completed(total, event):
+    if event['type'] == 'exercise_completed':
+        total += 1
+    elif event['type'] == 'baseline':
+        total += event.get('exercises', 0)
+    return total
+
+
+@reducer('puzzles', {'solved': [], 'attempts': 0, 'perfect': 0, 'hints': 0})
+def _puzzles(puzzles, event):
+    if event['type'] == 'puzzle_solved':
+        if event['puzzle_id'] not in puzzles['solved']:
+            puzzles['solved'].append(event['puzzle_id'])
+        puzzles['attempts'] += 1
+        puzzles['hints'] += event.get('hints_used', 0)
+        if event.get('stars') == 3 and not event.get('hints_used'):
+            puzzles['perfect'] += 1
+    elif event['type'] == 'baseline':
+        for puzzle_id in event.get('puzzles', []):
+            if puzzle_id not in puzzles['solved']:
+                puzzles['solved'].append(puzzle_id)
+        puzzles['attempts'] += event.get('puzzles_attempted', 0)
+        puzzles['perfect'] += event.get('perfect_puzzles', 0)
+        puzzles['hints'] += event.get('hints_used_total', 0)
+    return puzzles
+
+
+@reducer('badges', [])
+def _badges(badges, event):
+    if event['type'] == 'badge_unlocked':
+        if event['badge_id'] not in badges:
+            badges.append(event['badge_id'])
+    elif event['type'] == 'baseline':
+        for badge_id in event.get('badges', []):
+            if badge_id not in badges:
+                badges.append(badge_id)
+    return badges
+
+
+@reducer('active_days', {'count': 0, 'last': None})
+def _active_days(days, event):
+    if event['type'] == 'active_day' and event.get('date') != days['last']:
+        days['count'] += 1
+        days['last'] = event.get('date')
+    elif event['type'] == 'baseline':
+        days['count'] += event.get('active_days', 0)
+        days['last'] = event.get('last_date') or days['last']
+    return days
+
+
+def audit(log, state):
+    """
+    Compara los agregados del log con los valores del estado.
+
+    Returns:
+        dict {nombre: (valor_log, valor_estado)} solo con diferencias
+    """
+    progress = state.get('progress', {})
+    checks = {
+        'xp': (log.get('xp', 0), progress.get('xp', 0)),
+        'lessons_completed': (log.get('lessons_completed', 0), len(progress.get('lessons_completed', []))),
+        'puzzles_solved': (len(log.get('puzzles', {}).get('solved', [])), len(progress.get('puzzles_solved', {}))),
+        'badges': (len(log.get('badges', [])), len(state.get('badges', []))),
+    }
+    return {name: values for name, values in checks.items() if values[0] != values[1]}
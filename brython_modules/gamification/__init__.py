@@ -6,7 +6,8 @@ from .levels import LevelSystem, get_level_info, LEVEL_THRESHOLDS
 from .badges import BadgeManager, check_badge_unlock, get_all_badges
 from .streaks import StreakManager, update_streak, get_streak_info
 from .achievements import AchievementTracker, check_achievements
-from .leaderboard import Leaderboard
+from .achievement_engine import AchievementEngine, SlidingCounter, get_achievement_engine
+from .leaderboard import Leaderboard, RankIndex, WindowedLeaderboard, get_windowed_leaderboard
 
 __all__ = [
     'XPManager',
@@ -23,5 +24,11 @@ __all__ = [
     'get_streak_info',
     'AchievementTracker',
     'check_achievements',
+    'AchievementEngine',
+    'SlidingCounter',
+    'get_achievement_engine',
     'Leaderboard',
+    'RankIndex',
+    'WindowedLeaderboard',
+    'get_windowed_leaderboard',
 ]
@@ -0,0 +1,326 @@
+# PromptCraft - Achievement Engine
+# Logros definidos en data/achievements.json, con condiciones por ventana de tiempo
+
+from browser import ajax, window, console
+import json
+from ..components.toast import badge_toast
+from ..persistence import get_history_db
+from .levels import LevelSystem
+
+
+ACHIEVEMENTS_URL = "data/achievements.json"
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# Condiciones por ventana con nombre propio: tipo -> (evento, segundos).
+# La forma genérica es {'type': 'events_in_window', 'event', 'window', 'value'}.
+WINDOW_ALIASES = {
+    'lessons_in_day': ('lesson', DAY),
+    'lessons_in_hour': ('lesson', HOUR),
+    'puzzles_in_day': ('puzzle', DAY),
+    'puzzles_in_hour': ('puzzle', HOUR),
+}
+
+# Tipos de evento de check_achievements() -> evento de las ventanas
+EVENT_KINDS = {
+    'lesson_complete': 'lesson',
+    'puzzle_complete': 'puzzle',
+    'playground_use': 'playground',
+    'daily_login': 'activity',
+}
+
+# Condiciones acumuladas que dependen de cada evento
+LIFETIME_TRIGGERS = {
+    'lesson': ('lessons_completed', 'category_complete', 'streak_days',
+               'level_reached', 'total_xp', 'badges_unlocked'),
+    'puzzle': ('puzzles_solved', 'three_stars', 'puzzle_time', 'streak_days',
+               'level_reached', 'total_xp', 'badges_unlocked'),
+    'playground': ('playground_uses', 'level_reached', 'total_xp'),
+    'activity': ('streak_days',),
+}
+
+
+def window_of(condition):
+    """(evento, segundos) de una condición por ventana, o None."""
+    if condition.get('type') == 'events_in_window':
+        return condition.get('event'), condition.get('window', DAY)
+    return WINDOW_ALIASES.get(condition.get('type'))
+
+
+def window_key(windowed):
+    """Clave 'evento:segundos' del contador de una ventana."""
+    event, seconds = windowed
+    return f"{event}:{int(seconds)}"
+
+
+class SlidingCounter:
+    """
+    Eventos dentro de una ventana deslizante.
+
+    Guarda los timestamps (ms) de los eventos recientes en orden. Cada
+    add() descarta por la izquierda los que salieron de la ventana y
+    recorta al máximo umbral que se consulta (`cap`), así que la lista
+    nunca supera `cap` elementos: O(1) amortizado por evento, sin
+    recorrer el historial.
+
+    Args:
+        stamps: Lista persistida de timestamps; se modifica en sitio
+        window_ms: Ancho de la ventana en milisegundos
+        cap: Mayor umbral que se evalúa sobre esta ventana
+    """
+
+    def __init__(self, stamps, window_ms, cap):
+        self.stamps = stamps
+        self.window_ms = window_ms
+        self.cap = max(1, cap)
+
+    def _expire(self, now):
+        start = now - self.window_ms
+        drop = 0
+        while drop < len(self.stamps) and self.stamps[drop] <= start:
+            drop += 1
+        if drop:
+            del self.stamps[:drop]
+
+    def add(self, now):
+        """Registra un evento y retorna cuántos hay en la ventana."""
+        self.stamps.append(now)
+        self._expire(now)
+        if len(self.stamps) > self.cap:
+            del self.stamps[:len(self.stamps) - self.cap]
+        return len(self.stamps)
+
+    def count(self, now):
+        """Eventos dentro de la ventana (como máximo `cap`)."""
+        self._expire(now)
+        return len(self.stamps)
+
+
+class AchievementEngine:
+    """
+    Evalúa los logros de data/achievements.json.
+
+    Las condiciones acumuladas (lecciones, puzzles, XP, racha...) se leen
+    de los contadores del estado; las condiciones por ventana ("3
+    lecciones en un día", "5 puzzles en una hora") usan un SlidingCounter
+    por par (evento, ventana). "N días seguidos" es la racha del
+    calendario de actividad. Cada evento solo evalúa las condiciones que
+    puede cambiar.
+
+    Los eventos que llegan antes de cargar el JSON se encolan y se
+    aplican al cargar.
+
+    Args:
+        state: Estado de la aplicación
+    """
+
+    def __init__(self, state):
+        self.state = state
+        self.achievements = {}
+        self.loaded = False
+        self._by_trigger = {}
+        self._caps = {}
+        self._pending = []
+
+    # =========================================================================
+    # DEFINICIONES
+    # =========================================================================
+
+    def load(self, callback=None):
+        """Carga data/achievements.json (una vez)."""
+        if self.loaded:
+            if callback:
+                callback(self)
+            return
+
+        def on_complete(req):
+            if req.status == 200:
+                try:
+                    self.set_definitions(json.loads(req.text).get('achievements', []))
+                except Exception as e:
+                    console.log(f"[Achievements] Error parsing definitions: {e}")
+                    self.set_definitions([])
+            else:
+                console.log(f"[Achievements] Error loading definitions: {req.status}")
+                self.set_definitions([])
+            if callback:
+                callback(self)
+
+        req = ajax.ajax()
+        req.bind('complete', on_complete)
+        req.open('GET', ACHIEVEMENTS_URL, True)
+        req.send()
+
+    def set_definitions(self, achievements):
+        """Indexa las definiciones y aplica los eventos pendientes."""
+        self.achievements = {a['id']: a for a in achievements}
+        self._by_trigger = {}
+        self._caps = {}
+
+        for achievement in achievements:
+            condition = achievement.get('condition', {})
+            windowed = window_of(condition)
+            if windowed:
+                key = window_key(windowed)
+                self._caps[key] = max(self._caps.get(key, 0), condition.get('value', 1))
+                self._by_trigger.setdefault(windowed[0], []).append(achievement['id'])
+                continue
+            for kind, types in LIFETIME_TRIGGERS.items():
+                if condition.get('type') in types:
+                    self._by_trigger.setdefault(kind, []).append(achievement['id'])
+
+        self.loaded = True
+        console.log(f"[Achievements] {len(self.achievements)} definitions loaded")
+
+        pending, self._pending = self._pending, []
+        for kind, now in pending:
+            self.on_event(kind, now)
+
+    # =========================================================================
+    # EVENTOS
+    # =========================================================================
+
+    def _data(self):
+        return self.state.data.setdefault('achievements', {'unlocked': {}, 'windows': {}})
+
+    def _counter(self, key):
+        event, seconds = key.split(':')
+        stamps = self._data()['windows'].setdefault(key, [])
+        return SlidingCounter(stamps, int(seconds) * 1000, self._caps.get(key, 1))
+
+    def on_event(self, kind, now=None):
+        """
+        Registra un evento ('lesson', 'puzzle', 'playground', 'activity')
+        y desbloquea los logros que complete.
+
+        Returns:
+            Lista de logros nuevos
+        """
+        now = window.Date.now() if now is None else now
+        if not self.loaded:
+            self._pending.append((kind, now))
+            return []
+
+        counts = {}
+        for key in self._caps:
+            if key.startswith(kind + ':'):
+                self.state.stage('achievements')
+                counts[key] = self._counter(key).add(now)
+        if counts:
+            self.state.save('achievements')
+
+        unlocked = self._data()['unlocked']
+        matched = []
+        for achievement_id in self._by_trigger.get(kind, ()):
+            if achievement_id in unlocked:
+                continue
+            if self._met(self.achievements[achievement_id]['condition'], counts, now):
+                matched.append(achievement_id)
+
+        return self._unlock(matched)
+
+    def _met(self, condition, counts, now):
+        """Evalúa una condición con los contadores actuales."""
+        value = condition.get('value')
+        windowed = window_of(condition)
+        if windowed:
+            key = window_key(windowed)
+            count = counts[key] if key in counts else self._counter(key).count(now)
+            return count >= value
+        return self._lifetime(condition.get('type'), value)
+
+    def _lifetime(self, condition_type, value):
+        state = self.state
+        counters = state.get_counters()
+
+        if condition_type == 'lessons_completed':
+            return counters['lessons_completed'] >= value
+        if condition_type == 'category_complete':
+            from ..lessons.content import get_lessons_by_category_data
+            total = len(get_lessons_by_category_data(value))
+            return total > 0 and counters['lessons_by_category'].get(value, 0) >= total
+        if condition_type == 'puzzles_solved':
+            return counters['puzzles_solved'] >= value
+        if condition_type == 'three_stars':
+            return counters['three_star'] >= value
+        if condition_type == 'puzzle_time':
+            fastest = counters['fastest_time']
+            return fastest is not None and fastest < value
+        if condition_type == 'streak_days':
+            return state.get('streak.current', 0) >= value
+        if condition_type == 'level_reached':
+            return LevelSystem().get_level(state.get('progress.xp', 0)) >= value
+        if condition_type == 'total_xp':
+            return state.get('progress.xp', 0) >= value
+        if condition_type == 'playground_uses':
+            return state.data.get('stats', {}).get('playground', {}).get('uses', 0) >= value
+        if condition_type == 'badges_unlocked':
+            return len(state.data.get('badges', [])) >= value
+        return False
+
+    def _unlock(self, achievement_ids, show_toast=True):
+        """Registra los logros nuevos y otorga su XP en una transacción."""
+        if not achievement_ids:
+            return []
+
+        from .xp import award_xp
+        achievements = [self.achievements[a] for a in achievement_ids]
+
+        with self.state.transaction():
+            self.state.stage('achievements')
+            unlocked = self._data()['unlocked']
+            now = str(window.Date.new())
+            for achievement in achievements:
+                achievement_id = achievement['id']
+                unlocked[achievement_id] = now
+                self.state.after_commit(
+                    lambda a=achievement_id: get_history_db().append('achievement', {'achievement_id': a}, a))
+                self.state.record_event('achievement_unlocked', achievement_id=achievement['id'])
+                if achievement.get('xp_reward'):
+                    award_xp(self.state, 'achievement_unlock', achievement['xp_reward'],
+                             reason=f"Logro: {achievement['name']}")
+            self.state.save('achievements')
+
+        # Si el logro llega dentro de otra transacción, al confirmar esa
+        if show_toast:
+            for achievement in achievements:
+                self.state.after_commit(
+                    lambda a=achievement: badge_toast(a['name'], a.get('icon', '🏆')))
+
+        return achievements
+
+    # =========================================================================
+    # CONSULTAS
+    # =========================================================================
+
+    def is_unlocked(self, achievement_id):
+        return achievement_id in self._data()['unlocked']
+
+    def get_all(self):
+        """Logros con su estado de desbloqueo."""
+        unlocked = self._data()['unlocked']
+        return [
+            {**achievement, 'unlocked': achievement['id'] in unlocked,
+             'unlocked_at': unlocked.get(achievement['id'])}
+            for achievement in self.achievements.values()
+        ]
+
+    def get_window_count(self, condition):
+        """Eventos actuales en la ventana de una condición (para progreso)."""
+        windowed = window_of(condition)
+        if not windowed:
+            return 0
+        return self._counter(window_key(windowed)).count(window.Date.now())
+
+
+_achievement_engine = None
+
+
+def get_achievement_engine():
+    """Obtiene el motor de logros singleton."""
+    global _achievement_engine
+    if _achievement_engine is None:
+        from ..state import get_state
+        _achievement_engine = AchievementEngine(get_state())
+    return _achievement_engine
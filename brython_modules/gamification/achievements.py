@@ -7,6 +7,9 @@ from browser import window
 class AchievementTracker:
     """
     Rastrea logros y estadísticas del usuario.
+
+    Los totales salen de los contadores que AppState mantiene en cada
+    evento (state.get_counters()), sin recorrer lecciones ni puzzles.
     """
 
     def __init__(self, state):
@@ -20,23 +23,19 @@ class AchievementTracker:
             lesson_id: ID de la lección
             time_spent: Tiempo en segundos
         """
-        if 'lessons_completed' not in self.state.data:
-            self.state.data['lessons_completed'] = []
-
-        if lesson_id not in self.state.data['lessons_completed']:
-            self.state.data['lessons_completed'].append(lesson_id)
+        self.state.mark_lesson_completed(lesson_id)
+        count = self.state.get_counters()['lessons_completed']
 
         # Estadísticas
         self._update_stats('lessons', {
-            'total_completed': len(self.state.data['lessons_completed']),
+            'total_completed': count,
             'total_time': self._get_stat('lessons', 'total_time', 0) + time_spent,
         })
 
-        self.state.save()
+        self.state.save('stats')
 
         # Verificar badges
         from .badges import check_badge_unlock
-        count = len(self.state.data['lessons_completed'])
         check_badge_unlock(self.state, 'lessons_completed', count)
 
         # Verificar badge de lección específica
@@ -45,41 +44,25 @@ class AchievementTracker:
     def track_puzzle_complete(self, puzzle_id, result):
         """
         Registra la completación de un puzzle.
+        El resultado ya debe estar guardado con state.record_puzzle_result().
 
         Args:
             puzzle_id: ID del puzzle
             result: Dict con time, stars, hints_used
         """
-        if 'puzzles_completed' not in self.state.data:
-            self.state.data['puzzles_completed'] = {}
-
-        # Guardar/actualizar mejor resultado
-        existing = self.state.data['puzzles_completed'].get(puzzle_id, {})
-
-        if not existing or result.get('stars', 0) > existing.get('best_stars', 0):
-            existing['best_stars'] = result.get('stars', 0)
-
-        if not existing.get('best_time') or result.get('time', 999999) < existing.get('best_time', 999999):
-            existing['best_time'] = result.get('time')
-
-        existing['solved'] = True
-        existing['attempts'] = existing.get('attempts', 0) + 1
-        existing['last_solved'] = str(window.Date.new())
-
-        self.state.data['puzzles_completed'][puzzle_id] = existing
+        counters = self.state.get_counters()
+        count = counters['puzzles_solved']
 
         # Estadísticas
         self._update_stats('puzzles', {
-            'total_solved': len(self.state.data['puzzles_completed']),
-            'total_3_stars': len([p for p in self.state.data['puzzles_completed'].values()
-                                 if p.get('best_stars', 0) == 3]),
+            'total_solved': count,
+            'total_3_stars': counters['three_star'],
         })
 
-        self.state.save()
+        self.state.save('stats')
 
         # Verificar badges
         from .badges import check_badge_unlock
-        count = len(self.state.data['puzzles_completed'])
         check_badge_unlock(self.state, 'puzzles_solved', count)
 
         if result.get('stars') == 3:
@@ -95,7 +78,7 @@ class AchievementTracker:
         """Registra uso del playground."""
         count = self._get_stat('playground', 'uses', 0) + 1
         self._update_stats('playground', {'uses': count})
-        self.state.save()
+        self.state.save('stats')
 
         from .badges import check_badge_unlock
         check_badge_unlock(self.state, 'playground_use', count)
@@ -106,6 +89,7 @@ class AchievementTracker:
         last_login = self.state.data.get('last_login')
 
         if last_login != today:
+            self.state.stage('last_login')
             self.state.data['last_login'] = today
 
             # Verificar hora para badges especiales
@@ -117,7 +101,7 @@ class AchievementTracker:
             elif hour >= 0 and hour < 5:
                 check_badge_unlock(self.state, 'time_of_day', 'night')
 
-            self.state.save()
+            self.state.save('last_login')
 
     def _get_today(self):
         """Obtiene fecha de hoy."""
@@ -126,6 +110,7 @@ class AchievementTracker:
 
     def _update_stats(self, category, stats):
         """Actualiza estadísticas."""
+        self.state.stage('stats')
         if 'stats' not in self.state.data:
             self.state.data['stats'] = {}
         if category not in self.state.data['stats']:
@@ -140,23 +125,27 @@ class AchievementTracker:
     def get_all_stats(self):
         """Obtiene todas las estadísticas."""
         stats = self.state.data.get('stats', {})
+        counters = self.state.get_counters()
 
         return {
             'lessons': {
-                'completed': len(self.state.data.get('lessons_completed', [])),
+                'completed': counters['lessons_completed'],
                 'total_time': stats.get('lessons', {}).get('total_time', 0),
+                'by_category': dict(counters['lessons_by_category']),
             },
             'puzzles': {
-                'solved': len(self.state.data.get('puzzles_completed', {})),
-                'three_stars': len([p for p in self.state.data.get('puzzles_completed', {}).values()
-                                   if p.get('best_stars', 0) == 3]),
+                'solved': counters['puzzles_solved'],
+                'three_stars': counters['three_star'],
+                'no_hints': counters['no_hint'],
+                'fastest_time': counters['fastest_time'],
+                'by_category': dict(counters['puzzles_by_category']),
             },
             'xp': {
-                'total': self.state.data.get('xp', 0),
+                'total': self.state.get('progress.xp', 0),
             },
             'streak': {
-                'current': self.state.data.get('streak', {}).get('current', 0),
-                'max': self.state.data.get('streak', {}).get('max', 0),
+                'current': self.state.get('streak.current', 0),
+                'max': self.state.get('streak.longest', 0),
             },
             'badges': {
                 'unlocked': len(self.state.data.get('badges', [])),
@@ -215,3 +204,8 @@ def check_achievements(state, event_type, event_data=None):
         tracker.track_playground_use()
     elif event_type == 'daily_login':
         tracker.track_daily_login()
+
+    # Logros de data/achievements.json (incluye condiciones por ventana)
+    from .achievement_engine import get_achievement_engine, EVENT_KINDS
+    if event_type in EVENT_KINDS:
+        get_achievement_engine().on_event(EVENT_KINDS[event_type])
@@ -3,6 +3,9 @@
 
 from browser import window
 from ..components.toast import badge_toast
+from ..selectors import selector
+from ..persistence import get_history_db
+from .levels import LevelSystem
 
 
 # Definición de todos los badges
@@ -340,6 +343,110 @@ BADGES = {
 }
 
 
+# Condiciones numéricas en las que un valor menor es mejor
+LOWER_IS_BETTER = ('puzzle_time',)
+
+
+def _compile_condition(condition_type, target):
+    """
+    Compila una condición a (predicado, ordenable, clave de orden).
+
+    Las condiciones numéricas son monótonas: si un umbral no se cumple,
+    tampoco los siguientes en orden, y la evaluación puede detenerse.
+    """
+    if isinstance(target, bool) or not isinstance(target, (int, float)):
+        return (lambda value: value == target), False, 0
+    if condition_type in LOWER_IS_BETTER:
+        return (lambda value: value <= target), True, -target
+    return (lambda value: value >= target), True, target
+
+
+def _compile_rules(badges):
+    """
+    Indexa los badges por tipo de condición.
+
+    Returns:
+        {condition_type: [(badge_id, predicado, ordenable)]}, con las
+        reglas numéricas primero y en orden de umbral
+    """
+    compiled = {}
+    for badge_id, badge in badges.items():
+        condition = badge.get('condition', {})
+        condition_type = condition.get('type')
+        predicate, ordered, order = _compile_condition(condition_type, condition.get('value'))
+        compiled.setdefault(condition_type, []).append((0 if ordered else 1, order, badge_id, predicate, ordered))
+
+    rules_by_type = {}
+    for condition_type, rules in compiled.items():
+        rules.sort(key=lambda rule: rule[:2])
+        rules_by_type[condition_type] = [rule[2:] for rule in rules]
+    return rules_by_type
+
+
+# Reglas compiladas al importar el módulo
+RULES_BY_TYPE = _compile_rules(BADGES)
+
+
+# =============================================================================
+# CATÁLOGO (índices inmutables, calculados al importar)
+# =============================================================================
+
+RARITY_ORDER = {'legendary': 0, 'epic': 1, 'rare': 2, 'common': 3}
+
+BADGE_IDS = tuple(BADGES)
+BADGE_BITS = {badge_id: 1 << index for index, badge_id in enumerate(BADGE_IDS)}
+
+
+def _build_index(field):
+    """{valor: tupla de ids} ordenada por rareza (más rara primero)."""
+    index = {}
+    for badge_id in sorted(BADGE_IDS, key=lambda b: RARITY_ORDER.get(BADGES[b].get('rarity'), 3)):
+        index.setdefault(BADGES[badge_id].get(field), []).append(badge_id)
+    return {value: tuple(ids) for value, ids in index.items()}
+
+
+BY_CATEGORY = _build_index('category')
+BY_RARITY = _build_index('rarity')
+CATALOG_ORDER = tuple(badge_id for ids in BY_RARITY.values() for badge_id in ids)
+RARITY_MASKS = {
+    rarity: sum(BADGE_BITS[badge_id] for badge_id in ids)
+    for rarity, ids in BY_RARITY.items()
+}
+
+# Vista de cada badge bloqueado (compartida, no debe mutarse)
+_LOCKED_VIEWS = {badge_id: dict(badge, unlocked=False) for badge_id, badge in BADGES.items()}
+
+# Vistas de desbloqueados por (badge_id, unlocked_at)
+_unlocked_views = {}
+
+# Bitset de desbloqueados por estado: id(state) -> (sello de versión, bits)
+_unlocked_bits = {}
+
+
+def _popcount(bits):
+    return bin(bits).count('1')
+
+
+# (badge_id, tipo de condición, objetivo) en orden de definición
+_CONDITIONS = tuple(
+    (badge_id, badge['condition'].get('type'), badge['condition'].get('value'))
+    for badge_id, badge in BADGES.items()
+)
+
+
+def _progress(current, target):
+    """Dict de progreso {current, target, percentage}."""
+    if isinstance(target, (int, float)) and not isinstance(target, bool) and target > 0:
+        percentage = min(100, (current / target) * 100)
+    else:
+        percentage = 100 if current else 0
+    return {
+        'current': current,
+        'target': target,
+        'percentage': percentage,
+    }
+
+
 class BadgeManager:
     """
     Gestiona los badges del usuario.
@@ -348,9 +455,42 @@ class BadgeManager:
     def __init__(self, state):
         self.state = state
 
+    def _unlocked_mask(self):
+        """Bitset de badges desbloqueados (se reconstruye si cambió 'badges')."""
+        stamp = self.state.stamp(('badges',))
+        cached = _unlocked_bits.get(id(self.state))
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        bits = 0
+        for badge_id in self.state.data.get('badges', []):
+            bits |= BADGE_BITS.get(badge_id, 0)
+        _unlocked_bits[id(self.state)] = (stamp, bits)
+        return bits
+
+    def is_unlocked(self, badge_id):
+        """Verifica si un badge está desbloqueado."""
+        return bool(self._unlocked_mask() & BADGE_BITS.get(badge_id, 0))
+
+    def _view(self, badge_id, mask):
+        """
+        Vista de un badge con su estado. Las vistas son compartidas
+        entre llamadas: no deben mutarse.
+        """
+        if not mask & BADGE_BITS[badge_id]:
+            return _LOCKED_VIEWS[badge_id]
+
+        unlocked_at = self._get_unlock_time(badge_id)
+        key = (badge_id, unlocked_at)
+        view = _unlocked_views.get(key)
+        if view is None:
+            view = dict(BADGES[badge_id], unlocked=True, unlocked_at=unlocked_at)
+            _unlocked_views[key] = view
+        return view
+
     def get_all(self, include_locked=True):
         """
-        Obtiene todos los badges.
+        Obtiene todos los badges (orden de definición).
 
         Args:
             include_locked: Incluir badges no desbloqueados
@@ -358,32 +498,32 @@ class BadgeManager:
         Returns:
             Lista de badges con estado
         """
-        unlocked = set(self.state.data.get('badges', []))
-        badges = []
-
-        for badge_id, badge_data in BADGES.items():
-            badge = dict(badge_data)
-            badge['unlocked'] = badge_id in unlocked
-
-            if badge['unlocked']:
-                badge['unlocked_at'] = self._get_unlock_time(badge_id)
-
-            if include_locked or badge['unlocked']:
-                badges.append(badge)
-
-        return badges
+        if not include_locked:
+            return self.get_unlocked()
+        mask = self._unlocked_mask()
+        return [self._view(badge_id, mask) for badge_id in BADGE_IDS]
 
     def get_unlocked(self):
         """Obtiene solo badges desbloqueados."""
-        return self.get_all(include_locked=False)
+        mask = self._unlocked_mask()
+        return [self._view(badge_id, mask) for badge_id in self.state.data.get('badges', []) if badge_id in BADGES]
+
+    def get_catalog(self, category='all'):
+        """
+        Badges de una categoría ('all' = todos), más raros primero.
+        """
+        ids = CATALOG_ORDER if category == 'all' else BY_CATEGORY.get(category, ())
+        mask = self._unlocked_mask()
+        return [self._view(badge_id, mask) for badge_id in ids]
 
     def get_by_category(self, category):
         """Obtiene badges de una categoría."""
-        return [b for b in self.get_all() if b.get('category') == category]
+        return self.get_catalog(category)
 
     def get_by_rarity(self, rarity):
         """Obtiene badges de una rareza."""
-        return [b for b in self.get_all() if b.get('rarity') == rarity]
+        mask = self._unlocked_mask()
+        return [self._view(badge_id, mask) for badge_id in BY_RARITY.get(rarity, ())]
 
     def _get_unlock_time(self, badge_id):
         """Obtiene cuándo se desbloqueó un badge."""
@@ -404,27 +544,49 @@ class BadgeManager:
         if badge_id not in BADGES:
             return None
 
-        badges = set(self.state.data.get('badges', []))
-        if badge_id in badges:
-            return None  # Ya desbloqueado
+        unlocked = self._unlock_many([badge_id], show_toast)
+        return unlocked[0] if unlocked else None  # None: ya desbloqueado
 
-        # Desbloquear
-        badges.add(badge_id)
-        self.state.data['badges'] = list(badges)
-
-        # Registrar tiempo
-        if 'badge_history' not in self.state.data:
-            self.state.data['badge_history'] = {}
-        self.state.data['badge_history'][badge_id] = str(window.Date.new())
-
-        self.state.save()
-
-        badge = BADGES[badge_id]
+    def _unlock_many(self, badge_ids, show_toast=True):
+        """
+        Desbloquea varios badges con una sola escritura.
 
+        Returns:
+            Lista de badges nuevos
+        """
+        bits = self._unlocked_mask()
+        new_ids = []
+        for badge_id in badge_ids:
+            if not bits & BADGE_BITS[badge_id]:
+                bits |= BADGE_BITS[badge_id]
+                new_ids.append(badge_id)
+        if not new_ids:
+            return []
+
+        with self.state.transaction():
+            self.state.stage('badges', 'badge_history')
+            owned = self.state.data.setdefault('badges', [])
+            history = self.state.data.setdefault('badge_history', {})
+            now = str(window.Date.new())
+
+            for badge_id in new_ids:
+                owned.append(badge_id)
+                history[badge_id] = now
+                self.state.after_commit(
+                    lambda b=badge_id: get_history_db().append('badge', {'badge_id': b}, b))
+                self.state.record_event('badge_unlocked', badge_id=badge_id)
+
+            self.state.save('badges', 'badge_history')
+
+        # El bitset se actualiza en sitio en lugar de reconstruirlo
+        _unlocked_bits[id(self.state)] = (self.state.stamp(('badges',)), bits)
+
+        unlocked = [BADGES[badge_id] for badge_id in new_ids]
         if show_toast:
-            badge_toast(badge['name'], badge['icon'])
+            for badge in unlocked:
+                badge_toast(badge['name'], badge['icon'])
 
-        return badge
+        return unlocked
 
     def check_and_unlock(self, condition_type, value):
         """
@@ -437,36 +599,16 @@ class BadgeManager:
         Returns:
             Lista de badges desbloqueados
         """
-        unlocked = []
-
-        for badge_id, badge in BADGES.items():
-            condition = badge.get('condition', {})
-
-            if condition.get('type') != condition_type:
-                continue
+        matched = []
 
-            target = condition.get('value')
+        # Solo las reglas de este tipo, en orden de umbral
+        for badge_id, predicate, ordered in RULES_BY_TYPE.get(condition_type, ()):
+            if predicate(value):
+                matched.append(badge_id)
+            elif ordered:
+                break  # Los umbrales siguientes tampoco se cumplen
 
-            # Verificar si cumple la condición
-            meets_condition = False
-
-            if isinstance(target, bool):
-                meets_condition = value == target
-            elif isinstance(target, (int, float)):
-                if condition_type in ['puzzle_time']:
-                    # Para tiempo, menor es mejor
-                    meets_condition = value <= target
-                else:
-                    meets_condition = value >= target
-            elif isinstance(target, str):
-                meets_condition = value == target
-
-            if meets_condition:
-                result = self.unlock(badge_id)
-                if result:
-                    unlocked.append(result)
-
-        return unlocked
+        return self._unlock_many(matched)
 
     def get_progress(self, badge_id):
         """
@@ -480,53 +622,53 @@ class BadgeManager:
         """
         if badge_id not in BADGES:
             return None
+        return self.progress_snapshot()[badge_id]
 
-        badge = BADGES[badge_id]
-        condition = badge.get('condition', {})
-        condition_type = condition.get('type')
-        target = condition.get('value')
-
-        current = 0
-
-        # Obtener valor actual según tipo
-        if condition_type == 'lessons_completed':
-            current = len(self.state.data.get('lessons_completed', []))
-        elif condition_type == 'puzzles_solved':
-            current = len(self.state.data.get('puzzles_completed', {}))
-        elif condition_type == 'streak':
-            current = self.state.data.get('streak', {}).get('current', 0)
-        elif condition_type == 'xp':
-            current = self.state.data.get('xp', 0)
-        elif condition_type == 'level':
-            from .levels import LevelSystem
-            current = LevelSystem().get_level(self.state.data.get('xp', 0))
-
-        if isinstance(target, (int, float)) and target > 0:
-            percentage = min(100, (current / target) * 100)
-        else:
-            percentage = 100 if current else 0
+    def _read_metrics(self):
+        """Valor actual de cada tipo de condición medible (una lectura cada uno)."""
+        xp = self.state.get('progress.xp', 0)
+        counters = self.state.get_counters()
+        return {
+            'lessons_completed': counters['lessons_completed'],
+            'puzzles_solved': counters['puzzles_solved'],
+            'streak': self.state.get('streak.current', 0),
+            'xp': xp,
+            'level': LevelSystem().get_level(xp),
+        }
 
+    @selector('progress', 'streak', 'counters')
+    def progress_snapshot(self):
+        """
+        Progreso de todos los badges en una sola pasada.
+
+        Returns:
+            {badge_id: {current, target, percentage}} (compartido, no
+            debe mutarse; se recalcula al cambiar progress, streak o counters)
+        """
+        metrics = self._read_metrics()
         return {
-            'current': current,
-            'target': target,
-            'percentage': percentage,
+            badge_id: _progress(metrics.get(condition_type, 0), target)
+            for badge_id, condition_type, target in _CONDITIONS
         }
 
+    @selector('badges')
     def get_stats(self):
         """Obtiene estadísticas de badges."""
-        all_badges = self.get_all()
-        unlocked = [b for b in all_badges if b['unlocked']]
+        mask = self._unlocked_mask()
+        total = len(BADGE_IDS)
+        unlocked = _popcount(mask)
 
         by_rarity = {}
         for rarity in ['common', 'rare', 'epic', 'legendary']:
-            total = len([b for b in all_badges if b['rarity'] == rarity])
-            have = len([b for b in unlocked if b['rarity'] == rarity])
-            by_rarity[rarity] = {'total': total, 'have': have}
+            by_rarity[rarity] = {
+                'total': len(BY_RARITY.get(rarity, ())),
+                'have': _popcount(mask & RARITY_MASKS.get(rarity, 0)),
+            }
 
         return {
-            'total': len(all_badges),
-            'unlocked': len(unlocked),
-            'percentage': (len(unlocked) / len(all_badges)) * 100 if all_badges else 0,
+            'total': total,
+            'unlocked': unlocked,
+            'percentage': (unlocked / total) * 100 if total else 0,
             'by_rarity': by_rarity,
         }
 
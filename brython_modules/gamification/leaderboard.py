@@ -1,48 +1,167 @@
 # PromptCraft - Leaderboard
 # Sistema de tabla de clasificación (local/demo)
 
-from browser import local_storage, window
+from bisect import bisect_left, insort
+from datetime import date
+from browser import window, console
+from browser.local_storage import storage
 import json
+from ..persistence import WriteBehindWriter
+
+
+class RankIndex:
+    """
+    Índice ordenado de jugadores por XP.
+
+    Las claves (-xp, username) se mantienen ordenadas en una lista y cada
+    usuario apunta a su entrada; el rank sale de una búsqueda binaria
+    sobre su clave, sin recorrer la tabla. Insertar o quitar es bisect
+    más un desplazamiento de la lista (memmove), rápido aun con 100k
+    entradas. A igual XP se ordena por nombre de usuario.
+
+    Args:
+        max_entries: Máximo de entradas (None = sin límite); al
+            excederlo se descarta la última
+    """
+
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries
+        self._keys = []
+        self._entries = {}
+        self.total_xp = 0
+        self.total_level = 0
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, username):
+        return username in self._entries
+
+    @staticmethod
+    def _key(entry):
+        return (-entry['xp'], entry['username'])
+
+    def load(self, entries):
+        """Carga entradas en bloque (un solo ordenamiento)."""
+        for entry in entries:
+            old = self._entries.get(entry['username'])
+            if old is not None:
+                self._count(old, -1)
+            self._entries[entry['username']] = entry
+            self._count(entry, 1)
+        self._keys = sorted(self._key(entry) for entry in self._entries.values())
+        self._trim()
+
+    def upsert(self, entry):
+        """Añade o reemplaza la entrada de un usuario."""
+        username = entry['username']
+        old = self._entries.get(username)
+
+        if old is not None:
+            self._count(old, -1)
+            if old['xp'] != entry['xp']:
+                self._remove_key(old)
+                insort(self._keys, self._key(entry))
+        else:
+            insort(self._keys, self._key(entry))
+
+        self._entries[username] = entry
+        self._count(entry, 1)
+        self._trim()
+
+    def remove(self, username):
+        """Quita a un usuario del índice."""
+        entry = self._entries.pop(username, None)
+        if entry is not None:
+            self._remove_key(entry)
+            self._count(entry, -1)
+
+    def get(self, username):
+        """Entrada de un usuario (o None)."""
+        return self._entries.get(username)
+
+    def position(self, username):
+        """Posición 0-based de un usuario (o None)."""
+        entry = self._entries.get(username)
+        if entry is None:
+            return None
+        return bisect_left(self._keys, self._key(entry))
+
+    def slice(self, start, end):
+        """Entradas entre dos posiciones, en orden de rank."""
+        return [self._entries[key[1]] for key in self._keys[start:end]]
+
+    def _remove_key(self, entry):
+        index = bisect_left(self._keys, self._key(entry))
+        del self._keys[index]
+
+    def _count(self, entry, sign):
+        self.total_xp += sign * entry['xp']
+        self.total_level += sign * entry.get('level', 1)
+
+    def _trim(self):
+        if self.max_entries is None:
+            return
+        while len(self._keys) > self.max_entries:
+            _, username = self._keys.pop()
+            self._count(self._entries.pop(username), -1)
 
 
 class Leaderboard:
     """
     Sistema de leaderboard local.
     En una aplicación real, esto se conectaría a un backend.
+
+    Args:
+        state: Estado de la aplicación (para sync_current_user)
+        max_entries: Máximo de jugadores guardados
+        persist: Guardar en localStorage tras cada cambio
     """
 
     STORAGE_KEY = 'promptcraft_leaderboard'
     MAX_ENTRIES = 100
 
-    def __init__(self, state=None):
+    def __init__(self, state=None, max_entries=MAX_ENTRIES, persist=True):
         self.state = state
-        self._cache = None
+        self.persist = persist
+        self._index = RankIndex(max_entries)
+        self._last_updated = None
+        self._loaded = False
 
     def _load(self):
-        """Carga el leaderboard del storage."""
-        if self._cache is not None:
-            return self._cache
+        """Carga el leaderboard del storage (una vez)."""
+        if self._loaded:
+            return self._index
+        self._loaded = True
+
+        if not self.persist:
+            return self._index
 
         try:
-            data = local_storage.getItem(self.STORAGE_KEY)
-            if data:
-                self._cache = json.loads(data)
-            else:
-                self._cache = {'entries': [], 'last_updated': None}
-        except:
-            self._cache = {'entries': [], 'last_updated': None}
+            raw = storage.get(self.STORAGE_KEY)
+            if raw:
+                data = json.loads(raw)
+                self._index.load(data.get('entries', []))
+                self._last_updated = data.get('last_updated')
+        except Exception:
+            pass
 
-        return self._cache
+        return self._index
 
     def _save(self):
         """Guarda el leaderboard en storage."""
-        if self._cache:
-            self._cache['last_updated'] = str(window.Date.new())
-            local_storage.setItem(self.STORAGE_KEY, json.dumps(self._cache))
+        if not self.persist:
+            return
+        self._last_updated = str(window.Date.new())
+        storage[self.STORAGE_KEY] = json.dumps({
+            'entries': self._index.slice(0, len(self._index)),
+            'last_updated': self._last_updated,
+        })
 
     def add_entry(self, username, xp, level, badges_count):
         """
-        Añade o actualiza una entrada en el leaderboard.
+        Añade o actualiza una entrada en el leaderboard (O(log n) más el
+        desplazamiento de la lista).
 
         Args:
             username: Nombre de usuario
@@ -50,36 +169,18 @@ class Leaderboard:
             level: Nivel actual
             badges_count: Número de badges
         """
-        data = self._load()
-
-        # Buscar entrada existente
-        existing_idx = None
-        for i, entry in enumerate(data['entries']):
-            if entry['username'] == username:
-                existing_idx = i
-                break
-
-        new_entry = {
+        self._load().upsert({
             'username': username,
             'xp': xp,
             'level': level,
             'badges': badges_count,
             'updated': str(window.Date.new()),
-        }
-
-        if existing_idx is not None:
-            data['entries'][existing_idx] = new_entry
-        else:
-            data['entries'].append(new_entry)
-
-        # Ordenar por XP descendente
-        data['entries'].sort(key=lambda x: x['xp'], reverse=True)
-
-        # Limitar entradas
-        if len(data['entries']) > self.MAX_ENTRIES:
-            data['entries'] = data['entries'][:self.MAX_ENTRIES]
+        })
+        self._save()
 
-        self._cache = data
+    def load_entries(self, entries):
+        """Carga varias entradas de una vez (p. ej. datos demo)."""
+        self._load().load(entries)
         self._save()
 
     def get_top(self, limit=10):
@@ -92,14 +193,8 @@ class Leaderboard:
         Returns:
             Lista de entradas con rank
         """
-        data = self._load()
-        entries = data['entries'][:limit]
-
-        # Añadir rank
-        for i, entry in enumerate(entries):
-            entry['rank'] = i + 1
-
-        return entries
+        entries = self._load().slice(0, limit)
+        return [dict(entry, rank=i + 1) for i, entry in enumerate(entries)]
 
     def get_rank(self, username):
         """
@@ -111,13 +206,8 @@ class Leaderboard:
         Returns:
             Rank (1-based) o None si no está
         """
-        data = self._load()
-
-        for i, entry in enumerate(data['entries']):
-            if entry['username'] == username:
-                return i + 1
-
-        return None
+        position = self._load().position(username)
+        return None if position is None else position + 1
 
     def get_nearby(self, username, count=5):
         """
@@ -130,29 +220,18 @@ class Leaderboard:
         Returns:
             Lista de entradas con rank
         """
-        data = self._load()
-        entries = data['entries']
-
-        # Encontrar posición del usuario
-        user_idx = None
-        for i, entry in enumerate(entries):
-            if entry['username'] == username:
-                user_idx = i
-                break
-
+        index = self._load()
+        user_idx = index.position(username)
         if user_idx is None:
             return []
 
-        # Obtener entradas cercanas
         start = max(0, user_idx - count)
-        end = min(len(entries), user_idx + count + 1)
+        end = min(len(index), user_idx + count + 1)
 
         nearby = []
-        for i in range(start, end):
-            entry = dict(entries[i])
-            entry['rank'] = i + 1
-            entry['is_user'] = (i == user_idx)
-            nearby.append(entry)
+        for offset, entry in enumerate(index.slice(start, end)):
+            i = start + offset
+            nearby.append(dict(entry, rank=i + 1, is_user=(i == user_idx)))
 
         return nearby
 
@@ -163,10 +242,10 @@ class Leaderboard:
         Returns:
             Dict con estadísticas
         """
-        data = self._load()
-        entries = data['entries']
+        index = self._load()
+        players = len(index)
 
-        if not entries:
+        if not players:
             return {
                 'total_players': 0,
                 'avg_xp': 0,
@@ -174,19 +253,18 @@ class Leaderboard:
                 'avg_level': 0,
             }
 
-        total_xp = sum(e['xp'] for e in entries)
-        total_level = sum(e['level'] for e in entries)
-
+        # Totales mantenidos de forma incremental por el índice
         return {
-            'total_players': len(entries),
-            'avg_xp': total_xp // len(entries),
-            'max_xp': entries[0]['xp'] if entries else 0,
-            'avg_level': total_level // len(entries),
+            'total_players': players,
+            'avg_xp': index.total_xp // players,
+            'max_xp': index.slice(0, 1)[0]['xp'],
+            'avg_level': index.total_level // players,
         }
 
     def clear(self):
         """Limpia el leaderboard."""
-        self._cache = {'entries': [], 'last_updated': None}
+        self._index = RankIndex(self._index.max_entries)
+        self._loaded = True
         self._save()
 
     def sync_current_user(self):
@@ -196,18 +274,22 @@ class Leaderboard:
         if not self.state:
             return
 
-        username = self.state.data.get('username', 'Anónimo')
-        xp = self.state.data.get('xp', 0)
+        username = self.state.get('user.username', 'Anónimo')
+        xp = self.state.get('progress.xp', 0)
         level = self.state.get_level_info()['level']
         badges = len(self.state.data.get('badges', []))
 
         self.add_entry(username, xp, level, badges)
 
     @staticmethod
-    def generate_demo_data():
+    def generate_demo_data(count=None):
         """
         Genera datos de demostración para el leaderboard.
 
+        Args:
+            count: Número de jugadores (por defecto uno por nombre base);
+                los nombres se numeran si se piden más
+
         Returns:
             Lista de entradas demo
         """
@@ -219,6 +301,8 @@ class Leaderboard:
             'QuickMind', 'DeepThinker', 'PromptPro', 'AIAce',
             'CleverBot', 'WiseSage', 'TechTitan'
         ]
+        if count is not None and count != len(names):
+            names = [f"{names[i % len(names)]}{i // len(names) or ''}" for i in range(count)]
 
         entries = []
         for i, name in enumerate(names):
@@ -238,3 +322,230 @@ class Leaderboard:
         entries.sort(key=lambda x: x['xp'], reverse=True)
 
         return entries
+
+    @staticmethod
+    def benchmark(count=100000, operations=1000):
+        """
+        Mide el leaderboard con `count` jugadores demo (debug).
+
+        Returns:
+            Dict con el tiempo de carga y el coste medio (ms) de
+            add_entry, get_rank y get_nearby
+        """
+        import random
+
+        now = window.performance.now
+        board = Leaderboard(max_entries=None, persist=False)
+
+        entries = Leaderboard.generate_demo_data(count)
+        start = now()
+        board.load_entries(entries)
+        load_ms = now() - start
+
+        names = [random.choice(entries)['username'] for _ in range(operations)]
+
+        start = now()
+        for name in names:
+            xp = random.randint(100, 15000)
+            board.add_entry(name, xp, min(10, xp // 1000 + 1), 0)
+        update_ms = (now() - start) / operations
+
+        start = now()
+        for name in names:
+            board.get_rank(name)
+        rank_ms = (now() - start) / operations
+
+        start = now()
+        for name in names:
+            board.get_nearby(name)
+        nearby_ms = (now() - start) / operations
+
+        result = {
+            'players': len(board._index),
+            'load_ms': round(load_ms, 1),
+            'add_entry_ms': round(update_ms, 4),
+            'get_rank_ms': round(rank_ms, 4),
+            'get_nearby_ms': round(nearby_ms, 4),
+        }
+        console.log(f"[Leaderboard] Benchmark: {result}")
+        return result
+
+
+class WindowedLeaderboard:
+    """
+    Leaderboards por ventana de tiempo (semanal, mensual, histórico).
+
+    La XP se acumula en cubetas por día {día: {usuario: xp}}. Cada
+    ventana mantiene el total por usuario y un RankIndex, actualizados
+    al sumar XP. Al cambiar de día, las cubetas que salen de una ventana
+    se restan solo a los usuarios que contienen, y las más antiguas que
+    la ventana más larga se eliminan. El histórico no usa cubetas.
+
+    La escritura en localStorage es diferida (WriteBehindWriter): varias
+    sumas seguidas producen una sola serialización de las cubetas.
+    """
+
+    STORAGE_KEY = 'promptcraft_leaderboard_windows'
+
+    # Ventanas: nombre -> días (None = histórico)
+    WINDOWS = {
+        'weekly': 7,
+        'monthly': 30,
+        'all_time': None,
+    }
+
+    def __init__(self, persist=True):
+        self.persist = persist
+        self._buckets = {}
+        self._totals = {name: {} for name in self.WINDOWS}
+        self._indexes = {name: RankIndex() for name in self.WINDOWS}
+        self._day = self._today()
+        self.stats = {'rollovers': 0, 'users_touched': 0, 'buckets_compacted': 0}
+        self._writer = None
+        if persist:
+            self._writer = WriteBehindWriter(self._write)
+            self._writer.install()
+        self._load()
+
+    @staticmethod
+    def _today():
+        """Día actual como ordinal (días desde 0001-01-01)."""
+        return date.today().toordinal()
+
+    def _load(self):
+        """Reconstruye totales e índices desde las cubetas guardadas."""
+        if not self.persist:
+            return
+        try:
+            raw = storage.get(self.STORAGE_KEY)
+            if not raw:
+                return
+            data = json.loads(raw)
+        except Exception:
+            return
+
+        self._buckets = {int(day): users for day, users in data.get('buckets', {}).items()}
+        self._day = data.get('day', self._day)
+        self._totals['all_time'] = data.get('all_time', {})
+
+        for name, days in self.WINDOWS.items():
+            if days is None:
+                continue
+            totals = self._totals[name]
+            for day, users in self._buckets.items():
+                if day > self._day - days:
+                    for username, xp in users.items():
+                        totals[username] = totals.get(username, 0) + xp
+
+        for name, totals in self._totals.items():
+            self._indexes[name].load(
+                [{'username': username, 'xp': xp} for username, xp in totals.items()]
+            )
+
+        self.roll()
+
+    def _save(self):
+        """Programa la escritura de las cubetas (ver WriteBehindWriter)."""
+        if self._writer is not None:
+            self._writer.mark_dirty()
+
+    def _write(self, keys):
+        """Escribe las cubetas y los totales históricos en localStorage."""
+        storage[self.STORAGE_KEY] = json.dumps({
+            'day': self._day,
+            'buckets': self._buckets,
+            'all_time': self._totals['all_time'],
+        })
+
+    def _add(self, name, username, amount):
+        """Suma (o resta) XP a un usuario en una ventana."""
+        totals = self._totals[name]
+        xp = totals.get(username, 0) + amount
+        if xp > 0:
+            totals[username] = xp
+            self._indexes[name].upsert({'username': username, 'xp': xp})
+        else:
+            totals.pop(username, None)
+            self._indexes[name].remove(username)
+
+    def add_xp(self, username, amount, day=None):
+        """
+        Registra XP ganada por un usuario.
+
+        Args:
+            username: Nombre de usuario
+            amount: XP ganada
+            day: Ordinal del día (por defecto hoy)
+        """
+        self.roll()
+        day = self._day if day is None else day
+
+        bucket = self._buckets.setdefault(day, {})
+        bucket[username] = bucket.get(username, 0) + amount
+
+        for name, days in self.WINDOWS.items():
+            if days is None or day > self._day - days:
+                self._add(name, username, amount)
+
+        self._save()
+
+    def roll(self, today=None):
+        """
+        Avanza las ventanas hasta hoy: resta las cubetas que salen de
+        cada ventana y compacta las que ya no pertenecen a ninguna.
+        """
+        today = self._today() if today is None else today
+        if today <= self._day:
+            return
+
+        for name, days in self.WINDOWS.items():
+            if days is None:
+                continue
+            # Cubetas que estaban dentro de la ventana y ahora quedan fuera
+            leaving = [day for day in self._buckets if self._day - days < day <= today - days]
+            for day in leaving:
+                for username, xp in self._buckets[day].items():
+                    self._add(name, username, -xp)
+                    self.stats['users_touched'] += 1
+
+        oldest = today - max(days for days in self.WINDOWS.values() if days)
+        for day in [day for day in self._buckets if day <= oldest]:
+            del self._buckets[day]
+            self.stats['buckets_compacted'] += 1
+
+        self._day = today
+        self.stats['rollovers'] += 1
+        self._save()
+
+    def get_top(self, window='weekly', limit=10):
+        """
+        Top de una ventana.
+
+        Returns:
+            Lista de {username, xp, rank}
+        """
+        self.roll()
+        entries = self._indexes[window].slice(0, limit)
+        return [dict(entry, rank=i + 1) for i, entry in enumerate(entries)]
+
+    def get_rank(self, username, window='weekly'):
+        """Rank (1-based) de un usuario en una ventana, o None."""
+        self.roll()
+        position = self._indexes[window].position(username)
+        return None if position is None else position + 1
+
+    def get_xp(self, username, window='weekly'):
+        """XP de un usuario dentro de una ventana."""
+        self.roll()
+        return self._totals[window].get(username, 0)
+
+
+# Instancia global
+_windowed_instance = None
+
+def get_windowed_leaderboard():
+    """Obtiene la instancia singleton de los leaderboards por ventana."""
+    global _windowed_instance
+    if _windowed_instance is None:
+        _windowed_instance = WindowedLeaderboard()
+    return _windowed_instance
@@ -1,12 +1,15 @@
 # PromptCraft - Streak System
 # Sistema de rachas diarias
 
-from browser import window
+from datetime import date
 
 
 class StreakManager:
     """
     Gestiona las rachas de práctica diaria.
+
+    Los días activos viven en el calendario de AppState (bitset, ver
+    activity_calendar.py); la racha la calcula AppState.update_streak().
     """
 
     def __init__(self, state):
@@ -19,18 +22,13 @@ class StreakManager:
         Returns:
             Dict con info de la racha
         """
-        streak_data = self.state.data.get('streak', {
-            'current': 0,
-            'max': 0,
-            'last_date': None,
-            'freezes': 0,
-        })
+        streak_data = self.state.data.get('streak', {})
 
         return {
             'current': streak_data.get('current', 0),
-            'max': streak_data.get('max', 0),
+            'max': streak_data.get('longest', 0),
             'last_date': streak_data.get('last_date'),
-            'freezes': streak_data.get('freezes', 0),
+            'freezes': streak_data.get('freezes_available', 0),
             'is_active_today': self._is_active_today(),
         }
 
@@ -45,20 +43,7 @@ class StreakManager:
 
     def _get_today_string(self):
         """Obtiene la fecha de hoy como string."""
-        now = window.Date.new()
-        year = now.getFullYear()
-        month = str(now.getMonth() + 1).zfill(2)
-        day = str(now.getDate()).zfill(2)
-        return f"{year}-{month}-{day}"
-
-    def _get_yesterday_string(self):
-        """Obtiene la fecha de ayer como string."""
-        now = window.Date.new()
-        yesterday = window.Date.new(now.getTime() - (24 * 60 * 60 * 1000))
-        year = yesterday.getFullYear()
-        month = str(yesterday.getMonth() + 1).zfill(2)
-        day = str(yesterday.getDate()).zfill(2)
-        return f"{year}-{month}-{day}"
+        return date.today().isoformat()
 
     def update(self):
         """
@@ -68,67 +53,28 @@ class StreakManager:
         Returns:
             Dict con el resultado de la actualización
         """
-        if 'streak' not in self.state.data:
-            self.state.data['streak'] = {
-                'current': 0,
-                'max': 0,
-                'last_date': None,
-                'freezes': 0,
-            }
-
-        streak = self.state.data['streak']
-        today = self._get_today_string()
-        yesterday = self._get_yesterday_string()
-        last_date = streak.get('last_date')
+        previous = self.state.get('streak.current', 0)
+        longest = self.state.get('streak.longest', 0)
+        update = self.state.update_streak()
 
         result = {
-            'previous': streak['current'],
-            'new': streak['current'],
-            'streak_broken': False,
-            'streak_extended': False,
-            'is_new_max': False,
+            'previous': previous,
+            'new': update['current'],
+            'streak_broken': update['lost'],
+            'streak_extended': update['increased'],
+            'is_new_max': update['current'] > longest,
+            'freeze_used': update['freeze_used'],
         }
 
-        if last_date == today:
+        if update['already_recorded']:
             # Ya practicó hoy
             return result
 
-        if last_date == yesterday:
-            # Continuó la racha
-            streak['current'] += 1
-            result['streak_extended'] = True
-        elif last_date is None:
-            # Primera vez
-            streak['current'] = 1
-            result['streak_extended'] = True
-        else:
-            # Perdió la racha
-            # Verificar si tiene freeze disponible
-            if streak.get('freezes', 0) > 0:
-                streak['freezes'] -= 1
-                streak['current'] += 1
-                result['streak_extended'] = True
-                result['freeze_used'] = True
-            else:
-                result['streak_broken'] = True
-                result['previous'] = streak['current']
-                streak['current'] = 1
-
-        streak['last_date'] = today
-
-        # Verificar nuevo máximo
-        if streak['current'] > streak.get('max', 0):
-            streak['max'] = streak['current']
-            result['is_new_max'] = True
-
-        result['new'] = streak['current']
-
-        self.state.data['streak'] = streak
-        self.state.save()
-
-        # Verificar badges de racha
+        # Verificar badges y logros de racha
         from .badges import check_badge_unlock
-        check_badge_unlock(self.state, 'streak', streak['current'])
+        from .achievement_engine import get_achievement_engine
+        check_badge_unlock(self.state, 'streak', update['current'])
+        get_achievement_engine().on_event('activity')
 
         return result
 
@@ -139,13 +85,11 @@ class StreakManager:
         Args:
             count: Número de freezes a añadir
         """
-        if 'streak' not in self.state.data:
-            self.state.data['streak'] = {'current': 0, 'max': 0, 'freezes': 0}
-
-        self.state.data['streak']['freezes'] = \
-            self.state.data['streak'].get('freezes', 0) + count
+        self.state.stage('streak')
+        streak = self.state.data.setdefault('streak', {'current': 0, 'longest': 0})
+        streak['freezes_available'] = streak.get('freezes_available', 0) + count
 
-        self.state.save()
+        self.state.save('streak')
 
     def use_freeze(self):
         """
@@ -154,12 +98,15 @@ class StreakManager:
         Returns:
             True si se usó, False si no hay disponibles
         """
-        freezes = self.state.data.get('streak', {}).get('freezes', 0)
+        streak = self.state.data.get('streak', {})
+        freezes = streak.get('freezes_available', 0)
         if freezes <= 0:
             return False
 
-        self.state.data['streak']['freezes'] = freezes - 1
-        self.state.save()
+        self.state.stage('streak')
+        streak['freezes_available'] = freezes - 1
+        streak['freezes_used'] = streak.get('freezes_used', 0) + 1
+        self.state.save('streak')
         return True
 
     def get_calendar(self, days=30):
@@ -172,42 +119,53 @@ class StreakManager:
         Returns:
             Lista de dicts con fecha y si hubo actividad
         """
-        history = self.state.data.get('activity_history', [])
-        history_set = set(history)
-
-        calendar = []
-        now = window.Date.new()
-
-        for i in range(days - 1, -1, -1):
-            date = window.Date.new(now.getTime() - (i * 24 * 60 * 60 * 1000))
-            date_str = f"{date.getFullYear()}-{str(date.getMonth() + 1).zfill(2)}-{str(date.getDate()).zfill(2)}"
+        today = date.today().toordinal()
+        calendar = self.state.get_activity_calendar()
+
+        return [
+            {
+                'date': date.fromordinal(day).isoformat(),
+                'day': date.fromordinal(day).day,
+                'active': status == 'active',
+                'frozen': status == 'frozen',
+                'is_today': day == today,
+            }
+            for day, status in calendar.days(days, today)
+        ]
 
-            calendar.append({
-                'date': date_str,
-                'day': date.getDate(),
-                'active': date_str in history_set,
-                'is_today': i == 0,
-            })
+    def get_heatmap(self, weeks=53):
+        """
+        Rejilla de actividad por semanas (lunes a domingo) para el heatmap.
+        El coste depende solo de `weeks`, no del largo del historial.
 
-        return calendar
+        Returns:
+            Lista de semanas; cada una, 7 dicts {date, status, is_today}
+            con status 'active', 'frozen', 'future' o None
+        """
+        today = date.today().toordinal()
+        grid = self.state.get_activity_calendar().weeks(weeks, today)
+        return [
+            [
+                {
+                    'date': date.fromordinal(day).isoformat(),
+                    'status': status,
+                    'is_today': day == today,
+                }
+                for day, status in week
+            ]
+            for week in grid
+        ]
+
+    def get_totals(self):
+        """Días activos totales y racha más larga (valores mantenidos, O(1))."""
+        return {
+            'active_days': self.state.get_activity_calendar().active_days(),
+            'longest': self.state.get('streak.longest', 0),
+        }
 
     def record_activity(self):
         """Registra actividad para el calendario."""
-        today = self._get_today_string()
-
-        if 'activity_history' not in self.state.data:
-            self.state.data['activity_history'] = []
-
-        if today not in self.state.data['activity_history']:
-            self.state.data['activity_history'].append(today)
-
-            # Mantener solo últimos 365 días
-            if len(self.state.data['activity_history']) > 365:
-                self.state.data['activity_history'] = \
-                    self.state.data['activity_history'][-365:]
-
-            self.state.save()
-
+        self.state.mark_active_day()
 
 def update_streak(state):
     """Helper para actualizar racha."""
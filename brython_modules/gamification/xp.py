@@ -2,6 +2,9 @@
 # Sistema de experiencia
 
 from ..components.toast import xp_toast
+from ..persistence import get_history_db
+from .leaderboard import get_windowed_leaderboard
+from .levels import LevelSystem
 
 
 class XPManager:
@@ -28,6 +31,10 @@ class XPManager:
         'badge_unlock': 25,
     }
 
+    # Eventos recientes que se conservan en localStorage; el historial
+    # completo vive en IndexedDB (persistence/history_db.py)
+    HOT_HISTORY = 50
+
     def __init__(self, state):
         """
         Args:
@@ -39,6 +46,11 @@ class XPManager:
         """
         Otorga XP al usuario.
 
+        Multiplicadores, subidas de nivel (aunque crucen varios niveles),
+        XP bonus por nivel y entrada del historial se calculan en memoria
+        y se confirman en una sola transacción: una escritura y una
+        notificación por llamada.
+
         Args:
             activity: Tipo de actividad
             base_amount: Cantidad base (o usa default)
@@ -46,7 +58,44 @@ class XPManager:
             reason: Razón para mostrar en toast
 
         Returns:
-            Dict con detalles del XP otorgado
+            Dict con detalles del XP otorgado (ver _plan) y el resultado
+            de nivel: total_xp, level_up, old_level, new_level,
+            levels_gained, level_title
+        """
+        details = self._plan(activity, base_amount, modifiers)
+        display_reason = reason or activity.replace('_', ' ').title()
+
+        with self.state.transaction():
+            result = self.state.add_xp(details['awarded'], reason or activity)
+            self._log_xp_event(activity, details['awarded'], dict(details))
+
+        details.update({
+            'total_xp': result['total_xp'],
+            'level_up': details['new_level'] > details['old_level'],
+            'levels_gained': details['new_level'] - details['old_level'],
+            'level_title': result['level_title'],
+        })
+
+        # Efectos de UI al confirmar (si award() corre dentro de otra
+        # transacción, al confirmar esa; en un rollback no se muestran)
+        self.state.after_commit(lambda: xp_toast(details['total'], display_reason))
+        if details['level_up']:
+            self.state.after_commit(lambda: self._on_level_up(
+                details['old_level'], details['new_level'], details['level_bonus']))
+
+        return details
+
+    def _plan(self, activity, base_amount=None, modifiers=None):
+        """
+        Calcula en memoria el XP de una actividad y las subidas de nivel
+        que provoca, sin modificar el estado.
+
+        Cada nivel alcanzado suma BASE_XP['level_up']; si el bonus cruza
+        otro umbral, ese nivel también cuenta (en la misma pasada).
+
+        Returns:
+            Dict {base, <modificador>, streak, total, multiplier,
+                  level_bonus, awarded, old_level, new_level}
         """
         # Determinar XP base
         if base_amount is None:
@@ -76,51 +125,51 @@ class XPManager:
         details['total'] = total
         details['multiplier'] = total_multiplier
 
-        # Añadir al estado
-        old_xp = self.state.data.get('xp', 0)
-        new_xp = old_xp + total
-        old_level = self.state.get_level_info()['level']
-
-        self.state.data['xp'] = new_xp
-        self.state.save()
-
-        # Verificar level up
-        new_level = self.state.get_level_info()['level']
-        if new_level > old_level:
-            self._on_level_up(old_level, new_level)
-
-        # Mostrar toast
-        display_reason = reason or activity.replace('_', ' ').title()
-        xp_toast(total, display_reason)
-
-        # Registrar en historial
-        self._log_xp_event(activity, total, details)
-
+        # Subidas de nivel en cascada
+        levels = LevelSystem()
+        current_xp = self.state.get('progress.xp', 0)
+        old_level = max(self.state.get('progress.level', 1), levels.get_level(current_xp))
+        reached = old_level
+        bonus = 0
+        level = levels.get_level(current_xp + total)
+        while level > reached:
+            bonus += self.BASE_XP['level_up'] * (level - reached)
+            reached = level
+            level = levels.get_level(current_xp + total + bonus)
+
+        details['level_bonus'] = bonus
+        details['awarded'] = total + bonus
+        details['old_level'] = old_level
+        details['new_level'] = reached
         return details
 
-    def _on_level_up(self, old_level, new_level):
-        """Callback cuando el usuario sube de nivel."""
+    def _on_level_up(self, old_level, new_level, bonus):
+        """Muestra la subida de nivel (el bonus ya está sumado)."""
         from ..components.modal import SuccessModal
         from .levels import get_level_title
 
         title = get_level_title(new_level)
+        if new_level - old_level > 1:
+            message = f'¡Felicidades! Subiste {new_level - old_level} niveles: ahora eres nivel {new_level}: {title}'
+        else:
+            message = f'¡Felicidades! Ahora eres nivel {new_level}: {title}'
 
         # Mostrar modal de nivel
         modal = SuccessModal(
             title='¡Subiste de Nivel!',
-            message=f'¡Felicidades! Ahora eres nivel {new_level}: {title}',
-            xp_gained=self.BASE_XP['level_up']
+            message=message,
+            xp_gained=bonus
         )
         modal.show()
 
-        # XP bonus por subir de nivel
-        self.state.data['xp'] = self.state.data.get('xp', 0) + self.BASE_XP['level_up']
-        self.state.save()
-
     def _log_xp_event(self, activity, amount, details):
-        """Registra evento de XP en el historial."""
+        """
+        Registra evento de XP en el historial (incluye el bonus de nivel).
+        IndexedDB y el ranking se actualizan al confirmar la transacción.
+        """
         from browser import window
 
+        self.state.stage('xp_history')
         if 'xp_history' not in self.state.data:
             self.state.data['xp_history'] = []
 
@@ -131,13 +180,17 @@ class XPManager:
             'timestamp': str(window.Date.new()),
         }
 
-        # Mantener solo los últimos 100 eventos
+        username = self.state.get('user.username', 'Anónimo')
+        self.state.after_commit(lambda: get_history_db().append('xp', event, activity))
+        self.state.after_commit(lambda: get_windowed_leaderboard().add_xp(username, amount))
+
+        # localStorage: solo los eventos recientes
         history = self.state.data['xp_history']
         history.append(event)
-        if len(history) > 100:
-            self.state.data['xp_history'] = history[-100:]
+        if len(history) > self.HOT_HISTORY:
+            self.state.data['xp_history'] = history[-self.HOT_HISTORY:]
 
-        self.state.save()
+        self.state.save('xp_history')
 
     def get_history(self, limit=20):
         """Obtiene historial de XP."""
@@ -145,33 +198,14 @@ class XPManager:
         return list(reversed(history[-limit:]))
 
     def get_stats(self):
-        """Obtiene estadísticas de XP."""
-        history = self.state.data.get('xp_history', [])
-
-        total = self.state.data.get('xp', 0)
-        today = 0
-        this_week = 0
-
-        from browser import window
-        now = window.Date.new()
-        today_start = window.Date.new(now.getFullYear(), now.getMonth(), now.getDate())
-        week_start = window.Date.new(today_start.getTime() - (6 * 24 * 60 * 60 * 1000))
-
-        for event in history:
-            try:
-                event_date = window.Date.new(event['timestamp'])
-                if event_date >= today_start:
-                    today += event['amount']
-                if event_date >= week_start:
-                    this_week += event['amount']
-            except:
-                pass
-
+        """Obtiene estadísticas de XP (totales por día, ver daily_ring.py)."""
+        totals = self.state.get_xp_totals()
         return {
-            'total': total,
-            'today': today,
-            'this_week': this_week,
-            'average_daily': this_week // 7 if this_week > 0 else 0,
+            'total': self.state.get('progress.xp', 0),
+            'today': totals['today'],
+            'this_week': totals['this_week'],
+            'this_month': totals['this_month'],
+            'average_daily': totals['average_daily'],
         }
 
 
@@ -6,6 +6,7 @@ from ..state import get_state
 from ..gamification.xp import XPManager
 from ..gamification.badges import BadgeManager
 from ..gamification.achievements import check_achievements
+from ..selectors import selector
 
 
 class LessonProgress:
@@ -30,8 +31,8 @@ class LessonProgress:
         Returns:
             dict con estado de la lección
         """
-        completed = self.state.data.get('completed_lessons', [])
-        in_progress = self.state.data.get('lessons_in_progress', {})
+        completed = self.state.get('progress.lessons_completed', [])
+        in_progress = self.state.get('progress.lessons_in_progress', {})
 
         if lesson_id in completed:
             return {
@@ -68,10 +69,10 @@ class LessonProgress:
         Returns:
             dict con estado actualizado
         """
-        if lesson_id in self.state.data.get('completed_lessons', []):
+        if lesson_id in self.state.get('progress.lessons_completed', []):
             return self.get_lesson_status(lesson_id)
 
-        in_progress = self.state.data.get('lessons_in_progress', {})
+        in_progress = self.state.get('progress.lessons_in_progress', {})
 
         if lesson_id not in in_progress:
             from datetime import datetime
@@ -80,8 +81,7 @@ class LessonProgress:
                 'current_section': 0,
                 'progress': 0
             }
-            self.state.data['lessons_in_progress'] = in_progress
-            self.state.save()
+            self.state.set('progress.lessons_in_progress', in_progress)
 
         return self.get_lesson_status(lesson_id)
 
@@ -97,14 +97,14 @@ class LessonProgress:
         Returns:
             dict con progreso actualizado
         """
-        if lesson_id in self.state.data.get('completed_lessons', []):
+        if lesson_id in self.state.get('progress.lessons_completed', []):
             return self.get_lesson_status(lesson_id)
 
-        in_progress = self.state.data.get('lessons_in_progress', {})
+        in_progress = self.state.get('progress.lessons_in_progress', {})
 
         if lesson_id not in in_progress:
             self.start_lesson(lesson_id)
-            in_progress = self.state.data.get('lessons_in_progress', {})
+            in_progress = self.state.get('progress.lessons_in_progress', {})
 
         progress = int((section_index + 1) / total_sections * 100)
 
@@ -114,8 +114,7 @@ class LessonProgress:
             'progress': progress
         }
 
-        self.state.data['lessons_in_progress'] = in_progress
-        self.state.save()
+        self.state.set('progress.lessons_in_progress', in_progress)
 
         return self.get_lesson_status(lesson_id)
 
@@ -130,43 +129,31 @@ class LessonProgress:
         Returns:
             dict con resultados de la compleción
         """
-        completed = self.state.data.get('completed_lessons', [])
+        completed = self.state.get('progress.lessons_completed', [])
 
         # Verificar si ya estaba completada
         already_completed = lesson_id in completed
 
         if not already_completed:
-            # Marcar como completada
-            completed.append(lesson_id)
-            self.state.data['completed_lessons'] = completed
-
-            # Remover de en progreso
-            in_progress = self.state.data.get('lessons_in_progress', {})
-            if lesson_id in in_progress:
-                del in_progress[lesson_id]
-                self.state.data['lessons_in_progress'] = in_progress
-
-            # Otorgar XP
-            xp_mgr = XPManager(self.state)
-            xp_reward = lesson_data.get('xp_reward', 50)
-            xp_result = xp_mgr.add_xp(xp_reward, 'lesson_complete')
-
-            # Verificar badges
-            badge_mgr = BadgeManager(self.state)
-            new_badges = badge_mgr.check_and_award('lesson_complete', {
-                'lesson_id': lesson_id,
-                'category': lesson_data.get('category'),
-                'difficulty': lesson_data.get('difficulty'),
-                'total_completed': len(completed)
-            })
-
-            # Verificar achievements
-            check_achievements(self.state, 'lesson_complete', {
-                'lesson_id': lesson_id,
-                'lesson_data': lesson_data
-            })
-
-            self.state.save()
+            with self.state.transaction():
+                # Marcar como completada (y remover de en progreso)
+                self.state.mark_lesson_completed(lesson_id)
+                completed = self.state.get('progress.lessons_completed', [])
+
+                # Otorgar XP
+                xp_mgr = XPManager(self.state)
+                xp_reward = lesson_data.get('xp_reward', 50)
+                xp_result = xp_mgr.award('lesson_complete', xp_reward)
+
+                # Verificar badges
+                badge_mgr = BadgeManager(self.state)
+                new_badges = badge_mgr.check_and_unlock('lesson_complete', lesson_id)
+
+                # Verificar achievements
+                check_achievements(self.state, 'lesson_complete', {
+                    'lesson_id': lesson_id,
+                    'lesson_data': lesson_data
+                })
 
             return {
                 'success': True,
@@ -196,19 +183,20 @@ class LessonProgress:
         Returns:
             dict con resultado
         """
-        exercises = self.state.data.get('completed_exercises', {})
+        exercises = self.state.get('progress.lesson_exercises', {})
 
         if lesson_id not in exercises:
             exercises[lesson_id] = {
                 'completed': True,
                 'answer': answer[:500]  # Limitar longitud
             }
-            self.state.data['completed_exercises'] = exercises
-            self.state.save()
 
-            # XP por ejercicio
-            xp_mgr = XPManager(self.state)
-            xp_mgr.add_xp(15, 'exercise_complete')
+            with self.state.transaction():
+                self.state.set('progress.lesson_exercises', exercises)
+
+                # XP por ejercicio
+                xp_mgr = XPManager(self.state)
+                xp_mgr.award('exercise_complete', 15)
 
             return {
                 'success': True,
@@ -229,7 +217,7 @@ class LessonProgress:
         Returns:
             int con cantidad
         """
-        return len(self.state.data.get('completed_lessons', []))
+        return len(self.state.get('progress.lessons_completed', []))
 
     def get_completed_lessons(self):
         """
@@ -238,7 +226,7 @@ class LessonProgress:
         Returns:
             list de IDs
         """
-        return self.state.data.get('completed_lessons', [])
+        return self.state.get('progress.lessons_completed', [])
 
     def get_in_progress_lessons(self):
         """
@@ -247,7 +235,7 @@ class LessonProgress:
         Returns:
             dict con lecciones en progreso
         """
-        return self.state.data.get('lessons_in_progress', {})
+        return self.state.get('progress.lessons_in_progress', {})
 
     def get_category_progress(self, category_id, total_in_category):
         """
@@ -263,7 +251,7 @@ class LessonProgress:
         from .loader import get_lessons_by_category
 
         lessons = get_lessons_by_category(category_id)
-        completed = self.state.data.get('completed_lessons', [])
+        completed = self.state.get('progress.lessons_completed', [])
 
         completed_in_category = sum(
             1 for lesson in lessons
@@ -286,7 +274,7 @@ class LessonProgress:
         Returns:
             dict con progreso
         """
-        completed = len(self.state.data.get('completed_lessons', []))
+        completed = len(self.state.get('progress.lessons_completed', []))
 
         return {
             'completed': completed,
@@ -318,26 +306,29 @@ class LessonProgress:
         Args:
             lesson_id: ID de la lección
         """
-        # Remover de completadas
-        completed = self.state.data.get('completed_lessons', [])
-        if lesson_id in completed:
-            completed.remove(lesson_id)
-            self.state.data['completed_lessons'] = completed
+        with self.state.transaction():
+            self.state.stage('progress.lessons_completed', 'progress.lessons_in_progress',
+                             'progress.lesson_exercises')
 
-        # Remover de en progreso
-        in_progress = self.state.data.get('lessons_in_progress', {})
-        if lesson_id in in_progress:
-            del in_progress[lesson_id]
-            self.state.data['lessons_in_progress'] = in_progress
+            # Remover de completadas
+            completed = self.state.get('progress.lessons_completed', [])
+            if lesson_id in completed:
+                completed.remove(lesson_id)
+                self.state.set('progress.lessons_completed', completed)
 
-        # Remover ejercicio
-        exercises = self.state.data.get('completed_exercises', {})
-        if lesson_id in exercises:
-            del exercises[lesson_id]
-            self.state.data['completed_exercises'] = exercises
+            # Remover de en progreso
+            in_progress = self.state.get('progress.lessons_in_progress', {})
+            if lesson_id in in_progress:
+                del in_progress[lesson_id]
+                self.state.set('progress.lessons_in_progress', in_progress)
 
-        self.state.save()
+            # Remover ejercicio
+            exercises = self.state.get('progress.lesson_exercises', {})
+            if lesson_id in exercises:
+                del exercises[lesson_id]
+                self.state.set('progress.lesson_exercises', exercises)
 
+    @selector('progress')
     def get_stats(self):
         """
         Obtiene estadísticas generales de lecciones.
@@ -348,8 +339,8 @@ class LessonProgress:
         from .loader import get_all_lessons, get_categories
 
         all_lessons = get_all_lessons()
-        completed = self.state.data.get('completed_lessons', [])
-        in_progress = self.state.data.get('lessons_in_progress', {})
+        completed = self.state.get('progress.lessons_completed', [])
+        in_progress = self.state.get('progress.lessons_in_progress', {})
 
         # Por dificultad
         by_difficulty = {'beginner': 0, 'intermediate': 0, 'advanced': 0}
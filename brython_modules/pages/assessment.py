@@ -364,7 +364,7 @@ def _select_answer(question_id, option_idx):
 
     assessment_data['answers'] = answers
     state.data['assessment'] = assessment_data
-    state.save()
+    state.save('assessment')
 
     # Re-render
     from ..router import get_router
@@ -378,7 +378,7 @@ def _go_to_question(idx):
     assessment_data = state.data.get('assessment', {})
     assessment_data['current_question'] = idx
     state.data['assessment'] = assessment_data
-    state.save()
+    state.save('assessment')
 
     from ..router import get_router
     router = get_router()
@@ -425,7 +425,7 @@ def _finish_assessment():
     assessment_data['completed_at'] = str(window.Date.new().toISOString())
 
     state.data['assessment'] = assessment_data
-    state.save()
+    state.save('assessment')
 
     # Dar XP por completar
     from ..gamification.xp import award_xp
@@ -591,7 +591,7 @@ def _reset_assessment(ev):
     """Reinicia la evaluación."""
     state = get_state()
     state.data['assessment'] = {}
-    state.save()
+    state.save('assessment')
 
     from ..router import get_router
     router = get_router()
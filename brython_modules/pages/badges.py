@@ -5,6 +5,7 @@ from browser import document, html
 from ..state import get_state
 from ..components.badge_display import BadgeDisplay, BadgeGrid, BadgeProgress
 from ..components.tabs import Tabs
+from ..components.memo import memo_render
 from ..gamification.badges import BadgeManager, BADGES
 
 
@@ -117,17 +118,8 @@ def _render_badges_tabs(badge_mgr, state):
 
 def _render_badges_grid(badge_mgr, state, category):
     """Renderiza grid de badges de una categoría."""
-    if category == 'all':
-        badges = badge_mgr.get_all()
-    else:
-        badges = badge_mgr.get_by_category(category)
-
-    # Ordenar: desbloqueados primero, luego por rareza
-    rarity_order = {'legendary': 0, 'epic': 1, 'rare': 2, 'common': 3}
-    badges.sort(key=lambda b: (
-        not b.get('unlocked', False),
-        rarity_order.get(b.get('rarity', 'common'), 3)
-    ))
+    # El catálogo ya viene ordenado por rareza
+    badges = badge_mgr.get_catalog(category)
 
     container = html.DIV()
 
@@ -163,15 +155,21 @@ def _render_badge_section(badges, show_progress=False, state=None):
     """Renderiza una sección de badges."""
     grid = html.DIV(Class="grid grid-cols-3 md:grid-cols-5 lg:grid-cols-6 gap-4 mb-6")
 
+    # Progreso de todos los badges, calculado una vez
+    snapshot = BadgeManager(state).progress_snapshot() if show_progress and state else {}
+
     for badge in badges:
-        badge_elem = _render_badge_item(badge, show_progress, state)
-        grid <= badge_elem
+        progress = None
+        if not badge.get('unlocked', False):
+            progress = snapshot.get(badge.get('id'))
+        grid <= _render_badge_item(badge, progress)
 
     return grid
 
 
-def _render_badge_item(badge, show_progress=False, state=None):
-    """Renderiza un item de badge."""
+@memo_render(maxsize=64)
+def _render_badge_item(badge, progress=None):
+    """Renderiza un item de badge (cacheado por badge y progreso)."""
     is_unlocked = badge.get('unlocked', False)
     rarity = badge.get('rarity', 'common')
 
@@ -210,23 +208,18 @@ def _render_badge_item(badge, show_progress=False, state=None):
     )
 
     # Progreso si no está desbloqueado
-    if show_progress and not is_unlocked and state:
-        from ..gamification.badges import BadgeManager
-        badge_mgr = BadgeManager(state)
-        progress = badge_mgr.get_progress(badge.get('id'))
-
-        if progress and isinstance(progress.get('target'), (int, float)):
-            pct = progress.get('percentage', 0)
-            container <= html.DIV(
-                html.DIV(
-                    Class="h-full bg-indigo-500 rounded-full",
-                    style=f"width: {pct}%"
-                ),
-                Class="w-full h-1.5 bg-gray-200 rounded-full overflow-hidden mt-2"
-            )
-            container <= html.P(
-                f"{progress['current']}/{progress['target']}",
-                Class="text-xs text-gray-500 text-center mt-1"
-            )
+    if progress and not is_unlocked and isinstance(progress.get('target'), (int, float)):
+        pct = progress.get('percentage', 0)
+        container <= html.DIV(
+            html.DIV(
+                Class="h-full bg-indigo-500 rounded-full",
+                style=f"width: {pct}%"
+            ),
+            Class="w-full h-1.5 bg-gray-200 rounded-full overflow-hidden mt-2"
+        )
+        container <= html.P(
+            f"{progress['current']}/{progress['target']}",
+            Class="text-xs text-gray-500 text-center mt-1"
+        )
 
     return container
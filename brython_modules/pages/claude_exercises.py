@@ -343,7 +343,7 @@ def _handle_answer(option_idx, option_data, exercise):
             completed.append(exercise['id'])
             exercise_data['completed'] = completed
             state.data['claude_exercises'] = exercise_data
-            state.save()
+            state.save('claude_exercises')
 
             # Dar XP
             from ..gamification.xp import award_xp
@@ -234,8 +234,8 @@ def final_project_page(params):
 
 def _calculate_course_progress(state):
     """Calcula el progreso total del curso."""
-    lessons_completed = len(state.data.get('progress', {}).get('lessons_completed', []))
-    puzzles_solved = state.data.get('progress', {}).get('puzzles_solved', 0)
+    lessons_completed = len(state.get('progress.lessons_completed', []))
+    puzzles_solved = len(state.get('progress.puzzles_solved', {}))
     practice_done = len(state.data.get('practice', {}).get('completed_exercises', []))
     claude_exercises = len(state.data.get('claude_exercises', {}).get('completed', []))
 
@@ -275,7 +275,7 @@ def _save_project_draft():
     }
 
     state.data['final_project'] = project_data
-    state.save()
+    state.save('final_project')
 
     feedback = document.getElementById("project-feedback")
     feedback.innerHTML = ""
@@ -351,7 +351,7 @@ def _submit_project():
         }
 
         state.data['final_project'] = project_data
-        state.save()
+        state.save('final_project')
 
         # Dar XP y badge
         from ..gamification.xp import award_xp
@@ -362,7 +362,7 @@ def _submit_project():
         if 'graduate' not in badges_earned:
             badges_earned.append('graduate')
             state.data['badges'] = badges_earned
-            state.save()
+            state.save('badges')
 
         # Mostrar mensaje de éxito
         success = html.DIV(Class="bg-gradient-to-r from-indigo-600 to-purple-600 rounded-xl p-8 text-white text-center")
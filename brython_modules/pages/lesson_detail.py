@@ -30,7 +30,7 @@ def lesson_detail_page(params):
         return _render_not_found(lesson_id)
 
     state = get_state()
-    is_completed = lesson_id in state.data.get('lessons_completed', [])
+    is_completed = lesson_id in state.get('progress.lessons_completed', [])
 
     container = html.DIV(Class="max-w-4xl mx-auto")
 
@@ -284,18 +284,15 @@ def _render_complete_button(lesson_id, state):
 
     def on_complete(e):
         # Marcar como completada
-        if 'lessons_completed' not in state.data:
-            state.data['lessons_completed'] = []
+        if lesson_id not in state.get('progress.lessons_completed', []):
+            with state.transaction():
+                state.mark_lesson_completed(lesson_id)
 
-        if lesson_id not in state.data['lessons_completed']:
-            state.data['lessons_completed'].append(lesson_id)
-            state.save()
+                # Otorgar XP
+                award_xp(state, 'lesson_complete', reason=f"Lección completada")
 
-            # Otorgar XP
-            award_xp(state, 'lesson_complete', reason=f"Lección completada")
-
-            # Verificar achievements
-            check_achievements(state, 'lesson_complete', {'lesson_id': lesson_id})
+                # Verificar achievements
+                check_achievements(state, 'lesson_complete', {'lesson_id': lesson_id})
 
             # Mostrar modal de éxito
             modal = SuccessModal(
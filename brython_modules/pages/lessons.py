@@ -4,6 +4,8 @@
 from browser import document, html
 from ..state import get_state
 from ..router import navigate
+from ..components.memo import memo_render
+from ..components.tabs import Tabs
 
 
 def lessons_page(params):
@@ -77,57 +79,53 @@ def _render_stats(state):
 
 
 def _render_lessons_tabs(state):
-    """Renderiza lista de lecciones (versión simplificada)."""
-    # Simplificado - mostrar todas las lecciones directamente
-    return _render_lesson_list(state, 'all')
+    """Renderiza tabs de lecciones por categoría (paneles perezosos)."""
+    categories = [
+        {'id': 'all', 'label': 'Todas', 'icon': '📋'},
+        {'id': 'fundamentos', 'label': 'Fundamentos', 'icon': '📚'},
+        {'id': 'tecnicas', 'label': 'Técnicas', 'icon': '🎯'},
+        {'id': 'avanzado', 'label': 'Avanzado', 'icon': '🚀'},
+        {'id': 'casos', 'label': 'Casos', 'icon': '💼'},
+    ]
+
+    tabs_data = []
+    for cat in categories:
+        tabs_data.append({
+            'id': cat['id'],
+            'label': cat['label'],
+            'icon': cat['icon'],
+            'content': lambda c=cat['id']: _render_lesson_list(state, c)
+        })
+
+    tabs = Tabs(
+        tabs=tabs_data,
+        active_tab='all',
+        variant='pills'
+    )
+
+    return tabs.render()
 
 
 def _render_lesson_list(state, category):
     """Renderiza lista de lecciones de una categoría."""
-    lessons = _get_lessons(category)
     completed = set(state.data.get('progress', {}).get('lessons_completed', []))
 
-    grid = html.DIV(Class="grid grid-cols-1 md:grid-cols-2 gap-4")
+    # El bloqueo sigue el orden global, no el de la categoría
+    locked_ids = set()
+    all_lessons = _get_lessons('all')
+    for i, lesson in enumerate(all_lessons):
+        if i > 0 and all_lessons[i - 1]['id'] not in completed:
+            locked_ids.add(lesson['id'])
+
+    lessons = _get_lessons(category)
 
-    for i, lesson in enumerate(lessons):
-        # Determinar si está bloqueada
-        locked = False
-        if i > 0:
-            prev_lesson = lessons[i - 1]
-            if prev_lesson['id'] not in completed:
-                locked = True
+    grid = html.DIV(Class="grid grid-cols-1 md:grid-cols-2 gap-4")
 
+    for lesson in lessons:
+        locked = lesson['id'] in locked_ids
         is_completed = lesson['id'] in completed
 
-        # Card simplificada sin usar LessonCard
-        base_classes = "bg-white rounded-xl border border-gray-100 overflow-hidden transition-all p-5"
-        if locked:
-            state_classes = "opacity-60"
-        elif is_completed:
-            state_classes = "border-green-200 bg-green-50/30"
-        else:
-            state_classes = "hover:shadow-md hover:border-indigo-200 cursor-pointer"
-
-        card = html.DIV(Class=f"{base_classes} {state_classes}")
-
-        # Header
-        header = html.DIV(Class="flex items-center justify-between mb-2")
-        header <= html.SPAN(lesson.get('category', '').capitalize(), Class="text-sm text-gray-500")
-        if is_completed:
-            header <= html.SPAN("✓ Completada", Class="text-sm text-green-600")
-        elif locked:
-            header <= html.SPAN("🔒 Bloqueada", Class="text-sm text-gray-400")
-        card <= header
-
-        # Title & description
-        card <= html.H3(lesson.get('title', ''), Class="text-lg font-semibold text-gray-800")
-        card <= html.P(lesson.get('description', '')[:100], Class="text-gray-600 mt-2 text-sm")
-
-        # Footer
-        footer = html.DIV(Class="flex items-center gap-4 mt-4")
-        footer <= html.SPAN(lesson.get('difficulty', 'beginner').capitalize(), Class="text-xs px-2 py-1 rounded-full bg-gray-100 text-gray-600")
-        footer <= html.SPAN(f"⏱️ {lesson.get('duration', '10 min')}", Class="text-xs text-gray-500")
-        card <= footer
+        card = _render_lesson_card(lesson, locked, is_completed)
 
         # Click handler
         if not locked:
@@ -146,6 +144,42 @@ def _render_lesson_list(state, category):
     return grid
 
 
+@memo_render(maxsize=64)
+def _render_lesson_card(lesson, locked, is_completed):
+    """Renderiza la tarjeta de una lección (cacheada por sus datos)."""
+    # Card simplificada sin usar LessonCard
+    base_classes = "bg-white rounded-xl border border-gray-100 overflow-hidden transition-all p-5"
+    if locked:
+        state_classes = "opacity-60"
+    elif is_completed:
+        state_classes = "border-green-200 bg-green-50/30"
+    else:
+        state_classes = "hover:shadow-md hover:border-indigo-200 cursor-pointer"
+
+    card = html.DIV(Class=f"{base_classes} {state_classes}")
+
+    # Header
+    header = html.DIV(Class="flex items-center justify-between mb-2")
+    header <= html.SPAN(lesson.get('category', '').capitalize(), Class="text-sm text-gray-500")
+    if is_completed:
+        header <= html.SPAN("✓ Completada", Class="text-sm text-green-600")
+    elif locked:
+        header <= html.SPAN("🔒 Bloqueada", Class="text-sm text-gray-400")
+    card <= header
+
+    # Title & description
+    card <= html.H3(lesson.get('title', ''), Class="text-lg font-semibold text-gray-800")
+    card <= html.P(lesson.get('description', '')[:100], Class="text-gray-600 mt-2 text-sm")
+
+    # Footer
+    footer = html.DIV(Class="flex items-center gap-4 mt-4")
+    footer <= html.SPAN(lesson.get('difficulty', 'beginner').capitalize(), Class="text-xs px-2 py-1 rounded-full bg-gray-100 text-gray-600")
+    footer <= html.SPAN(f"⏱️ {lesson.get('duration', '10 min')}", Class="text-xs text-gray-500")
+    card <= footer
+
+    return card
+
+
 def _get_lessons(category='all'):
     """
     Obtiene lecciones (placeholder - en producción vendría de JSON).
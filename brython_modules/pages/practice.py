@@ -586,7 +586,7 @@ def _show_feedback(container, exercise, results, error_msg, user_prompt):
             completed.append(exercise['id'])
             practice_data['completed_exercises'] = completed
             state.data['practice'] = practice_data
-            state.save()
+            state.save('practice')
 
             # Dar XP
             from ..gamification.xp import award_xp
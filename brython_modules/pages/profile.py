@@ -72,7 +72,7 @@ def _render_profile_header(state):
 
     # Info
     info = html.DIV()
-    username = state.data.get('username', 'Prompter')
+    username = state.get('user.username', 'Prompter')
     info <= html.H1(username, Class="text-3xl font-bold")
     info <= html.P(
         f"Nivel {level_info['level']} - {level_info['title']}",
@@ -82,7 +82,7 @@ def _render_profile_header(state):
     # Stats rápidos
     quick_stats = html.DIV(Class="flex gap-6 mt-4")
     quick_stats <= html.DIV(
-        html.SPAN(f"{state.data.get('xp', 0)}", Class="font-bold text-xl") +
+        html.SPAN(f"{state.get('progress.xp', 0)}", Class="font-bold text-xl") +
         html.SPAN(" XP", Class="text-indigo-200")
     )
     quick_stats <= html.DIV(
@@ -180,17 +180,27 @@ def _render_level_section(state):
     return section
 
 
+# Colores del heatmap por estado del día
+HEATMAP_COLORS = {
+    'active': 'bg-green-500',
+    'frozen': 'bg-blue-300',
+    'future': 'bg-transparent',
+    None: 'bg-gray-200',
+}
+
+
 def _render_activity_calendar(state):
-    """Renderiza calendario de actividad."""
+    """Renderiza el heatmap de actividad del último año."""
     streak_mgr = StreakManager(state)
-    calendar = streak_mgr.get_calendar(30)
+    heatmap = streak_mgr.get_heatmap(53)
     streak_info = streak_mgr.get_info()
+    totals = streak_mgr.get_totals()
 
     section = html.DIV(Class="bg-white rounded-xl p-6 border border-gray-100 mb-8")
 
     # Header
     header = html.DIV(Class="flex items-center justify-between mb-4")
-    header <= html.H2("📅 Actividad (últimos 30 días)", Class="text-xl font-semibold text-gray-800")
+    header <= html.H2("📅 Actividad (último año)", Class="text-xl font-semibold text-gray-800")
     header <= html.DIV(
         html.SPAN("🔥 ", Class="text-lg") +
         html.SPAN(f"{streak_info['current']} días", Class="font-bold text-orange-500") +
@@ -199,23 +209,20 @@ def _render_activity_calendar(state):
     )
     section <= header
 
-    # Calendario
-    cal_grid = html.DIV(Class="grid grid-cols-10 md:grid-cols-15 gap-1")
-
-    for day in calendar:
-        if day['active']:
-            day_class = "bg-green-500"
-        else:
-            day_class = "bg-gray-200"
-
-        if day['is_today']:
-            day_class += " ring-2 ring-indigo-400"
-
-        day_elem = html.DIV(
-            Class=f"w-6 h-6 rounded {day_class}",
-            title=day['date']
-        )
-        cal_grid <= day_elem
+    # Heatmap: una columna por semana, una fila por día
+    cal_grid = html.DIV(Class="flex gap-0.5 overflow-x-auto pb-1")
+
+    for week in heatmap:
+        column = html.DIV(Class="flex flex-col gap-0.5")
+        for day in week:
+            day_class = HEATMAP_COLORS[day['status']]
+            if day['is_today']:
+                day_class += " ring-2 ring-indigo-400"
+            column <= html.DIV(
+                Class=f"w-3 h-3 rounded-sm {day_class}",
+                title=day['date']
+            )
+        cal_grid <= column
 
     section <= cal_grid
 
@@ -229,6 +236,14 @@ def _render_activity_calendar(state):
         html.DIV(Class="w-4 h-4 rounded bg-green-500 inline-block mr-1") +
         html.SPAN("Día activo")
     )
+    legend <= html.DIV(
+        html.DIV(Class="w-4 h-4 rounded bg-blue-300 inline-block mr-1") +
+        html.SPAN("Freeze")
+    )
+    legend <= html.SPAN(
+        f"{totals['active_days']} días activos · racha máxima {totals['longest']}",
+        Class="ml-auto"
+    )
     section <= legend
 
     # Freezes disponibles
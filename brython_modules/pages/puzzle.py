@@ -42,7 +42,7 @@ def puzzle_page(params):
         return container
 
     # Verificar si ya está completado
-    completed = state.data.get('puzzles_completed', {}).get(puzzle_id, {})
+    completed = state.get('progress.puzzles_solved', {}).get(puzzle_id, {})
     if completed.get('solved'):
         container <= _render_completed_banner(completed)
 
@@ -50,11 +50,12 @@ def puzzle_page(params):
     puzzle_component = LogicPuzzle(
         puzzle_data=puzzle_data,
         on_complete=lambda result: _on_puzzle_complete(puzzle_id, result, state),
+        on_hint=lambda hint_num: state.record_event('hint_used', puzzle_id=puzzle_id, hint=hint_num),
         on_exit=lambda: navigate('puzzles')
     )
 
-    container <= puzzle_component.render()
-    puzzle_component.on_mount()
+    # Montar (no solo render) para que el router lo desmonte al salir
+    puzzle_component.mount(container)
 
     return container
 
@@ -114,46 +115,34 @@ def _render_completed_banner(completed):
 
 def _on_puzzle_complete(puzzle_id, result, state):
     """Callback cuando se completa un puzzle."""
-    # Guardar resultado
-    if 'puzzles_completed' not in state.data:
-        state.data['puzzles_completed'] = {}
-
-    existing = state.data['puzzles_completed'].get(puzzle_id, {})
-
-    # Actualizar mejor resultado
-    if not existing.get('best_time') or result['time'] < existing.get('best_time', 999999):
-        existing['best_time'] = result['time']
-
-    if result['stars'] > existing.get('best_stars', 0):
-        existing['best_stars'] = result['stars']
-
-    existing['solved'] = True
-    existing['attempts'] = existing.get('attempts', 0) + 1
-
-    state.data['puzzles_completed'][puzzle_id] = existing
-    state.save()
-
-    # Otorgar XP
-    modifiers = {}
-    if result['hints_used'] == 0:
-        modifiers['no_hints_bonus'] = True
-    if result['stars'] == 3:
-        modifiers['perfect_bonus'] = True
-    if result['time'] < 120:
-        modifiers['speed_bonus'] = True
-
-    award_xp(state, 'puzzle_solve', result.get('xp', 75), modifiers, "Puzzle completado")
-
-    # Verificar achievements
-    check_achievements(state, 'puzzle_complete', {
-        'puzzle_id': puzzle_id,
-        'time': result['time'],
-        'stars': result['stars'],
-        'hints_used': result['hints_used']
-    })
-
-    # Actualizar streak
-    from ..gamification.streaks import StreakManager
-    streak_mgr = StreakManager(state)
-    streak_mgr.update()
-    streak_mgr.record_activity()
+    # Una sola notificación y una sola escritura para todo el flujo
+    with state.transaction():
+        # Guardar resultado (conserva la mejor marca)
+        state.record_puzzle_result(
+            puzzle_id, result['stars'], result['time'], result['hints_used']
+        )
+
+        # Otorgar XP
+        modifiers = {}
+        if result['hints_used'] == 0:
+            modifiers['no_hints_bonus'] = True
+        if result['stars'] == 3:
+            modifiers['perfect_bonus'] = True
+        if result['time'] < 120:
+            modifiers['speed_bonus'] = True
+
+        award_xp(state, 'puzzle_solve', result.get('xp', 75), modifiers, "Puzzle completado")
+
+        # Verificar achievements
+        check_achievements(state, 'puzzle_complete', {
+            'puzzle_id': puzzle_id,
+            'time': result['time'],
+            'stars': result['stars'],
+            'hints_used': result['hints_used']
+        })
+
+        # Actualizar streak
+        from ..gamification.streaks import StreakManager
+        streak_mgr = StreakManager(state)
+        streak_mgr.update()
+        streak_mgr.record_activity()
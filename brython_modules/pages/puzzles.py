@@ -48,7 +48,7 @@ def puzzles_page(params):
 
 def _render_stats(state):
     """Renderiza estadísticas de puzzles."""
-    puzzles_completed = state.data.get('puzzles_completed', {})
+    puzzles_completed = state.get('progress.puzzles_solved', {})
     total_puzzles = 15
     solved = len(puzzles_completed)
     three_stars = len([p for p in puzzles_completed.values() if p.get('best_stars', 0) == 3])
@@ -161,7 +161,7 @@ def _render_puzzles_tabs(state):
 def _render_puzzle_list(state, category):
     """Renderiza lista de puzzles."""
     puzzles = _get_puzzles(category)
-    completed = state.data.get('puzzles_completed', {})
+    completed = state.get('progress.puzzles_solved', {})
 
     grid = html.DIV(Class="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-4")
 
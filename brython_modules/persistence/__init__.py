@@ -0,0 +1,25 @@
+# PromptCraft - Persistence
+# Capa de persistencia del estado en localStorage
+
+from .write_behind import WriteBehindWriter
+from .slices import SliceStore, DEFAULT_SLICES
+from .migrations import migrate, SCHEMA_VERSION
+from .codec import get_codec, compare_codecs
+from .history_db import HistoryStore, get_history_db
+from .merge import merge_value, MERGE_RULES
+from .tab_sync import TabSync
+
+__all__ = [
+    'WriteBehindWriter',
+    'SliceStore',
+    'DEFAULT_SLICES',
+    'migrate',
+    'SCHEMA_VERSION',
+    'get_codec',
+    'compare_codecs',
+    'HistoryStore',
+    'get_history_db',
+    'merge_value',
+    'MERGE_RULES',
+    'TabSync',
+]
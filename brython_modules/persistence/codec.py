@@ -0,0 +1,243 @@
+# PromptCraft - State Codecs
+# Codificación compacta de los slices guardados en localStorage
+
+import json
+from datetime import date, datetime, timedelta
+from browser import window
+
+
+# Cada valor guardado empieza con la etiqueta de su codec. JSON plano
+# (formato anterior) no tiene etiqueta: nunca empieza con '~'.
+JSON_TAG = ''
+COMPACT_TAG = '~1'
+LZ_TAG = '~2'
+
+_EPOCH = date(2020, 1, 1)
+_EPOCH_ORDINAL = _EPOCH.toordinal()
+_EPOCH_DATETIME = datetime(2020, 1, 1)
+
+
+class JSONCodec:
+    """JSON sin espacios (formato legible, sin etiqueta)."""
+
+    tag = JSON_TAG
+    name = 'json'
+
+    def encode(self, value):
+        return json.dumps(value, separators=(',', ':'))
+
+    def decode(self, raw):
+        return json.loads(raw)
+
+
+class CompactCodec:
+    """
+    JSON compacto con diccionario de claves y fechas como desplazamientos.
+
+    - Las claves de los dicts se sustituyen por su índice (base 36) en
+      una tabla que se guarda una sola vez por valor.
+    - 'YYYY-MM-DD' se guarda como '~d' + días desde 2020-01-01.
+    - 'YYYY-MM-DDTHH:MM:SS[.ffffff]' como '~t' + segundos (+ fracción).
+    - Los strings que ya empiezan con '~' se escapan con otro '~'.
+
+    Formato: '~1' + JSON de [tabla_de_claves, valor].
+    """
+
+    tag = COMPACT_TAG
+    name = 'compact'
+
+    def encode(self, value):
+        keys = {}
+        payload = self._pack(value, keys)
+        table = sorted(keys, key=keys.get)
+        return self.tag + json.dumps([table, payload], separators=(',', ':'))
+
+    def decode(self, raw):
+        table, payload = json.loads(raw[len(self.tag):])
+        return self._unpack(payload, table)
+
+    def _pack(self, value, keys):
+        if isinstance(value, dict):
+            packed = {}
+            for key, item in value.items():
+                index = keys.get(key)
+                if index is None:
+                    index = len(keys)
+                    keys[key] = index
+                packed[_base36(index)] = self._pack(item, keys)
+            return packed
+        if isinstance(value, list):
+            return [self._pack(item, keys) for item in value]
+        if isinstance(value, str):
+            return _pack_string(value)
+        return value
+
+    def _unpack(self, value, table):
+        if isinstance(value, dict):
+            return {table[int(key, 36)]: self._unpack(item, table) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._unpack(item, table) for item in value]
+        if isinstance(value, str):
+            return _unpack_string(value)
+        return value
+
+
+class LZCodec:
+    """
+    Codec compacto comprimido con LZ (lz-string, compressToUTF16).
+
+    Solo se usa para leer valores guardados con versiones anteriores:
+    requiere window.LZString (CDN en index.html), y un valor que solo se
+    puede leer con una dependencia externa se pierde si el CDN no carga.
+    SliceStore reescribe estos valores con el codec compacto.
+    """
+
+    tag = LZ_TAG
+    name = 'lz'
+
+    def __init__(self, inner=None):
+        self.inner = inner or CompactCodec()
+
+    @staticmethod
+    def available():
+        return hasattr(window, 'LZString')
+
+    def encode(self, value):
+        return self.tag + window.LZString.compressToUTF16(self.inner.encode(value))
+
+    def decode(self, raw):
+        if not self.available():
+            raise ValueError("lz-string no está cargado")
+        return self.inner.decode(window.LZString.decompressFromUTF16(raw[len(self.tag):]))
+
+
+# =============================================================================
+# STRINGS Y FECHAS
+# =============================================================================
+
+def _base36(number):
+    """Entero no negativo en base 36."""
+    digits = '0123456789abcdefghijklmnopqrstuvwxyz'
+    if number == 0:
+        return '0'
+    out = ''
+    while number:
+        number, rem = divmod(number, 36)
+        out = digits[rem] + out
+    return out
+
+
+def _is_iso_date(value):
+    """Verifica formato 'YYYY-MM-DD' sin usar regex."""
+    return (len(value) == 10 and value[4] == '-' and value[7] == '-'
+            and value[:4].isdigit() and value[5:7].isdigit() and value[8:].isdigit())
+
+
+def _pack_string(value):
+    """Codifica un string (fechas como desplazamientos)."""
+    if value.startswith('~'):
+        return '~' + value
+
+    if len(value) >= 10 and _is_iso_date(value[:10]):
+        try:
+            if len(value) == 10:
+                days = date(int(value[:4]), int(value[5:7]), int(value[8:])).toordinal() - _EPOCH_ORDINAL
+                packed = '~d' + str(days)
+            elif len(value) >= 19 and value[10] == 'T':
+                moment = datetime.fromisoformat(value[:19])
+                seconds = int((moment - _EPOCH_DATETIME).total_seconds())
+                packed = '~t' + str(seconds) + value[19:]
+            else:
+                return value
+        except ValueError:
+            return value
+
+        # Solo si la conversión es exacta
+        if _unpack_string(packed) == value:
+            return packed
+
+    return value
+
+
+def _unpack_string(value):
+    """Decodifica un string codificado con _pack_string."""
+    if not value.startswith('~'):
+        return value
+
+    kind = value[1:2]
+    if kind == '~':
+        return value[1:]
+    if kind == 'd':
+        return date.fromordinal(_EPOCH_ORDINAL + int(value[2:])).isoformat()
+    if kind == 't':
+        digits = value[2:]
+        end = 1 if digits.startswith('-') else 0
+        while end < len(digits) and digits[end].isdigit():
+            end += 1
+        moment = _EPOCH_DATETIME + timedelta(seconds=int(digits[:end]))
+        return moment.isoformat() + digits[end:]
+    return value
+
+
+# =============================================================================
+# REGISTRO
+# =============================================================================
+
+_json_codec = JSONCodec()
+_compact_codec = CompactCodec()
+
+
+def get_codec(name=None):
+    """
+    Obtiene un codec de escritura por nombre ('json', 'compact').
+    Sin nombre: compact. LZ solo se lee (ver LZCodec).
+    """
+    if name == 'json':
+        return _json_codec
+    return _compact_codec
+
+
+def is_legacy(raw):
+    """Indica si un valor guardado usa un codec que ya no se escribe (LZ)."""
+    return raw.startswith(LZ_TAG)
+
+
+def decode(raw):
+    """
+    Decodifica un valor guardado eligiendo el codec por su etiqueta.
+    Lanza una excepción si el valor no se puede leer.
+    """
+    if raw.startswith(LZ_TAG):
+        return LZCodec(_compact_codec).decode(raw)
+    if raw.startswith(COMPACT_TAG):
+        return _compact_codec.decode(raw)
+    return _json_codec.decode(raw)
+
+
+def compare_codecs(value, repeat=5):
+    """
+    Tamaño y tiempos de cada codec disponible para un valor (debug).
+
+    CompactCodec recorre cada valor en Python al codificar y al
+    decodificar, así que ahorra espacio a cambio de tiempo frente al
+    json.loads nativo; esta medida permite ver el balance por slice.
+
+    Returns:
+        {codec: {'size': caracteres, 'encode_ms': ms, 'decode_ms': ms}}
+        (tiempos medios de `repeat` repeticiones)
+    """
+    now = window.performance.now
+    results = {}
+    for codec in (_json_codec, _compact_codec):
+        start = now()
+        for _ in range(repeat):
+            raw = codec.encode(value)
+        encode_ms = (now() - start) / repeat
+
+        start = now()
+        for _ in range(repeat):
+            codec.decode(raw)
+        decode_ms = (now() - start) / repeat
+
+        results[codec.name] = {'size': len(raw), 'encode_ms': encode_ms, 'decode_ms': decode_ms}
+    return results
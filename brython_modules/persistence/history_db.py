@@ -0,0 +1,307 @@
+# PromptCraft - History Event Store
+# Historiales append-only en IndexedDB (localStorage guarda solo lo reciente)
+
+import json
+from browser import window, console
+
+
+DB_NAME = 'promptcraft'
+DB_VERSION = 1
+STORE = 'events'
+
+# Bandera de localStorage: historiales antiguos ya copiados a IndexedDB
+MIGRATED_KEY = 'promptcraft_history_migrated'
+
+
+class HistoryStore:
+    """
+    Almacén asíncrono de eventos de historial en IndexedDB.
+
+    Cada evento se guarda como {id, kind, activity, timestamp, data}:
+    - kind: 'xp' | 'activity' | 'badge'
+    - activity: tipo de actividad (p. ej. 'puzzle_solve')
+    - timestamp: milisegundos desde epoch
+    - data: JSON del evento completo
+
+    Índices: 'timestamp', 'activity' y 'kind_timestamp' ([kind, timestamp])
+    para consultas por rango ("XP de esta semana") sin recorrer todo.
+
+    Las escrituras se agrupan en una transacción por tick y se encolan
+    mientras la base de datos se abre. Sin IndexedDB, append() no hace
+    nada y las consultas responden vacías: las páginas usan entonces el
+    resumen reciente que sigue en localStorage.
+    """
+
+    def __init__(self, db_name=DB_NAME):
+        self.db_name = db_name
+        self.db = None
+        self._opening = False
+        self._pending = []
+        self._waiting = []
+        self._flush_scheduled = False
+        self.stats = {
+            'appended': 0,
+            'batches': 0,
+            'queries': 0,
+            'errors': 0,
+        }
+
+    @staticmethod
+    def available():
+        """Indica si el navegador soporta IndexedDB."""
+        return hasattr(window, 'indexedDB') and bool(window.indexedDB)
+
+    # =========================================================================
+    # APERTURA
+    # =========================================================================
+
+    def open(self, on_ready=None):
+        """Abre (o crea) la base de datos. on_ready se llama al estar lista."""
+        if on_ready:
+            if self.db is not None or not self.available():
+                on_ready()
+                return
+            self._waiting.append(on_ready)
+
+        if self._opening or self.db is not None or not self.available():
+            return
+        self._opening = True
+
+        request = window.indexedDB.open(self.db_name, DB_VERSION)
+
+        def on_upgrade(event):
+            db = event.target.result
+            if not db.objectStoreNames.contains(STORE):
+                store = db.createObjectStore(STORE, {'keyPath': 'id', 'autoIncrement': True})
+                store.createIndex('timestamp', 'timestamp')
+                store.createIndex('activity', 'activity')
+                store.createIndex('kind_timestamp', ['kind', 'timestamp'])
+
+        def on_success(event):
+            self.db = event.target.result
+            self._opening = False
+            self._flush()
+            self._release()
+
+        def on_error(event):
+            self._opening = False
+            self.stats['errors'] += 1
+            console.log("[History] Could not open IndexedDB")
+            # Las consultas en espera responden vacías
+            self._release()
+
+        request.onupgradeneeded = on_upgrade
+        request.onsuccess = on_success
+        request.onerror = on_error
+
+    def _release(self):
+        """Ejecuta las operaciones que esperaban la apertura."""
+        waiting, self._waiting = self._waiting, []
+        for callback in waiting:
+            try:
+                callback()
+            except Exception as e:
+                self.stats['errors'] += 1
+                console.log(f"[History] Error: {e}")
+
+    # =========================================================================
+    # ESCRITURA
+    # =========================================================================
+
+    def append(self, kind, event, activity='', timestamp=None):
+        """
+        Añade un evento al historial (asíncrono, agrupado por tick).
+
+        Args:
+            kind: 'xp' | 'activity' | 'badge'
+            event: dict serializable con el evento
+            activity: Tipo de actividad (índice 'activity')
+            timestamp: ms desde epoch (por defecto ahora)
+        """
+        if not self.available():
+            return
+
+        self._pending.append(_to_record(kind, event, activity, timestamp))
+
+        if self.db is None:
+            self.open()
+        elif not self._flush_scheduled:
+            self._flush_scheduled = True
+            window.setTimeout(self._flush, 0)
+
+    def _flush(self):
+        """Escribe los eventos pendientes en una sola transacción."""
+        self._flush_scheduled = False
+        if self.db is None or not self._pending:
+            return
+
+        records, self._pending = self._pending, []
+        try:
+            tx = self.db.transaction([STORE], 'readwrite')
+            store = tx.objectStore(STORE)
+            for record in records:
+                store.add(record)
+            self.stats['appended'] += len(records)
+            self.stats['batches'] += 1
+        except Exception as e:
+            self.stats['errors'] += 1
+            console.log(f"[History] Append error: {e}")
+
+    # =========================================================================
+    # CONSULTAS
+    # =========================================================================
+
+    def query(self, kind, start=0, end=None, callback=None, limit=None):
+        """
+        Eventos de un tipo en un rango de tiempo (por índice).
+
+        Args:
+            kind: Tipo de historial
+            start, end: Rango en ms desde epoch (end por defecto ahora)
+            callback: Recibe la lista de eventos (dicts con '_ms'), del
+                más antiguo al más reciente
+            limit: Máximo de eventos
+        """
+        def run():
+            if self.db is None:
+                callback([])
+                return
+
+            self.stats['queries'] += 1
+            upper = end if end is not None else window.Date.now()
+            key_range = window.IDBKeyRange.bound([kind, start], [kind, upper])
+            index = self.db.transaction([STORE], 'readonly').objectStore(STORE).index('kind_timestamp')
+            request = index.getAll(key_range, limit) if limit else index.getAll(key_range)
+
+            def on_success(event):
+                callback([_to_event(record) for record in event.target.result])
+
+            def on_error(event):
+                self.stats['errors'] += 1
+                callback([])
+
+            request.onsuccess = on_success
+            request.onerror = on_error
+
+        self.open(run)
+
+    def count_activity(self, activity, callback):
+        """Número de eventos de un tipo de actividad (índice 'activity')."""
+        def run():
+            if self.db is None:
+                callback(0)
+                return
+            self.stats['queries'] += 1
+            index = self.db.transaction([STORE], 'readonly').objectStore(STORE).index('activity')
+            request = index.count(activity)
+            request.onsuccess = lambda event: callback(event.target.result)
+            request.onerror = lambda event: callback(0)
+
+        self.open(run)
+
+    def clear(self):
+        """Elimina todos los eventos (reset del estado)."""
+        self._pending = []
+
+        def run():
+            if self.db is not None:
+                self.db.transaction([STORE], 'readwrite').objectStore(STORE).clear()
+
+        self.open(run)
+
+    # =========================================================================
+    # MIGRACIÓN
+    # =========================================================================
+
+    def import_legacy(self, storage, state):
+        """
+        Copia una sola vez los historiales de localStorage a IndexedDB.
+
+        Los eventos se escriben en una transacción propia y la bandera
+        MIGRATED_KEY se marca en su oncomplete: si la escritura falla o
+        la página se cierra antes, la copia se repite en la próxima carga.
+
+        Args:
+            storage: browser.local_storage.storage
+            state: dict del estado con xp_history / activity_history /
+                badge_history
+        """
+        if not self.available() or storage.get(MIGRATED_KEY):
+            return
+
+        records = []
+        for event in state.get('xp_history', []) or []:
+            records.append(_to_record('xp', event, event.get('activity', ''), _parse_time(event.get('timestamp'))))
+
+        for day in state.get('activity_history', []) or []:
+            records.append(_to_record('activity', {'date': day}, 'activity', _parse_time(day)))
+
+        for badge_id, unlocked_at in (state.get('badge_history', {}) or {}).items():
+            records.append(_to_record('badge', {'badge_id': badge_id, 'timestamp': unlocked_at},
+                                      badge_id, _parse_time(unlocked_at)))
+
+        def run():
+            if self.db is None:
+                return
+
+            def on_complete(event):
+                storage[MIGRATED_KEY] = '1'
+                console.log(f"[History] Imported {len(records)} legacy events into IndexedDB")
+
+            def on_error(event):
+                self.stats['errors'] += 1
+                console.log("[History] Legacy import failed; will retry on next load")
+
+            try:
+                tx = self.db.transaction([STORE], 'readwrite')
+                tx.oncomplete = on_complete
+                tx.onerror = on_error
+                store = tx.objectStore(STORE)
+                for record in records:
+                    store.add(record)
+                self.stats['appended'] += len(records)
+                self.stats['batches'] += 1
+            except Exception as e:
+                self.stats['errors'] += 1
+                console.log(f"[History] Legacy import error: {e}")
+
+        self.open(run)
+
+
+def _to_record(kind, event, activity='', timestamp=None):
+    """Registro de IndexedDB para un evento (ver HistoryStore)."""
+    return {
+        'kind': kind,
+        'activity': activity or '',
+        'timestamp': timestamp if timestamp is not None else window.Date.now(),
+        'data': json.dumps(event),
+    }
+
+
+def _to_event(record):
+    """Convierte un registro de IndexedDB en el dict del evento ('_ms': timestamp)."""
+    try:
+        event = json.loads(record.data)
+    except Exception:
+        event = {}
+    event['_ms'] = record.timestamp
+    return event
+
+
+def _parse_time(value):
+    """Timestamp en ms a partir de un string de fecha (0 si no se entiende)."""
+    if not value:
+        return 0
+    ms = window.Date.parse(value)
+    return 0 if ms != ms else ms  # NaN
+
+
+# Instancia global
+_history_instance = None
+
+def get_history_db():
+    """Obtiene la instancia singleton del almacén de historiales."""
+    global _history_instance
+    if _history_instance is None:
+        _history_instance = HistoryStore()
+    return _history_instance
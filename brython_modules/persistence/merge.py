@@ -0,0 +1,214 @@
+# PromptCraft - State Merge Rules
+# Reglas por campo para combinar el estado de dos pestañas
+
+# Reglas por ruta con punto. Las rutas sin regla usan la regla por
+# defecto: los dicts se combinan clave a clave, las listas se unen y
+# los valores simples toma el remoto.
+MERGE_RULES = {
+    # XP se suma por id de evento (AppState aplica los xp_awarded remotos)
+    'progress.xp': 'local',
+    'progress.level': 'max',
+    'progress.lessons_completed': 'union',
+    'progress.exercises_completed': 'union',
+    'progress.puzzles_solved': 'puzzles',
+    'streak': 'streak',
+    'badges': 'union',
+    'badge_history': 'earliest',
+    'activity_history': 'dates',
+    'xp_history': 'xp_history',
+    'stats': 'max',
+    'user.id': 'local',
+    # Cada pestaña mantiene su propio log; los eventos viajan aparte
+    'event_log': 'local',
+    # XP por día: se suma con los xp_awarded remotos, igual que progress.xp
+    'xp_daily': 'local',
+    # Días activos: OR de los bitsets y recuento (ver activity_calendar.py)
+    'activity_calendar': 'calendar',
+    # Aproximado; AppState.verify_counters() corrige con un recuento
+    'counters': 'counters',
+    # Logros: primera fecha de desbloqueo; las ventanas son de cada pestaña
+    'achievements.unlocked': 'earliest',
+    'achievements.windows': 'local',
+}
+
+# Tamaño de los historiales recientes en localStorage (ver
+# XPManager.HOT_HISTORY; activity_history es el heredado de antes del
+# calendario de actividad)
+HISTORY_LIMITS = {
+    'xp_history': 50,
+    'activity_history': 90,
+}
+
+
+def merge_value(path, local, remote):
+    """
+    Combina el valor local y el remoto de una ruta.
+
+    Args:
+        path: Ruta con punto ('progress', 'streak', ...)
+        local: Valor en esta pestaña
+        remote: Valor recibido de otra pestaña
+
+    Returns:
+        Valor combinado (puede ser el mismo objeto local)
+    """
+    if local is None:
+        return remote
+    if remote is None:
+        return local
+
+    rule = MERGE_RULES.get(path)
+    if rule is not None:
+        return _RULES[rule](path, local, remote)
+
+    if isinstance(local, dict) and isinstance(remote, dict):
+        return _merge_dicts(path, local, remote)
+    if isinstance(local, list) and isinstance(remote, list):
+        return _union(path, local, remote)
+    return remote
+
+
+def _merge_dicts(path, local, remote):
+    merged = dict(local)
+    for key, value in remote.items():
+        merged[key] = merge_value(f"{path}.{key}", local.get(key), value)
+    return merged
+
+
+def _local(path, local, remote):
+    return local
+
+
+def _max(path, local, remote):
+    """Máximo; en dicts se aplica a cada campo numérico."""
+    if isinstance(local, dict) and isinstance(remote, dict):
+        merged = dict(local)
+        for key, value in remote.items():
+            merged[key] = _max(f"{path}.{key}", local.get(key), value) if key in local else value
+        return merged
+    if isinstance(local, (int, float)) and isinstance(remote, (int, float)):
+        return max(local, remote)
+    return remote
+
+
+def _union(path, local, remote):
+    """Unión conservando el orden local."""
+    merged = list(local)
+    for item in remote:
+        if item not in merged:
+            merged.append(item)
+    return merged
+
+
+def _earliest(path, local, remote):
+    """Dict {id: fecha}: conserva la primera fecha conocida."""
+    merged = dict(remote)
+    merged.update(local)
+    return merged
+
+
+def _dates(path, local, remote):
+    """Lista de fechas 'YYYY-MM-DD': unión ordenada y recortada."""
+    merged = sorted(set(local) | set(remote))
+    limit = HISTORY_LIMITS.get(path)
+    return merged[-limit:] if limit else merged
+
+
+def _xp_history(path, local, remote):
+    """Eventos de XP: unión por timestamp/actividad, recortada."""
+    seen = {(e.get('timestamp'), e.get('activity'), e.get('amount')) for e in local}
+    merged = list(local)
+    for event in remote:
+        key = (event.get('timestamp'), event.get('activity'), event.get('amount'))
+        if key not in seen:
+            seen.add(key)
+            merged.append(event)
+    limit = HISTORY_LIMITS.get(path)
+    return merged[-limit:] if limit else merged
+
+
+def _streak(path, local, remote):
+    """La racha con la fecha más reciente gana; el máximo histórico se conserva."""
+    local_date = local.get('last_date') or ''
+    remote_date = remote.get('last_date') or ''
+
+    if remote_date > local_date:
+        merged = dict(remote)
+    elif local_date > remote_date:
+        merged = dict(local)
+    else:
+        merged = dict(local)
+        merged['current'] = max(local.get('current', 0), remote.get('current', 0))
+
+    merged['longest'] = max(local.get('longest', 0), remote.get('longest', 0), merged.get('current', 0))
+    merged['freezes_used'] = max(local.get('freezes_used', 0), remote.get('freezes_used', 0))
+    return merged
+
+
+def _puzzles(path, local, remote):
+    """Registros de puzzles: mejor marca de cada uno."""
+    merged = dict(local)
+    for puzzle_id, theirs in remote.items():
+        mine = local.get(puzzle_id)
+        if mine is None:
+            merged[puzzle_id] = theirs
+            continue
+
+        record = dict(mine)
+        if theirs.get('best_stars', 0) > mine.get('best_stars', 0):
+            record['best_stars'] = theirs['best_stars']
+            record['hints_used'] = theirs.get('hints_used', 0)
+        times = [t for t in (mine.get('best_time'), theirs.get('best_time')) if t]
+        record['best_time'] = min(times) if times else None
+        record['attempts'] = max(mine.get('attempts', 0), theirs.get('attempts', 0))
+        record['solved'] = mine.get('solved') or theirs.get('solved', False)
+        record['last_solved'] = max(mine.get('last_solved') or '', theirs.get('last_solved') or '') or None
+        merged[puzzle_id] = record
+    return merged
+
+
+def _counters(path, local, remote):
+    """Contadores de progreso: máximo, salvo el mejor tiempo (mínimo)."""
+    merged = _max(path, local, remote)
+    times = [t for t in (local.get('fastest_time'), remote.get('fastest_time')) if t]
+    merged['fastest_time'] = min(times) if times else None
+    return merged
+
+
+def _bits(path, local, remote):
+    """Bitsets {nombre: [palabras]}: OR palabra a palabra."""
+    merged = dict(local)
+    for key, theirs in remote.items():
+        if not isinstance(theirs, list):
+            continue
+        mine = local.get(key, [])
+        size = max(len(mine), len(theirs))
+        merged[key] = [
+            (mine[i] if i < len(mine) else 0) | (theirs[i] if i < len(theirs) else 0)
+            for i in range(size)
+        ]
+    return merged
+
+
+def _calendar(path, local, remote):
+    """Calendario de actividad: OR de los bitsets y días activos recontados."""
+    from ..activity_calendar import count_days
+
+    merged = _bits(path, local, remote)
+    merged['days'] = count_days(merged.get('active', []))
+    return merged
+
+
+_RULES = {
+    'local': _local,
+    'max': _max,
+    'union': _union,
+    'earliest': _earliest,
+    'dates': _dates,
+    'xp_history': _xp_history,
+    'streak': _streak,
+    'puzzles': _puzzles,
+    'bits': _bits,
+    'calendar': _calendar,
+    'counters': _counters,
+}
@@ -0,0 +1,275 @@
+# PromptCraft - State Migrations
+# Pipeline ordenado de migraciones del esquema del estado
+
+from datetime import datetime
+from browser import console
+
+
+# Versión actual del esquema. Al cambiar la estructura del estado se
+# añade una migración a MIGRATIONS y se incrementa este número.
+SCHEMA_VERSION = 7
+
+
+def _deep_merge(base, override):
+    """Merge recursivo: los valores de override tienen prioridad."""
+    result = base.copy()
+    for key, value in override.items():
+        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
+            result[key] = _deep_merge(result[key], value)
+        else:
+            result[key] = value
+    return result
+
+
+# Claves que crea su propia migración a partir de datos anteriores; v1
+# no las rellena con el valor por defecto
+SEEDED_KEYS = ('event_log', 'xp_daily', 'activity_calendar')
+
+
+def _migrate_1_defaults(state, defaults):
+    """v1: completar campos faltantes con los valores por defecto."""
+    base = {key: value for key, value in defaults.items() if key not in SEEDED_KEYS}
+    return _deep_merge(base, state)
+
+
+def _merge_puzzle_record(record, legacy):
+    """Combina un registro de puzzle antiguo con el canónico."""
+    merged = dict(record)
+
+    stars = max(
+        merged.get('best_stars', merged.pop('stars', 0)) or 0,
+        legacy.get('best_stars', legacy.get('stars', 0)) or 0,
+    )
+    merged['best_stars'] = stars
+
+    times = [t for t in (
+        merged.get('best_time', merged.pop('time', None)),
+        legacy.get('best_time', legacy.get('time')),
+    ) if t]
+    merged['best_time'] = min(times) if times else None
+
+    merged['attempts'] = max(merged.get('attempts', 1), legacy.get('attempts', 1))
+    merged['solved'] = True
+
+    if 'solved_at' in merged and 'last_solved' not in merged:
+        merged['last_solved'] = merged.pop('solved_at')
+    if legacy.get('last_solved') and not merged.get('last_solved'):
+        merged['last_solved'] = legacy['last_solved']
+
+    return merged
+
+
+def _migrate_2_canonical(state, defaults):
+    """
+    v2: una sola ubicación para cada contador.
+
+    - XP y nivel: progress.xp / progress.level (antes también data['xp'])
+    - Lecciones: progress.lessons_completed (antes también
+      'completed_lessons' y 'lessons_completed' de primer nivel),
+      progress.lessons_in_progress y progress.lesson_exercises
+    - Puzzles: progress.puzzles_solved con registros
+      {best_stars, best_time, attempts, solved, last_solved}
+      (antes también 'puzzles_completed')
+    - Racha: streak.longest / streak.freezes_available (antes 'max'/'freezes')
+    - Usuario: user.username (antes también data['username'])
+    """
+    progress = state.setdefault('progress', {})
+
+    # XP: los dos contadores acumulaban actividades distintas, se suman.
+    # El nivel lo recalcula AppState tras migrar.
+    progress['xp'] = progress.get('xp', 0) + (state.pop('xp', 0) or 0)
+
+    # Lecciones completadas (unión conservando el orden)
+    lessons = list(progress.get('lessons_completed', []))
+    for key in ('completed_lessons', 'lessons_completed'):
+        for lesson_id in state.pop(key, None) or []:
+            if lesson_id not in lessons:
+                lessons.append(lesson_id)
+    progress['lessons_completed'] = lessons
+
+    in_progress = state.pop('lessons_in_progress', None) or {}
+    progress['lessons_in_progress'] = _deep_merge(progress.get('lessons_in_progress', {}), in_progress)
+    for lesson_id in lessons:
+        progress['lessons_in_progress'].pop(lesson_id, None)
+
+    exercises = state.pop('completed_exercises', None) or {}
+    progress['lesson_exercises'] = _deep_merge(progress.get('lesson_exercises', {}), exercises)
+
+    # Puzzles
+    solved = {}
+    for puzzle_id, record in (progress.get('puzzles_solved') or {}).items():
+        solved[puzzle_id] = _merge_puzzle_record(record, {})
+    for puzzle_id, record in (state.pop('puzzles_completed', None) or {}).items():
+        solved[puzzle_id] = _merge_puzzle_record(solved.get(puzzle_id, {}), record)
+    progress['puzzles_solved'] = solved
+
+    # Racha
+    streak = state.setdefault('streak', {})
+    if 'max' in streak:
+        streak['longest'] = max(streak.get('longest', 0), streak.pop('max') or 0)
+    if 'freezes' in streak:
+        streak['freezes_available'] = max(streak.get('freezes_available', 0), streak.pop('freezes') or 0)
+
+    # Usuario
+    username = state.pop('username', None)
+    if username:
+        state.setdefault('user', {})['username'] = username
+
+    return state
+
+
+def _migrate_3_event_log(state, defaults):
+    """
+    v3: log de eventos de progreso (ver event_log.py).
+
+    El progreso anterior se resume en un evento 'baseline' para que los
+    agregados del log coincidan con los contadores existentes. Un log
+    existente se conserva (la migración puede repetirse si se perdió
+    schema_version).
+    """
+    if 'event_log' in state:
+        return state
+
+    progress = state.get('progress', {})
+    stats = state.get('stats', {})
+    baseline = {
+        'seq': 1,
+        'type': 'baseline',
+        'ts': datetime.now().isoformat(),
+        'amount': progress.get('xp', 0),
+        'lessons': len(progress.get('lessons_completed', [])),
+        'exercises': len(progress.get('exercises_completed', [])),
+        'puzzles': list(progress.get('puzzles_solved', {}).keys()),
+        'puzzles_attempted': stats.get('puzzles_attempted', 0),
+        'perfect_puzzles': stats.get('perfect_puzzles', 0),
+        'hints_used_total': stats.get('hints_used_total', 0),
+        'badges': list(state.get('badges', [])),
+        'active_days': len(state.get('activity_history', [])),
+        'last_date': state.get('streak', {}).get('last_date'),
+    }
+    state['event_log'] = {
+        'seq': 1,
+        'snapshot': {'seq': 0, 'aggregates': {}},
+        'tail': [baseline],
+    }
+    return state
+
+
+def _migrate_4_daily_xp(state, defaults):
+    """
+    v4: XP por día en un buffer circular (ver daily_ring.py), sembrado
+    con los eventos recientes de xp_history. Un buffer existente se
+    conserva.
+    """
+    if 'xp_daily' in state:
+        return state
+
+    ring = defaults['xp_daily']
+    size = len(ring['totals'])
+    today = ring['day']
+
+    for event in state.get('xp_history', []) or []:
+        try:
+            # Timestamp de JS: 'Mon Oct 19 2026 10:00:00 GMT...'
+            day = datetime.strptime(event['timestamp'][4:15], '%b %d %Y').date().toordinal()
+        except (KeyError, TypeError, ValueError):
+            continue
+        if today - size < day <= today:
+            ring['totals'][day % size] += event.get('amount', 0) or 0
+
+    state['xp_daily'] = ring
+    return state
+
+
+def _migrate_5_activity_calendar(state, defaults):
+    """
+    v5: días activos como bitset (ver activity_calendar.py), sembrado
+    con activity_history y con los días de la racha vigente. Un
+    calendario existente se conserva.
+    """
+    if 'activity_calendar' in state:
+        return state
+
+    from ..activity_calendar import ActivityCalendar
+
+    calendar = ActivityCalendar(defaults['activity_calendar'])
+    for day in state.get('activity_history', []) or []:
+        try:
+            calendar.mark(datetime.strptime(day, '%Y-%m-%d').toordinal())
+        except (TypeError, ValueError):
+            continue
+
+    # La racha puede ser más larga que el historial reciente
+    streak = state.get('streak', {})
+    last_date = streak.get('last_date')
+    if last_date:
+        try:
+            last = datetime.strptime(last_date, '%Y-%m-%d').toordinal()
+        except (TypeError, ValueError):
+            last = None
+        if last is not None:
+            for day in range(last - streak.get('current', 0) + 1, last + 1):
+                calendar.mark(day)
+
+    state['activity_calendar'] = calendar.data
+    return state
+
+
+def _migrate_6_counters(state, defaults):
+    """v6: contadores de progreso incrementales (ver counters.py)."""
+    from ..counters import recount
+
+    state['counters'] = recount(state.get('progress', {}))
+    return state
+
+
+def _migrate_7_active_days(state, defaults):
+    """v7: total de días activos mantenido en el calendario ('days')."""
+    from ..activity_calendar import count_days
+
+    calendar = state.get('activity_calendar') or defaults['activity_calendar']
+    calendar['days'] = count_days(calendar.get('active', []))
+    state['activity_calendar'] = calendar
+    return state
+
+
+# Migraciones ordenadas: (versión resultante, función)
+MIGRATIONS = [
+    (1, _migrate_1_defaults),
+    (2, _migrate_2_canonical),
+    (3, _migrate_3_event_log),
+    (4, _migrate_4_daily_xp),
+    (5, _migrate_5_activity_calendar),
+    (6, _migrate_6_counters),
+    (7, _migrate_7_active_days),
+]
+
+
+def migrate(state, defaults):
+    """
+    Lleva un estado cargado a la versión actual del esquema.
+
+    Solo ejecuta las migraciones posteriores a state['schema_version'];
+    un estado ya actualizado se retorna sin cambios.
+
+    Args:
+        state: Estado cargado
+        defaults: Estado por defecto (para la migración de campos nuevos)
+
+    Returns:
+        (state, applied): estado migrado y lista de versiones aplicadas
+    """
+    version = state.get('schema_version', 0)
+    applied = []
+
+    for target, migration in MIGRATIONS:
+        if version < target:
+            state = migration(state, defaults)
+            state['schema_version'] = target
+            version = target
+            applied.append(target)
+
+    if applied:
+        console.log(f"[Persistence] Migrated state to schema v{version}")
+
+    return state, applied
@@ -0,0 +1,220 @@
+# PromptCraft - Sliced State Storage
+# Persiste cada subárbol del estado en su propia clave de localStorage
+
+from browser import console
+from .codec import get_codec, decode, is_legacy
+
+
+# Claves de primer nivel con slice propio. El resto del estado se
+# guarda junto en el slice 'misc'.
+DEFAULT_SLICES = (
+    'user',
+    'progress',
+    'streak',
+    'badges',
+    'preferences',
+    'stats',
+    # Esquema < 2: se carga para migrarlo a progress.puzzles_solved
+    'puzzles_completed',
+    'xp_history',
+    'badge_history',
+    'activity_history',
+    'assessment',
+    'practice',
+    'claude_exercises',
+    'final_project',
+    'event_log',
+    'xp_daily',
+    'activity_calendar',
+    'counters',
+    'achievements',
+)
+
+MISC_SLICE = 'misc'
+
+# Historiales: crecen, casi todo son fechas y solo se leen al cargar.
+# Son los únicos que usan el codec compacto; el resto se guarda como
+# JSON plano para escribir y cargar con el parser nativo.
+PACKED_SLICES = (
+    'xp_history',
+    'badge_history',
+    'activity_history',
+    'event_log',
+)
+
+
+class SliceStore:
+    """
+    Almacenamiento del estado particionado en slices.
+
+    Cada clave de primer nivel listada en `slices` se guarda en
+    '<prefix>.<clave>'; las demás se agrupan en '<prefix>.misc'. Así,
+    cambiar un contador solo re-serializa su slice y no los historiales.
+
+    Args:
+        storage: Objeto tipo dict (browser.local_storage.storage)
+        prefix: Prefijo de las claves (la clave del blob antiguo)
+        slices: Claves de primer nivel con slice propio
+        codec: Codec de escritura de los slices en `packed` (por defecto
+            get_codec()); los demás se escriben como JSON plano. La
+            lectura detecta el codec de cada valor por su etiqueta
+        packed: Slices que usan `codec` (ver PACKED_SLICES)
+        on_quota: Callback(nombre_slice) -> bool llamado si se excede la
+            cuota de localStorage; si libera espacio se reintenta una vez
+    """
+
+    def __init__(self, storage, prefix, slices=DEFAULT_SLICES, codec=None, on_quota=None,
+                 packed=PACKED_SLICES):
+        self.storage = storage
+        self.prefix = prefix
+        self.slices = tuple(slices)
+        self.codec = codec or get_codec()
+        self.plain_codec = get_codec('json')
+        self.packed = set(packed)
+        # Slices guardados que no se pudieron leer: nunca se sobrescriben
+        self.unreadable = set()
+        self.on_quota = on_quota
+        self.stats = {
+            'slices_written': 0,
+            'bytes_written': 0,
+            'quota_errors': 0,
+            'failed_writes': 0,
+        }
+
+    def storage_key(self, name):
+        """Clave de localStorage de un slice."""
+        return f"{self.prefix}.{name}"
+
+    def slice_for(self, key):
+        """Slice al que pertenece una clave (admite notación de punto)."""
+        top = key.split('.', 1)[0]
+        return top if top in self.slices else MISC_SLICE
+
+    def slices_for(self, keys):
+        """Slices afectados por un conjunto de claves (vacío = todos)."""
+        if not keys:
+            return set(self.slices) | {MISC_SLICE}
+        return {self.slice_for(key) for key in keys}
+
+    def load(self):
+        """
+        Carga el estado desde los slices, migrando el blob antiguo si existe.
+
+        Cada slice se decodifica por separado: uno que falle (p. ej. LZ
+        sin lz-string cargado) queda en `unreadable` y write() no lo toca,
+        así el valor guardado sobrevive hasta una carga que sí lo lea.
+        Los slices leídos con un codec antiguo se reescriben.
+
+        Returns:
+            dict con el estado, o None si no hay nada guardado
+        """
+        legacy = self.storage.get(self.prefix)
+        if legacy:
+            return self._migrate_blob(legacy)
+
+        state = {}
+        found = False
+        rewrite = []
+        for name in self.slices + (MISC_SLICE,):
+            raw = self.storage.get(self.storage_key(name))
+            if not raw:
+                continue
+            found = True
+            try:
+                value = decode(raw)
+            except Exception as e:
+                self.unreadable.add(name)
+                console.log(f"[Persistence] Slice '{name}' could not be decoded, kept as is: {e}")
+                continue
+            if name == MISC_SLICE:
+                state.update(value)
+            else:
+                state[name] = value
+            if is_legacy(raw):
+                rewrite.append(name)
+
+        for name in rewrite:
+            self._put(name, state)
+
+        return state if found else None
+
+    def write(self, state, keys=None):
+        """
+        Escribe los slices afectados por las claves.
+
+        Args:
+            state: Estado completo
+            keys: Claves modificadas (None/vacío = todos los slices)
+        """
+        for name in self.slices_for(keys):
+            if name in self.unreadable:
+                continue
+            if name != MISC_SLICE and name not in state:
+                self._remove(name)
+                continue
+            self._put(name, state)
+
+    def clear(self):
+        """Elimina todos los slices."""
+        for name in self.slices + (MISC_SLICE,):
+            self._remove(name)
+        self.unreadable = set()
+
+    def _value(self, state, name):
+        """Valor de un slice dentro del estado."""
+        if name == MISC_SLICE:
+            return {k: v for k, v in state.items() if k not in self.slices}
+        return state[name]
+
+    def _put(self, name, state):
+        """Codifica y guarda un slice, manejando el exceso de cuota."""
+        key = self.storage_key(name)
+        for attempt in range(2):
+            # Se re-codifica en el reintento: on_quota pudo recortar el valor
+            codec = self.codec if name in self.packed else self.plain_codec
+            encoded = codec.encode(self._value(state, name))
+            try:
+                self.storage[key] = encoded
+                self.stats['slices_written'] += 1
+                self.stats['bytes_written'] += len(encoded)
+                return True
+            except Exception as e:
+                if not _is_quota_error(e):
+                    raise
+                self.stats['quota_errors'] += 1
+                # Reintentar solo si el callback liberó espacio
+                if attempt or not (self.on_quota and self.on_quota(name)):
+                    break
+
+        self.stats['failed_writes'] += 1
+        console.log(f"[Persistence] Quota exceeded, slice '{name}' not saved")
+        return False
+
+    def usage(self):
+        """Caracteres ocupados por cada slice (debug)."""
+        sizes = {}
+        for name in self.slices + (MISC_SLICE,):
+            raw = self.storage.get(self.storage_key(name))
+            if raw:
+                sizes[name] = len(raw)
+        return sizes
+
+    def _remove(self, name):
+        """Elimina un slice de localStorage."""
+        key = self.storage_key(name)
+        if key in self.storage:
+            del self.storage[key]
+
+    def _migrate_blob(self, raw):
+        """Convierte el blob único antiguo en slices (una sola vez)."""
+        state = decode(raw)
+        self.write(state)
+        del self.storage[self.prefix]
+        console.log(f"[Persistence] Migrated {self.prefix} to {len(self.slices_for(None))} slices")
+        return state
+
+
+def _is_quota_error(error):
+    """Detecta QuotaExceededError (el nombre varía entre navegadores)."""
+    message = str(error).lower()
+    return 'quota' in message or 'ns_error_dom_quota_reached' in message
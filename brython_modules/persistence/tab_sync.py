@@ -0,0 +1,108 @@
+# PromptCraft - Cross-Tab Sync
+# Envío de deltas del estado entre pestañas abiertas
+
+import json
+import random
+from browser import window, console
+
+
+CHANNEL_NAME = 'promptcraft_sync'
+
+# Clave de localStorage usada como canal si no hay BroadcastChannel
+SYNC_KEY = 'promptcraft_sync'
+
+
+class TabSync:
+    """
+    Canal de deltas entre pestañas.
+
+    Usa BroadcastChannel si existe; si no, escribe cada mensaje en una
+    clave de localStorage y escucha el evento 'storage' solo de esa
+    clave (los slices del estado no se releen). Los mensajes viajan como
+    JSON y llevan el id de la pestaña de origen para ignorar el eco.
+
+    Args:
+        on_message: Callback(dict) con cada delta recibido de otra pestaña
+        storage: browser.local_storage.storage (canal de respaldo)
+    """
+
+    def __init__(self, on_message, storage=None):
+        self.on_message = on_message
+        self.storage = storage
+        self.tab_id = ''.join(random.choice('abcdefghijklmnopqrstuvwxyz0123456789') for _ in range(8))
+        self._channel = None
+        self._installed = False
+        self.stats = {
+            'sent': 0,
+            'received': 0,
+            'bytes_sent': 0,
+            'errors': 0,
+        }
+
+    @property
+    def transport(self):
+        """'broadcast', 'storage' o None si no está instalado."""
+        if not self._installed:
+            return None
+        return 'broadcast' if self._channel is not None else 'storage'
+
+    def install(self):
+        """Empieza a escuchar mensajes de otras pestañas."""
+        if self._installed:
+            return
+        self._installed = True
+
+        if hasattr(window, 'BroadcastChannel'):
+            self._channel = window.BroadcastChannel.new(CHANNEL_NAME)
+            self._channel.onmessage = lambda event: self._receive(event.data)
+        elif self.storage is not None:
+            def on_storage(event):
+                if event.key == SYNC_KEY and event.newValue:
+                    self._receive(event.newValue)
+
+            window.bind('storage', on_storage)
+
+    def publish(self, message):
+        """
+        Envía un delta a las demás pestañas.
+
+        Args:
+            message: dict serializable (se le añade 'tab')
+        """
+        if not self._installed:
+            return
+
+        message['tab'] = self.tab_id
+        if self._channel is None:
+            # El evento 'storage' solo se dispara si el valor cambia
+            message['nonce'] = random.random()
+
+        try:
+            raw = json.dumps(message, separators=(',', ':'))
+            if self._channel is not None:
+                self._channel.postMessage(raw)
+            else:
+                self.storage[SYNC_KEY] = raw
+            self.stats['sent'] += 1
+            self.stats['bytes_sent'] += len(raw)
+        except Exception as e:
+            self.stats['errors'] += 1
+            console.log(f"[Sync] Publish error: {e}")
+
+    def _receive(self, raw):
+        """Decodifica un mensaje y descarta el eco de esta pestaña."""
+        try:
+            message = json.loads(raw)
+        except Exception:
+            self.stats['errors'] += 1
+            return
+
+        if message.get('tab') == self.tab_id:
+            return
+
+        self.stats['received'] += 1
+        try:
+            self.on_message(message)
+        except Exception as e:
+            self.stats['errors'] += 1
+            console.log(f"[Sync] Merge error: {e}")
@@ -0,0 +1,146 @@
+# PromptCraft - Write-Behind Persistence
+# Agrupa las escrituras a localStorage en un solo flush por periodo ocioso
+
+from browser import window, document, timer, console
+
+
+class WriteBehindWriter:
+    """
+    Escritor diferido (write-behind).
+
+    Las llamadas a mark_dirty() solo marcan el estado como sucio; la
+    escritura real (write_fn) se ejecuta una vez en el siguiente periodo
+    ocioso (requestIdleCallback) o, si no existe, tras un timeout corto.
+    Al ocultar la pestaña o cerrar la página se fuerza el flush.
+
+    Args:
+        write_fn: Función que persiste; recibe el set de claves sucias
+            (vacío = todo)
+        idle_timeout: Máximo de ms que puede esperar una escritura
+    """
+
+    FALLBACK_DELAY = 50
+
+    def __init__(self, write_fn, idle_timeout=1000):
+        self.write_fn = write_fn
+        self.idle_timeout = idle_timeout
+        self._dirty = False
+        self._keys = set()
+        self._all = False
+        self._handle = None
+        self._installed = False
+        self.stats = {
+            'requests': 0,
+            'writes': 0,
+            'forced': 0,
+            'errors': 0,
+        }
+
+    @property
+    def dirty(self):
+        """Indica si hay cambios pendientes de escribir."""
+        return self._dirty
+
+    @property
+    def avoided(self):
+        """Escrituras evitadas gracias al agrupamiento."""
+        return max(0, self.stats['requests'] - self.stats['writes'])
+
+    def mark_dirty(self, *keys):
+        """
+        Marca cambios pendientes y programa un flush.
+
+        Args:
+            *keys: Claves afectadas (sin claves = todo el estado)
+        """
+        self.stats['requests'] += 1
+        if keys:
+            self._keys.update(keys)
+        else:
+            self._all = True
+
+        if not self._dirty:
+            self._dirty = True
+            self._schedule()
+
+    def note(self, *keys):
+        """
+        Registra claves modificadas sin programar escritura.
+        Se incluirán en el siguiente flush.
+        """
+        self._keys.update(keys)
+
+    def flush(self, forced=False):
+        """
+        Escribe inmediatamente los cambios pendientes.
+
+        Returns:
+            bool: True si hubo escritura
+        """
+        self._cancel()
+        if not self._dirty:
+            return False
+
+        keys = set() if self._all else set(self._keys)
+        self._dirty = False
+        self._all = False
+        self._keys = set()
+
+        try:
+            self.write_fn(keys)
+            self.stats['writes'] += 1
+            if forced:
+                self.stats['forced'] += 1
+        except Exception as e:
+            self.stats['errors'] += 1
+            console.log(f"[Persistence] Write error: {e}")
+        return True
+
+    def install(self):
+        """Enlaza los eventos que fuerzan el flush (ocultar/cerrar página)."""
+        if self._installed:
+            return
+        self._installed = True
+
+        def on_visibility(e):
+            if document.visibilityState == 'hidden':
+                self.flush(forced=True)
+
+        document.bind('visibilitychange', on_visibility)
+        window.bind('pagehide', lambda e: self.flush(forced=True))
+        window.bind('beforeunload', lambda e: self.flush(forced=True))
+
+    def get_stats(self):
+        """Contadores de escritura (debug)."""
+        stats = dict(self.stats)
+        stats['avoided'] = self.avoided
+        stats['pending'] = self._dirty
+        return stats
+
+    def _schedule(self):
+        """Programa el flush en el siguiente periodo ocioso."""
+        if self._handle is not None:
+            return
+
+        if hasattr(window, 'requestIdleCallback'):
+            self._handle = ('idle', window.requestIdleCallback(
+                self._on_idle, {'timeout': self.idle_timeout}
+            ))
+        else:
+            self._handle = ('timeout', timer.set_timeout(lambda: self._on_idle(None), self.FALLBACK_DELAY))
+
+    def _cancel(self):
+        """Cancela el flush programado."""
+        if self._handle is None:
+            return
+        kind, handle = self._handle
+        if kind == 'idle':
+            window.cancelIdleCallback(handle)
+        else:
+            timer.clear_timeout(handle)
+        self._handle = None
+
+    def _on_idle(self, deadline):
+        """Callback del periodo ocioso."""
+        self._handle = None
+        self.flush()
@@ -1,7 +1,7 @@
 # PromptCraft - Puzzle Loader
 # Carga y gestión de puzzles
 
-from browser import ajax, window
+from browser import ajax
 import json
 
 # Cache de puzzles cargados
@@ -178,8 +178,7 @@ def get_puzzle_progress(puzzle_id, state):
     Returns:
         Dict con información de progreso
     """
-    puzzles_completed = state.data.get('puzzles_completed', {})
-    puzzle_info = puzzles_completed.get(puzzle_id, {})
+    puzzle_info = state.get('progress.puzzles_solved', {}).get(puzzle_id, {})
 
     return {
         'solved': puzzle_info.get('solved', False),
@@ -198,29 +197,14 @@ def mark_puzzle_solved(puzzle_id, result, state):
         result: Resultado de la resolución
         state: Estado de la aplicación
     """
-    if 'puzzles_completed' not in state.data:
-        state.data['puzzles_completed'] = {}
-
-    current = state.data['puzzles_completed'].get(puzzle_id, {})
-
-    # Actualizar solo si es mejor resultado
-    best_time = current.get('best_time')
-    if best_time is None or result['time'] < best_time:
-        current['best_time'] = result['time']
-
-    best_stars = current.get('best_stars', 0)
-    if result['stars'] > best_stars:
-        current['best_stars'] = result['stars']
-
-    current['solved'] = True
-    current['attempts'] = current.get('attempts', 0) + 1
-    current['last_solved'] = str(window.Date.new())
-
-    state.data['puzzles_completed'][puzzle_id] = current
-    state.save()
-
-    # Añadir XP
-    state.add_xp(result['xp'], f"Puzzle: {puzzle_id}")
+    with state.transaction():
+        # Actualiza solo si es mejor resultado
+        current, is_new = state.record_puzzle_result(
+            puzzle_id, result['stars'], result['time'], result.get('hints_used', 0)
+        )
+
+        # Añadir XP
+        state.add_xp(result['xp'], f"Puzzle: {puzzle_id}")
 
     return current
 
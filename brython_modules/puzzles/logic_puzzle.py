@@ -19,6 +19,7 @@ class LogicPuzzle(Component):
     Props:
         puzzle_data: Datos del puzzle
         on_complete: Callback al completar
+        on_hint: Callback(número de pista) al revelar una pista
         on_exit: Callback al salir
     """
 
@@ -210,6 +211,9 @@ class LogicPuzzle(Component):
     def _on_hint_reveal(self, hint_num, hint_text):
         """Callback cuando se revela una pista."""
         self.engine.hints_used = hint_num
+        on_hint = self.props.get('on_hint')
+        if on_hint:
+            on_hint(hint_num)
 
     def _on_undo(self):
         """Deshace el último movimiento."""
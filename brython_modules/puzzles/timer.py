@@ -1,7 +1,7 @@
 # PromptCraft - Puzzle Timer
 # Componente de cronómetro para puzzles
 
-from browser import document, html, timer as browser_timer
+from browser import document, html
 from ..components.base import Component
 
 
@@ -89,7 +89,7 @@ class PuzzleTimer(Component):
             return
 
         self.is_running = True
-        self._interval_id = browser_timer.set_interval(self._tick, 1000)
+        self._interval_id = self.set_interval(self._tick, 1000)
 
     def stop(self):
         """Detiene el cronómetro."""
@@ -98,7 +98,7 @@ class PuzzleTimer(Component):
 
         self.is_running = False
         if self._interval_id:
-            browser_timer.clear_interval(self._interval_id)
+            self.clear_interval(self._interval_id)
             self._interval_id = None
 
     def reset(self):
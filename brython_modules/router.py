@@ -2,6 +2,7 @@
 # Sistema de navegación SPA basado en hash
 
 from browser import window, document, html
+from .components.lifecycle import get_lifecycle
 
 class Router:
     """
@@ -147,6 +148,12 @@ class Router:
             print(f"Error: Container '{self.container_id}' not found")
             return
 
+        # Desmontar el árbol de componentes de la página anterior
+        # (on_unmount, intervals y listeners) antes de limpiar el contenedor
+        lifecycle = get_lifecycle()
+        lifecycle.teardown_scope()
+        lifecycle.begin_scope(route_path or hash_str)
+
         # Limpiar contenedor
         container.innerHTML = ""
 
@@ -0,0 +1,191 @@
+# PromptCraft - Render Scheduler
+# Agrupa los re-renders de un evento en un solo frame de animación
+
+from browser import window, timer, console
+
+
+class RenderScheduler:
+    """
+    Planificador de renders por frame.
+
+    Los componentes (y callbacks de render con clave) se marcan como
+    "sucios" y se renderizan una sola vez en el siguiente
+    requestAnimationFrame, en orden padre -> hijo y sin duplicados.
+
+    Uso:
+        scheduler = get_scheduler()
+        scheduler.schedule_component(component)
+        scheduler.schedule('navbar', render_navbar)
+        scheduler.flush_sync()  # Forzar render inmediato (tests/debug)
+    """
+
+    def __init__(self):
+        self._jobs = {}
+        self._order = 0
+        self._frame_id = None
+        self._flushing = False
+        self.stats = {
+            'scheduled': 0,
+            'coalesced': 0,
+            'renders': 0,
+            'skipped': 0,
+            'frames': 0,
+        }
+
+    def schedule(self, key, callback, depth=0):
+        """
+        Marca un callback de render como pendiente.
+
+        Args:
+            key: Clave de deduplicación (misma clave = un solo render)
+            callback: Función sin argumentos que realiza el render
+            depth: Profundidad para ordenar (menor = antes)
+        """
+        self.stats['scheduled'] += 1
+        if key in self._jobs:
+            # Ya pendiente: conservar la posición original y el último callback
+            self.stats['coalesced'] += 1
+            self._jobs[key]['callback'] = callback
+            return
+
+        self._order += 1
+        self._jobs[key] = {
+            'callback': callback,
+            'component': None,
+            'depth': depth,
+            'order': self._order,
+        }
+        self._request_frame()
+
+    def schedule_component(self, component):
+        """Marca un componente como sucio para re-renderizarlo."""
+        key = id(component)
+        self.schedule(key, component.render_now)
+        self._jobs[key]['component'] = component
+
+    def cancel(self, key):
+        """Cancela un render pendiente."""
+        self._jobs.pop(key, None)
+
+    def cancel_component(self, component):
+        """Cancela el render pendiente de un componente."""
+        self.cancel(id(component))
+
+    def is_pending(self, key):
+        """Indica si hay un render pendiente para la clave."""
+        return key in self._jobs
+
+    def has_pending(self):
+        """Indica si hay renders pendientes."""
+        return bool(self._jobs)
+
+    def flush_sync(self):
+        """Ejecuta inmediatamente todos los renders pendientes."""
+        if self._frame_id is not None:
+            self._cancel_frame()
+        self._flush()
+
+    def _request_frame(self):
+        """Solicita un frame si no hay uno pendiente."""
+        if self._frame_id is not None or self._flushing:
+            return
+
+        if hasattr(window, 'requestAnimationFrame'):
+            self._frame_id = ('raf', window.requestAnimationFrame(self._on_frame))
+        else:
+            self._frame_id = ('timeout', timer.set_timeout(lambda: self._on_frame(None), 16))
+
+    def _cancel_frame(self):
+        """Cancela el frame solicitado."""
+        kind, frame_id = self._frame_id
+        if kind == 'raf':
+            window.cancelAnimationFrame(frame_id)
+        else:
+            timer.clear_timeout(frame_id)
+        self._frame_id = None
+
+    def _on_frame(self, timestamp):
+        """Callback de requestAnimationFrame."""
+        self._frame_id = None
+        self._flush()
+
+    def _flush(self):
+        """Renderiza los trabajos pendientes en orden padre -> hijo."""
+        if not self._jobs or self._flushing:
+            return
+
+        jobs = list(self._jobs.values())
+        self._jobs = {}
+        self._flushing = True
+        self.stats['frames'] += 1
+
+        for job in jobs:
+            component = job['component']
+            if component is not None:
+                job['depth'] = _dom_depth(component.element)
+
+        jobs.sort(key=lambda j: (j['depth'], j['order']))
+
+        # Elementos reemplazados en este frame: sus descendientes ya se
+        # re-renderizaron junto con el padre.
+        replaced = []
+
+        try:
+            for job in jobs:
+                component = job['component']
+                if component is not None and _is_inside(component.element, replaced):
+                    self.stats['skipped'] += 1
+                    continue
+
+                try:
+                    old_element = job['callback']()
+                    self.stats['renders'] += 1
+                    if component is not None and old_element is not None:
+                        replaced.append(old_element)
+                except Exception as e:
+                    console.log(f"[Scheduler] Render error: {e}")
+        finally:
+            self._flushing = False
+
+        # Renders solicitados durante el flush van al siguiente frame
+        if self._jobs:
+            self._request_frame()
+
+
+def _dom_depth(element):
+    """Calcula la profundidad de un elemento en el DOM."""
+    depth = 0
+    node = element.parentNode if element else None
+    while node:
+        depth += 1
+        node = node.parentNode
+    return depth
+
+
+def _is_inside(element, containers):
+    """Verifica si un elemento está dentro de alguno de los contenedores."""
+    if not element:
+        return False
+    for container in containers:
+        if container.contains(element):
+            return True
+    return False
+
+
+# Instancia global del scheduler
+_scheduler_instance = None
+
+def get_scheduler():
+    """Obtiene la instancia singleton del scheduler."""
+    global _scheduler_instance
+    if _scheduler_instance is None:
+        _scheduler_instance = RenderScheduler()
+    return _scheduler_instance
+
+def schedule_render(component):
+    """Atajo para marcar un componente como sucio."""
+    get_scheduler().schedule_component(component)
+
+def flush_sync():
+    """Atajo para forzar los renders pendientes."""
+    get_scheduler().flush_sync()
@@ -0,0 +1,80 @@
+# PromptCraft - State Selectors
+# Valores derivados del estado, cacheados por versión de slice
+
+
+class Selector:
+    """
+    Valor derivado del estado con caché invalidada por versiones.
+
+    Cada selector declara las rutas que lee. AppState incrementa la
+    versión de la clave de primer nivel en cada set() y save(key); el
+    selector solo recalcula si cambió la versión de alguna de sus rutas.
+    Releer un valor sin cambios es O(rutas declaradas).
+
+    Los valores retornados son compartidos: no deben mutarse.
+
+    Args:
+        func: Función (owner, *args) -> valor. owner es el AppState o un
+            objeto con atributo .state (managers)
+        paths: Rutas con punto que lee la función
+    """
+
+    def __init__(self, func, paths):
+        self.func = func
+        self.paths = tuple(paths)
+        self.name = func.__name__
+        self._cache = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, owner, *args):
+        state = getattr(owner, 'state', owner)
+        stamp = state.stamp(self.paths)
+        key = (id(state), args)
+
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] == stamp:
+            self.hits += 1
+            return cached[1]
+
+        self.misses += 1
+        value = self.func(owner, *args)
+        self._cache[key] = (stamp, value)
+        return value
+
+    def __get__(self, owner, owner_type=None):
+        # Permite usar @selector sobre métodos
+        if owner is None:
+            return self
+        return lambda *args: self(owner, *args)
+
+    def clear(self):
+        """Vacía la caché del selector."""
+        self._cache.clear()
+
+
+_selectors = []
+
+
+def selector(*paths):
+    """
+    Decorador para declarar un selector.
+
+    Uso:
+        @selector('progress.xp', 'progress.level')
+        def get_xp_progress(self):
+            ...
+    """
+    def decorator(func):
+        sel = Selector(func, paths)
+        _selectors.append(sel)
+        return sel
+    return decorator
+
+
+def get_selector_stats():
+    """Aciertos y fallos de caché por selector (debug)."""
+    return {
+        sel.name: {'hits': sel.hits, 'misses': sel.misses, 'paths': list(sel.paths)}
+        for sel in _selectors
+    }
@@ -5,15 +5,29 @@ Sistema de estado global con persistencia en localStorage
 from browser import window, console
 from browser.local_storage import storage
 import json
-from datetime import datetime
+import copy
+from contextlib import contextmanager
+from datetime import datetime, date
+from .persistence import (
+    WriteBehindWriter, SliceStore, migrate, SCHEMA_VERSION, get_history_db,
+    TabSync, merge_value, MERGE_RULES,
+)
+from .subscriptions import SubscriptionTrie
+from .selectors import selector
+from .event_log import EventLog, empty_log, audit
+from .daily_ring import DailyRing, empty_ring
+from .activity_calendar import ActivityCalendar, empty_calendar
+from . import counters as progress_counters
 
 
 class AppState:
     """
     Estado global de la aplicación con persistencia en localStorage.
 
-    Estructura del estado:
+    Estructura del estado (ver persistence/migrations.py para versiones
+    anteriores):
     {
+        'schema_version': int,
         'user': {
             'id': str,
             'username': str,
@@ -23,7 +37,10 @@ class AppState:
             'xp': int,
             'level': int,
             'lessons_completed': [str],
-            'puzzles_solved': {puzzle_id: {stars, time, hints_used}},
+            'lessons_in_progress': {lesson_id: {started_at, current_section, progress}},
+            'lesson_exercises': {lesson_id: {completed, answer}},
+            'puzzles_solved': {puzzle_id: {best_stars, best_time, attempts,
+                                           solved, hints_used, last_solved}},
             'exercises_completed': [str]
         },
         'streak': {
@@ -44,7 +61,15 @@ class AppState:
             'puzzles_attempted': int,
             'hints_used_total': int,
             'perfect_puzzles': int
-        }
+        },
+        'event_log': {seq, snapshot, tail}  (ver event_log.py),
+        'xp_daily': {day, totals}  (XP por día, ver daily_ring.py),
+        'activity_calendar': {active, frozen, days}  (días activos como bitset,
+                                               ver activity_calendar.py),
+        'counters': {puzzles_solved, three_star, no_hint, fastest_time,
+                     lessons_completed, *_by_category}  (ver counters.py),
+        'achievements': {unlocked: {id: fecha}, windows: {clave: [ms]}}
+                        (ver gamification/achievement_engine.py)
     }
     """
 
@@ -69,15 +94,31 @@ class AppState:
 
     def __init__(self):
         self._state = self._get_default_state()
-        self._listeners = []
+        self._subscriptions = SubscriptionTrie()
         self._badge_listeners = []
+        self._txn = None
+        self._versions = {}
+        self._epoch = 0
+        self._quota_warned = False
+        self._events = None
+        self._sync_keys = set()
+        self._sync_events = []
+        self._applying_remote = False
+        self._seen_remote = set()
+        self._counter_updates = 0
+        self._slices = SliceStore(storage, self.STORAGE_KEY, on_quota=self._on_quota)
+        self._writer = WriteBehindWriter(self._write)
+        self._writer.install()
+        self._sync = TabSync(self._on_remote_delta, storage)
         self.load()
+        self._sync.install()
 
     @property
     def data(self):
         """Acceso al estado interno."""
         return self._state
 
+    @selector('progress')
     def get_level_info(self):
         """Obtiene información del nivel actual para el navbar y páginas."""
         xp_progress = self.get_xp_progress()
@@ -95,6 +136,7 @@ class AppState:
     def _get_default_state(self):
         """Estado por defecto para nuevos usuarios"""
         return {
+            'schema_version': SCHEMA_VERSION,
             'user': {
                 'id': self._generate_id(),
                 'username': 'Usuario',
@@ -104,6 +146,8 @@ class AppState:
                 'xp': 0,
                 'level': 1,
                 'lessons_completed': [],
+                'lessons_in_progress': {},
+                'lesson_exercises': {},
                 'puzzles_solved': {},
                 'exercises_completed': []
             },
@@ -125,7 +169,12 @@ class AppState:
                 'puzzles_attempted': 0,
                 'hints_used_total': 0,
                 'perfect_puzzles': 0
-            }
+            },
+            'event_log': empty_log(),
+            'xp_daily': empty_ring(),
+            'activity_calendar': empty_calendar(),
+            'counters': progress_counters.empty_counters(),
+            'achievements': {'unlocked': {}, 'windows': {}}
         }
 
     def _generate_id(self):
@@ -135,60 +184,201 @@ class AppState:
         return ''.join(random.choice(chars) for _ in range(12))
 
     def load(self):
-        """Cargar estado desde localStorage"""
+        """Cargar estado desde localStorage (slices)"""
+        loaded_state = None
+        seeded_log = False
+        applied = []
         try:
-            saved = storage.get(self.STORAGE_KEY)
-            if saved:
-                loaded_state = json.loads(saved)
-                # Merge con defaults para manejar nuevos campos
-                self._state = self._merge_with_defaults(loaded_state)
+            loaded_state = self._slices.load()
+            if loaded_state:
+                seeded_log = 'event_log' not in loaded_state
+                # Solo migra si el esquema guardado es anterior al actual
+                self._state, applied = migrate(loaded_state, self._get_default_state())
+                self._epoch += 1
+                if applied:
+                    # Todos los slices, incluido misc (schema_version): las
+                    # migraciones no deben volver a aplicarse en la próxima carga
+                    progress = self._state['progress']
+                    progress['level'] = self._calculate_level(progress['xp'])
+                    self.save()
+                    self.save_now()
                 console.log(f"[State] Loaded: {self._state['progress']['xp']} XP, Level {self._state['progress']['level']}")
             else:
+                # Perfil nuevo: se guarda completo (user, preferences y misc
+                # no se marcan sucios hasta que cambian)
+                self.save()
+                self.save_now()
                 console.log("[State] No saved state found, using defaults")
+
+            # Historiales completos: IndexedDB (copia única de los antiguos)
+            get_history_db().import_legacy(storage, self._state)
         except Exception as e:
             console.log(f"[State] Error loading: {e}")
 
-    def _merge_with_defaults(self, loaded):
-        """Merge estado cargado con defaults para manejar nuevos campos"""
-        defaults = self._get_default_state()
-
-        def deep_merge(base, override):
-            result = base.copy()
-            for key, value in override.items():
-                if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                    result[key] = deep_merge(result[key], value)
-                else:
-                    result[key] = value
-            return result
+        self._attach_event_log()
+        if loaded_state and 3 in applied and seeded_log:
+            self._events.archive_tail()
+
+    def _attach_event_log(self):
+        """Reconstruir los agregados del log: snapshot + cola"""
+        self._events = EventLog(self._state.setdefault('event_log', empty_log()), origin=self._sync.tab_id)
 
-        return deep_merge(defaults, loaded)
+        if self._events.missing_reducers():
+            # Un agregado nuevo necesita el log completo
+            def on_rebuilt(aggregates):
+                self.save('event_log')
 
-    def save(self):
-        """Guardar estado en localStorage"""
+            self._events.rebuild(on_rebuilt)
+
+    def save(self, *keys):
+        """
+        Marcar el estado para guardarse en localStorage.
+        La escritura es diferida: varias llamadas en el mismo periodo
+        producen una sola serialización (ver persistence/write_behind.py).
+
+        Args:
+            *keys: Claves modificadas (p. ej. 'streak', 'progress.xp');
+                solo se re-serializan sus slices. Sin claves se guarda todo.
+
+        Dentro de una transacción la escritura se pospone al commit, y las
+        claves indicadas se incluyen en el conjunto de cambios notificado.
+        """
+        if keys:
+            self._touch(*keys)
+        else:
+            self._epoch += 1
+
+        if self._txn is not None:
+            if keys:
+                self.stage(*keys)
+                self._txn['keys'].update(keys)
+                for key in keys:
+                    self._stage_change(key, self.get(key), self._original(key))
+            else:
+                self._txn['save_all'] = True
+            return
+        self._writer.mark_dirty(*keys)
+
+    def save_now(self):
+        """Guardar inmediatamente los cambios pendientes"""
+        self._writer.flush()
+
+    def _write(self, keys):
+        """Escribir en localStorage los slices afectados por las claves"""
         try:
-            storage[self.STORAGE_KEY] = json.dumps(self._state)
+            self._slices.write(self._state, keys)
         except Exception as e:
             console.log(f"[State] Error saving: {e}")
+        self._publish_delta()
+
+    # =========================================================================
+    # CROSS-TAB SYNC
+    # =========================================================================
+
+    def _publish_delta(self):
+        """Enviar a otras pestañas las claves cambiadas aquí y los eventos nuevos"""
+        if not self._sync_keys and not self._sync_events:
+            return
+
+        values = {
+            key: self._state[key] for key in self._sync_keys
+            if key in self._state and MERGE_RULES.get(key) != 'local'
+        }
+        events = self._sync_events
+        self._sync_keys = set()
+        self._sync_events = []
+        self._sync.publish({'values': values, 'events': events})
+
+    def _on_remote_delta(self, message):
+        """
+        Combinar un delta de otra pestaña con reglas por campo
+        (persistence/merge.py). La XP se suma por id de evento: cada
+        xp_awarded remoto se aplica una sola vez.
+        """
+        tab = message.get('tab')
+        self._applying_remote = True
+        try:
+            with self.transaction():
+                for event in message.get('events', []):
+                    event_id = (tab, event.get('seq'))
+                    if event_id in self._seen_remote:
+                        continue
+                    self._seen_remote.add(event_id)
+
+                    if event.get('type') == 'xp_awarded':
+                        self.set('progress.xp', self.get('progress.xp', 0) + event.get('amount', 0), save=False)
+                        self._add_daily_xp(event.get('amount', 0))
+
+                    payload = {k: v for k, v in event.items() if k not in ('seq', 'type', 'ts')}
+                    payload['origin'] = tab
+                    self.record_event(event['type'], **payload)
+
+                for key, value in message.get('values', {}).items():
+                    current = self._state.get(key)
+                    merged = merge_value(key, current, value)
+                    if merged != current:
+                        self.set(key, merged, save=False)
+
+                level = max(self.get('progress.level', 1), self._calculate_level(self.get('progress.xp', 0)))
+                if level != self.get('progress.level', 1):
+                    self.set('progress.level', level, save=False)
+        finally:
+            self._applying_remote = False
+
+    def _on_quota(self, slice_name):
+        """
+        Liberar espacio cuando localStorage excede la cuota: recorta a la
+        mitad los historiales más largos (la copia completa vive en
+        IndexedDB, ver persistence/history_db.py).
+
+        Returns:
+            bool: True si se liberó espacio (el slice se reintenta)
+        """
+        trimmed = []
+        for key in ('xp_history', 'activity_history'):
+            history = self._state.get(key)
+            if isinstance(history, list) and len(history) > 10:
+                self._state[key] = history[len(history) // 2:]
+                trimmed.append(key)
+
+        if trimmed:
+            self._touch(*trimmed)
+            if slice_name not in trimmed:
+                self._slices.write(self._state, trimmed)
+
+        if not self._quota_warned:
+            self._quota_warned = True
+            from .components.toast import warning
+            warning("El almacenamiento local está lleno; se recortó el historial antiguo.")
+
+        return bool(trimmed)
+
+    def get_persistence_stats(self):
+        """Contadores de escrituras realizadas y evitadas (debug)"""
+        stats = self._writer.get_stats()
+        stats.update(self._slices.stats)
+        stats['usage'] = self._slices.usage()
+        stats['sync'] = dict(self._sync.stats, transport=self._sync.transport)
+        return stats
 
     def get(self, key, default=None):
         """
         Obtener un valor del estado usando notación de punto.
         Ejemplo: state.get('progress.xp')
         """
-        keys = key.split('.')
-        value = self._state
-        for k in keys:
-            if isinstance(value, dict) and k in value:
-                value = value[k]
-            else:
-                return default
-        return value
+        return _lookup(self._state, key, default)
 
     def set(self, key, value, save=True):
         """
         Establecer un valor en el estado.
         Ejemplo: state.set('progress.xp', 100)
+
+        Dentro de transaction() el cambio se acumula y se notifica y
+        persiste al cerrar la transacción (save se ignora).
         """
+        if self._txn is not None:
+            self.stage(key)
+
         keys = key.split('.')
         target = self._state
         for k in keys[:-1]:
@@ -198,32 +388,243 @@ class AppState:
 
         old_value = target.get(keys[-1])
         target[keys[-1]] = value
+        self._touch(key)
+
+        if self._txn is not None:
+            # Se escribe y notifica una sola vez al cerrar la transacción
+            self._txn['keys'].add(key)
+            self._stage_change(key, value, old_value)
+            return
 
         if save:
-            self.save()
+            self.save(key)
+        else:
+            # Sin programar escritura, pero el slice queda marcado
+            self._writer.note(key)
+
+        self._notify_listeners({key: (value, old_value)})
+
+    @contextmanager
+    def transaction(self):
+        """
+        Agrupa varias escrituras en una unidad atómica.
+
+        Dentro del bloque, set() y save() aplican los cambios pero no
+        notifican ni persisten. Al salir se notifica una vez a los
+        listeners con todos los cambios y se persiste una vez. Si ocurre
+        una excepción, las rutas tocadas vuelven a su valor inicial (ver
+        stage()) y se descartan los eventos y efectos pendientes.
+        Las transacciones anidadas se unen a la exterior.
+
+        Uso:
+            with state.transaction():
+                state.set('progress.xp', 100)
+                state.set('progress.level', 2)
+        """
+        if self._txn is not None:
+            yield self
+            return
+
+        self._txn = {
+            'undo': {},
+            'changes': {},
+            'keys': set(),
+            'save_all': False,
+            'events': [],
+            'effects': [],
+        }
+        try:
+            yield self
+        except Exception:
+            undo = self._txn['undo']
+            self._txn = None
+            for path, (existed, value) in reversed(list(undo.items())):
+                _assign(self._state, path, existed, value)
+            self._epoch += 1
+            if any(path.split('.', 1)[0] == 'event_log' for path in undo):
+                self._attach_event_log()
+            console.log("[State] Transaction rolled back")
+            raise
+
+        txn = self._txn
+        self._txn = None
+
+        # Los eventos solo se registran si la transacción se confirma
+        for event_type, payload in txn['events']:
+            self._append_event(event_type, payload)
+        if txn['events']:
+            self._touch('event_log')
+            txn['keys'].add('event_log')
+
+        for effect in txn['effects']:
+            self._run_effect(effect)
+
+        if txn['save_all']:
+            self._writer.mark_dirty()
+        elif txn['keys']:
+            self._writer.mark_dirty(*txn['keys'])
+
+        if txn['changes']:
+            self._notify_listeners(txn['changes'])
+
+    def stage(self, *keys):
+        """
+        Copiar el valor actual de las rutas antes de modificarlas en sitio.
+
+        Dentro de una transacción solo se copian las rutas tocadas (la
+        primera vez), no todo el estado; el rollback restaura esas
+        copias. set() y save() lo hacen solos, pero quien modifique un
+        valor en sitio (append, del, setdefault...) debe llamar antes a
+        stage(). Fuera de una transacción no hace nada.
+
+        Ejemplo:
+            state.stage('badges')
+            state.data['badges'].append('first_lesson')
+            state.save('badges')
+        """
+        if self._txn is None:
+            return
+        undo = self._txn['undo']
+        for key in keys:
+            parts = key.split('.')
+            value = self._state
+            for depth, k in enumerate(parts, 1):
+                path = '.'.join(parts[:depth])
+                if path in undo:
+                    break
+                if not isinstance(value, dict) or k not in value:
+                    undo[path] = (False, None)
+                    break
+                value = value[k]
+                if depth == len(parts):
+                    value = copy.deepcopy(value)
+                    # Las rutas internas ya copiadas guardan su valor original
+                    for inner, (existed, original) in list(undo.items()):
+                        if inner.startswith(path + '.'):
+                            _assign(value, inner[len(path) + 1:], existed, original)
+                    undo[path] = (True, value)
+
+    def _original(self, key):
+        """Valor de una ruta al abrir la transacción"""
+        undo = self._txn['undo']
+        parts = key.split('.')
+        for depth in range(1, len(parts) + 1):
+            path = '.'.join(parts[:depth])
+            if path in undo:
+                existed, value = undo[path]
+                if not existed:
+                    return None
+                rest = '.'.join(parts[depth:])
+                return _lookup(value, rest) if rest else value
+        return self.get(key)
+
+    def after_commit(self, callback):
+        """
+        Ejecutar un efecto externo (IndexedDB, ranking...) solo si la
+        transacción se confirma; en un rollback se descarta. Fuera de una
+        transacción se ejecuta de inmediato.
+        """
+        if self._txn is not None:
+            self._txn['effects'].append(callback)
+            return
+        self._run_effect(callback)
+
+    def _run_effect(self, callback):
+        try:
+            callback()
+        except Exception as e:
+            console.log(f"[State] After-commit effect error: {e}")
 
-        self._notify_listeners(key, value, old_value)
+    # =========================================================================
+    # EVENT LOG
+    # =========================================================================
+
+    def record_event(self, event_type, **payload):
+        """
+        Registrar una actividad en el log de eventos (event_log.py).
+        Dentro de una transacción se registra al confirmarla.
 
-    def subscribe(self, callback):
+        Ejemplo: state.record_event('hint_used', puzzle_id='p1', hint=2)
+        """
+        if self._txn is not None:
+            self._txn['events'].append((event_type, payload))
+            return
+        self._append_event(event_type, payload)
+        self.save('event_log')
+
+    def _append_event(self, event_type, payload):
+        """Añadir al log; los eventos locales se envían a otras pestañas"""
+        event = self._events.append(event_type, **payload)
+        if not self._applying_remote:
+            self._sync_events.append(event)
+
+    def get_aggregate(self, name, default=None):
+        """Valor derivado del log de eventos (ver reducers en event_log.py)"""
+        return self._events.get(name, default)
+
+    def audit_progress(self):
+        """
+        Comparar los agregados del log con los contadores del estado.
+
+        Returns:
+            dict {nombre: (valor_log, valor_estado)} con las diferencias
+        """
+        differences = audit(self._events, self._state)
+        if differences:
+            console.log(f"[State] Progress audit differences: {differences}")
+        return differences
+
+    def in_transaction(self):
+        """Indica si hay una transacción abierta"""
+        return self._txn is not None
+
+    def _stage_change(self, key, new_value, old_value):
+        """Registrar un cambio en la transacción (conserva el valor original)"""
+        changes = self._txn['changes']
+        if key in changes:
+            old_value = changes[key][1]
+        changes[key] = (new_value, old_value)
+
+    def version(self, key):
+        """Versión de la clave de primer nivel de una ruta"""
+        return self._versions.get(key.split('.', 1)[0], 0)
+
+    def stamp(self, paths):
+        """Sello de versión de un conjunto de rutas (para selectores)"""
+        return (self._epoch,) + tuple(self.version(path) for path in paths)
+
+    def _touch(self, *keys):
+        """Incrementar la versión de las claves modificadas"""
+        for key in keys:
+            top = key.split('.', 1)[0]
+            self._versions[top] = self._versions.get(top, 0) + 1
+            if not self._applying_remote:
+                self._sync_keys.add(top)
+
+    def subscribe(self, callback, path=None):
         """
         Suscribirse a cambios de estado.
-        El callback recibe (key, new_value, old_value)
+        El callback recibe un dict {key: (new_value, old_value)} con
+        los cambios que afectan a la ruta (uno por set() o por transacción).
+
+        Args:
+            callback: Función que recibe el dict de cambios
+            path: Ruta con punto ('progress.xp', 'streak.*'); None = todo.
+                También despiertan los cambios en ancestros y descendientes.
+
+        Returns:
+            Función para cancelar la suscripción
         """
-        self._listeners.append(callback)
-        return lambda: self._listeners.remove(callback)
+        return self._subscriptions.add(callback, path)
 
     def subscribe_badges(self, callback):
         """Suscribirse específicamente a nuevos badges"""
         self._badge_listeners.append(callback)
         return lambda: self._badge_listeners.remove(callback)
 
-    def _notify_listeners(self, key, new_value, old_value):
-        """Notificar a los listeners sobre cambios"""
-        for callback in self._listeners:
-            try:
-                callback(key, new_value, old_value)
-            except Exception as e:
-                console.log(f"[State] Listener error: {e}")
+    def _notify_listeners(self, changes):
+        """Notificar a los listeners afectados por los cambios"""
+        self._subscriptions.dispatch(changes)
 
     def _notify_badge_listeners(self, badge_id):
         """Notificar sobre nuevo badge"""
@@ -250,32 +651,54 @@ class AppState:
                 'level_title': str
             }
         """
-        current_xp = self.get('progress.xp', 0)
-        current_level = self.get('progress.level', 1)
-
-        new_xp = current_xp + amount
-        new_level = self._calculate_level(new_xp)
+        with self.transaction():
+            current_xp = self.get('progress.xp', 0)
+            current_level = self.get('progress.level', 1)
+
+            new_xp = current_xp + amount
+            new_level = self._calculate_level(new_xp)
+
+            self.set('progress.xp', new_xp, save=False)
+            self._add_daily_xp(amount)
+            self.record_event('xp_awarded', amount=amount, reason=reason)
+
+            result = {
+                'xp_gained': amount,
+                'total_xp': new_xp,
+                'level_up': False,
+                'new_level': new_level,
+                'level_title': self.get_level_title(new_level),
+                'reason': reason
+            }
 
-        self.set('progress.xp', new_xp, save=False)
+            if new_level > current_level:
+                self.set('progress.level', new_level, save=False)
+                result['level_up'] = True
+                console.log(f"[State] Level up! {current_level} -> {new_level}")
 
-        result = {
-            'xp_gained': amount,
-            'total_xp': new_xp,
-            'level_up': False,
-            'new_level': new_level,
-            'level_title': self.get_level_title(new_level),
-            'reason': reason
-        }
+            console.log(f"[State] +{amount} XP ({reason}). Total: {new_xp}")
 
-        if new_level > current_level:
-            self.set('progress.level', new_level, save=False)
-            result['level_up'] = True
-            console.log(f"[State] Level up! {current_level} -> {new_level}")
+            return result
 
-        self.save()
-        console.log(f"[State] +{amount} XP ({reason}). Total: {new_xp}")
+    def _add_daily_xp(self, amount):
+        """Sumar XP al total del día (buffer circular)"""
+        self.stage('xp_daily')
+        DailyRing(self._state.setdefault('xp_daily', empty_ring())).add(amount)
+        self.save('xp_daily')
 
-        return result
+    def get_xp_totals(self):
+        """
+        XP de hoy, de los últimos 7 y 30 días y promedio diario semanal.
+        Exacto sin importar cuántos eventos hubo (O(días)).
+        """
+        ring = DailyRing(self._state.setdefault('xp_daily', empty_ring()))
+        this_week = ring.total(7)
+        return {
+            'today': ring.total(1),
+            'this_week': this_week,
+            'this_month': ring.total(30),
+            'average_daily': this_week // 7,
+        }
 
     def _calculate_level(self, xp):
         """Calcular nivel basado en XP total"""
@@ -291,6 +714,7 @@ class AppState:
         index = min(level - 1, len(self.LEVEL_TITLES) - 1)
         return self.LEVEL_TITLES[index]
 
+    @selector('progress')
     def get_xp_progress(self):
         """
         Obtener progreso de XP hacia el siguiente nivel.
@@ -341,76 +765,99 @@ class AppState:
     # STREAK SYSTEM
     # =========================================================================
 
+    def get_activity_calendar(self):
+        """Calendario de días activos (bitset, ver activity_calendar.py)"""
+        return ActivityCalendar(self._state.setdefault('activity_calendar', empty_calendar()))
+
+    def mark_active_day(self, day=None):
+        """
+        Marcar un día (ordinal; por defecto hoy) como activo.
+
+        Returns:
+            bool: True si el día no estaba marcado
+        """
+        day = date.today().toordinal() if day is None else day
+        self.stage('activity_calendar')
+        if not self.get_activity_calendar().mark(day):
+            return False
+        entry = {'date': date.fromordinal(day).isoformat()}
+        self.after_commit(lambda: get_history_db().append('activity', entry, 'activity'))
+        self.save('activity_calendar')
+        return True
+
     def update_streak(self):
         """
         Actualizar streak basado en la fecha actual.
         Debe llamarse cuando el usuario completa una actividad.
 
+        El día se marca en el calendario de actividad y la racha se
+        calcula desde sus bits; streak.current/longest son una copia
+        para lecturas rápidas.
+
         Returns:
             dict: {
                 'current': int,
                 'increased': bool,
                 'freeze_used': bool,
-                'lost': bool
+                'lost': bool,
+                'already_recorded': bool
             }
         """
-        today = datetime.now().strftime('%Y-%m-%d')
-        last_date = self.get('streak.last_date')
-        current = self.get('streak.current', 0)
-        longest = self.get('streak.longest', 0)
-        freezes = self.get('streak.freezes_available', 2)
-
-        result = {
-            'current': current,
-            'increased': False,
-            'freeze_used': False,
-            'lost': False
-        }
-
-        if last_date == today:
-            # Ya se registró actividad hoy
-            return result
-
-        if last_date is None:
-            # Primera actividad
-            new_streak = 1
-            result['increased'] = True
-        else:
-            last = datetime.strptime(last_date, '%Y-%m-%d')
-            today_dt = datetime.strptime(today, '%Y-%m-%d')
-            diff_days = (today_dt - last).days
-
-            if diff_days == 1:
-                # Día consecutivo
-                new_streak = current + 1
-                result['increased'] = True
-            elif diff_days == 2 and freezes > 0:
-                # Usar freeze
-                new_streak = current + 1
-                self.set('streak.freezes_available', freezes - 1, save=False)
-                self.set('streak.freezes_used', self.get('streak.freezes_used', 0) + 1, save=False)
-                result['increased'] = True
-                result['freeze_used'] = True
-            else:
-                # Streak perdido
-                new_streak = 1
-                result['lost'] = True if current > 0 else False
-
-        result['current'] = new_streak
-        self.set('streak.current', new_streak, save=False)
-        self.set('streak.last_date', today, save=False)
-
-        if new_streak > longest:
-            self.set('streak.longest', new_streak, save=False)
+        with self.transaction():
+            today = date.today()
+            today_str = today.isoformat()
+            day = today.toordinal()
+            last_date = self.get('streak.last_date')
+            current = self.get('streak.current', 0)
+            longest = self.get('streak.longest', 0)
+            freezes = self.get('streak.freezes_available', 2)
+            calendar = self.get_activity_calendar()
+
+            result = {
+                'current': current,
+                'increased': False,
+                'freeze_used': False,
+                'lost': False,
+                'already_recorded': False
+            }
 
-        # Otorgar freeze cada 7 días
-        if new_streak > 0 and new_streak % 7 == 0:
-            current_freezes = self.get('streak.freezes_available', 0)
-            if current_freezes < 2:
-                self.set('streak.freezes_available', current_freezes + 1, save=False)
+            if last_date == today_str:
+                # Ya se registró actividad hoy
+                self.mark_active_day(day)
+                result['already_recorded'] = True
+                return result
+
+            if last_date is not None:
+                diff_days = day - datetime.strptime(last_date, '%Y-%m-%d').toordinal()
+                if diff_days == 2 and freezes > 0:
+                    # Usar freeze: el día perdido cuenta para la racha
+                    self.stage('activity_calendar')
+                    calendar.mark(day - 1, frozen=True)
+                    self.save('activity_calendar')
+                    self.set('streak.freezes_available', freezes - 1, save=False)
+                    self.set('streak.freezes_used', self.get('streak.freezes_used', 0) + 1, save=False)
+                    result['freeze_used'] = True
+
+            self.mark_active_day(day)
+            new_streak = calendar.run_ending(day)
+
+            result['increased'] = new_streak > current
+            result['lost'] = not result['increased'] and current > 0
+            result['current'] = new_streak
+            self.set('streak.current', new_streak, save=False)
+            self.set('streak.last_date', today_str, save=False)
+            self.record_event('active_day', date=today_str, streak=new_streak)
+
+            if new_streak > longest:
+                self.set('streak.longest', new_streak, save=False)
+
+            # Otorgar freeze cada 7 días
+            if new_streak > 0 and new_streak % 7 == 0:
+                current_freezes = self.get('streak.freezes_available', 0)
+                if current_freezes < 2:
+                    self.set('streak.freezes_available', current_freezes + 1, save=False)
 
-        self.save()
-        return result
+            return result
 
     # =========================================================================
     # PROGRESS TRACKING
@@ -423,24 +870,21 @@ class AppState:
         Returns:
             dict: Resultado de add_xp + info adicional
         """
-        completed = self.get('progress.lessons_completed', [])
-
-        if lesson_id in completed:
-            return {'already_completed': True, 'xp_gained': 0}
-
-        completed.append(lesson_id)
-        self.set('progress.lessons_completed', completed, save=False)
+        with self.transaction():
+            if not self.mark_lesson_completed(lesson_id):
+                return {'already_completed': True, 'xp_gained': 0}
+            completed = self.get('progress.lessons_completed', [])
 
-        result = self.add_xp(xp_earned, f"Lección: {lesson_id}")
-        result['already_completed'] = False
-        result['lesson_id'] = lesson_id
-        result['lessons_total'] = len(completed)
+            result = self.add_xp(xp_earned, f"Lección: {lesson_id}")
+            result['already_completed'] = False
+            result['lesson_id'] = lesson_id
+            result['lessons_total'] = len(completed)
 
-        # Actualizar streak
-        streak_result = self.update_streak()
-        result['streak'] = streak_result
+            # Actualizar streak
+            streak_result = self.update_streak()
+            result['streak'] = streak_result
 
-        return result
+            return result
 
     def solve_puzzle(self, puzzle_id, stars, time_seconds, hints_used, xp_earned):
         """
@@ -449,62 +893,141 @@ class AppState:
         Returns:
             dict: Resultado de add_xp + info adicional
         """
-        solved = self.get('progress.puzzles_solved', {})
-        stats = self.get('stats', {})
-
-        # Verificar si ya fue resuelto (solo contar mejor score)
-        is_new = puzzle_id not in solved
-        previous_stars = solved.get(puzzle_id, {}).get('stars', 0) if not is_new else 0
-
-        # Solo actualizar si es nuevo o mejor
-        if is_new or stars > previous_stars:
-            solved[puzzle_id] = {
-                'stars': stars,
-                'time': time_seconds,
-                'hints_used': hints_used,
-                'solved_at': datetime.now().isoformat()
-            }
-            self.set('progress.puzzles_solved', solved, save=False)
-
-        # Actualizar stats
-        stats['puzzles_attempted'] = stats.get('puzzles_attempted', 0) + 1
-        stats['hints_used_total'] = stats.get('hints_used_total', 0) + hints_used
-        if stars == 3 and hints_used == 0:
-            stats['perfect_puzzles'] = stats.get('perfect_puzzles', 0) + 1
-        self.set('stats', stats, save=False)
-
-        # Solo dar XP si es nuevo puzzle
-        if is_new:
-            result = self.add_xp(xp_earned, f"Puzzle: {puzzle_id}")
-        else:
-            result = {'xp_gained': 0, 'already_completed': True}
-            self.save()
+        with self.transaction():
+            # Intentos, pistas y puzzles perfectos salen del log de eventos
+            record, is_new = self.record_puzzle_result(puzzle_id, stars, time_seconds, hints_used)
+            solved = self.get('progress.puzzles_solved', {})
+
+            # Solo dar XP si es nuevo puzzle
+            if is_new:
+                result = self.add_xp(xp_earned, f"Puzzle: {puzzle_id}")
+            else:
+                result = {'xp_gained': 0, 'already_completed': True}
+
+            result['puzzle_id'] = puzzle_id
+            result['stars'] = stars
+            result['is_new'] = is_new
+            result['puzzles_total'] = len(solved)
+
+            # Actualizar streak
+            streak_result = self.update_streak()
+            result['streak'] = streak_result
+
+            return result
+
+    def mark_lesson_completed(self, lesson_id):
+        """
+        Registrar una lección en progress.lessons_completed (sin XP).
+
+        Returns:
+            bool: True si es nueva
+        """
+        completed = self.get('progress.lessons_completed', [])
+        if lesson_id in completed:
+            return False
 
-        result['puzzle_id'] = puzzle_id
-        result['stars'] = stars
-        result['is_new'] = is_new
-        result['puzzles_total'] = len(solved)
+        self.stage('progress.lessons_completed', 'counters')
+        completed.append(lesson_id)
+        self.set('progress.lessons_completed', completed)
+        progress_counters.count_lesson(self._counters(), lesson_id)
+        self._counters_changed()
+        self.record_event('lesson_completed', lesson_id=lesson_id)
+
+        in_progress = self.get('progress.lessons_in_progress', {})
+        if lesson_id in in_progress:
+            self.stage('progress.lessons_in_progress')
+            del in_progress[lesson_id]
+            self.set('progress.lessons_in_progress', in_progress)
+        return True
 
-        # Actualizar streak
-        streak_result = self.update_streak()
-        result['streak'] = streak_result
+    def record_puzzle_result(self, puzzle_id, stars, time_seconds, hints_used=0):
+        """
+        Registrar un intento resuelto en progress.puzzles_solved,
+        conservando la mejor marca (sin XP).
 
-        return result
+        Returns:
+            tuple: (registro del puzzle, True si es la primera vez)
+        """
+        # Solo se copia y se escribe el registro de este puzzle
+        record = self.get('progress.puzzles_solved', {}).get(puzzle_id)
+        is_new = record is None
+        if not is_new:
+            record = dict(record)
+        else:
+            record = {'best_stars': 0, 'best_time': None, 'attempts': 0,
+                      'category': progress_counters.puzzle_category(puzzle_id)}
+        before = progress_counters.puzzle_marks(record)
+
+        if stars > record.get('best_stars', 0):
+            record['best_stars'] = stars
+            record['hints_used'] = hints_used
+        if time_seconds and (not record.get('best_time') or time_seconds < record['best_time']):
+            record['best_time'] = time_seconds
+
+        if hints_used == 0:
+            record['no_hints'] = True
+        record['solved'] = True
+        record['attempts'] = record.get('attempts', 0) + 1
+        record['last_solved'] = datetime.now().isoformat()
+
+        self.set(f'progress.puzzles_solved.{puzzle_id}', record)
+        self.stage('counters')
+        progress_counters.count_puzzle(self._counters(), before, record, time_seconds)
+        self._counters_changed()
+        self.record_event('puzzle_solved', puzzle_id=puzzle_id, stars=stars,
+                          time=time_seconds, hints_used=hints_used)
+        return record, is_new
+
+    def _counters(self):
+        return self._state.setdefault('counters', progress_counters.empty_counters())
+
+    def _counters_changed(self):
+        """Guardar los contadores; cada CHECK_EVERY cambios se verifican"""
+        self.save('counters')
+        self._counter_updates += 1
+        if self._counter_updates >= progress_counters.CHECK_EVERY:
+            self.verify_counters()
+
+    def get_counters(self):
+        """
+        Contadores de progreso mantenidos por evento (ver counters.py):
+        leerlos es O(1) sin importar cuántos puzzles o lecciones haya.
+        """
+        return self._counters()
+
+    def verify_counters(self):
+        """
+        Recontar desde progress y corregir los contadores si difieren.
+
+        Returns:
+            dict {campo: (mantenido, real)} con las diferencias corregidas
+        """
+        self._counter_updates = 0
+        expected, differences = progress_counters.verify(self._counters(), self.get('progress', {}))
+        if differences:
+            console.log(f"[State] Counter differences fixed: {differences}")
+            self.stage('counters')
+            self._state['counters'] = expected
+            self.save('counters')
+        return differences
 
     def complete_exercise(self, exercise_id, xp_earned):
         """Marcar ejercicio como completado"""
-        completed = self.get('progress.exercises_completed', [])
+        with self.transaction():
+            completed = self.get('progress.exercises_completed', [])
 
-        if exercise_id in completed:
-            return {'already_completed': True, 'xp_gained': 0}
+            if exercise_id in completed:
+                return {'already_completed': True, 'xp_gained': 0}
 
-        completed.append(exercise_id)
-        self.set('progress.exercises_completed', completed, save=False)
+            self.stage('progress.exercises_completed')
+            completed.append(exercise_id)
+            self.set('progress.exercises_completed', completed, save=False)
+            self.record_event('exercise_completed', exercise_id=exercise_id)
 
-        result = self.add_xp(xp_earned, f"Ejercicio: {exercise_id}")
-        result['already_completed'] = False
+            result = self.add_xp(xp_earned, f"Ejercicio: {exercise_id}")
+            result['already_completed'] = False
 
-        return result
+            return result
 
     # =========================================================================
     # BADGES
@@ -522,8 +1045,10 @@ class AppState:
         if badge_id in badges:
             return False
 
+        self.stage('badges')
         badges.append(badge_id)
         self.set('badges', badges)
+        self.record_event('badge_unlocked', badge_id=badge_id)
 
         console.log(f"[State] Badge unlocked: {badge_id}")
         self._notify_badge_listeners(badge_id)
@@ -538,8 +1063,10 @@ class AppState:
     # STATISTICS
     # =========================================================================
 
+    @selector('progress', 'badges', 'streak', 'event_log')
     def get_stats(self):
         """Obtener estadísticas completas del usuario"""
+        puzzles = self.get_aggregate('puzzles', {})
         return {
             'xp': self.get('progress.xp', 0),
             'level': self.get('progress.level', 1),
@@ -550,8 +1077,9 @@ class AppState:
             'badges_earned': len(self.get('badges', [])),
             'current_streak': self.get('streak.current', 0),
             'longest_streak': self.get('streak.longest', 0),
-            'perfect_puzzles': self.get('stats.perfect_puzzles', 0),
-            'hints_used_total': self.get('stats.hints_used_total', 0),
+            'puzzles_attempted': puzzles.get('attempts', 0),
+            'perfect_puzzles': puzzles.get('perfect', 0),
+            'hints_used_total': puzzles.get('hints', 0),
             'xp_progress': self.get_xp_progress()
         }
 
@@ -567,7 +1095,9 @@ class AppState:
     def reset(self):
         """Resetear todo el estado (para debug/testing)"""
         self._state = self._get_default_state()
+        self._attach_event_log()
         self.save()
+        get_history_db().clear()
         console.log("[State] State reset to defaults")
 
     def export_state(self):
@@ -578,12 +1108,37 @@ class AppState:
         """Importar estado desde JSON string"""
         try:
             self._state = json.loads(json_string)
+            self._attach_event_log()
+            self.verify_counters()
             self.save()
             return True
         except:
             return False
 
 
+def _assign(tree, key, existed, value):
+    """Restaurar una ruta de un dict anidado (o quitarla si no existía)"""
+    parts = key.split('.')
+    parent = _lookup(tree, '.'.join(parts[:-1])) if len(parts) > 1 else tree
+    if not isinstance(parent, dict):
+        return
+    if existed:
+        parent[parts[-1]] = value
+    else:
+        parent.pop(parts[-1], None)
+
+
+def _lookup(tree, key, default=None):
+    """Obtener un valor de un dict anidado usando notación de punto"""
+    value = tree
+    for k in key.split('.'):
+        if isinstance(value, dict) and k in value:
+            value = value[k]
+        else:
+            return default
+    return value
+
+
 # Singleton global
 _state_instance = None
 
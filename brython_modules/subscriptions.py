@@ -0,0 +1,125 @@
+# PromptCraft - State Subscriptions
+# Índice de suscripciones por ruta (trie sobre segmentos con punto)
+
+from browser import console
+
+
+WILDCARD = '*'
+
+
+class _Node:
+    """Nodo del trie: hijos por segmento y listeners suscritos aquí."""
+
+    __slots__ = ('children', 'listeners')
+
+    def __init__(self):
+        self.children = {}
+        self.listeners = []
+
+
+class SubscriptionTrie:
+    """
+    Suscripciones a cambios de estado indexadas por ruta.
+
+    Un listener suscrito a 'progress.xp' despierta cuando cambia esa
+    ruta, algo debajo de ella ('progress.xp.total') o un ancestro que la
+    reemplaza ('progress'). '*' coincide con un segmento cualquiera:
+    'streak.*' equivale a todo lo que hay bajo 'streak', y
+    'stats.*.total' a 'total' en cualquier categoría. Sin ruta, el
+    listener recibe todos los cambios.
+
+    El coste de despachar un cambio es proporcional a la profundidad de
+    la ruta (más el subárbol afectado), no al total de listeners.
+    """
+
+    def __init__(self):
+        self._root = _Node()
+        self._seq = 0
+        self.size = 0
+
+    def add(self, callback, path=None):
+        """
+        Registra un listener.
+
+        Returns:
+            Función que cancela la suscripción
+        """
+        node = self._root
+        for segment in _segments(path):
+            node = node.children.setdefault(segment, _Node())
+
+        self._seq += 1
+        entry = (self._seq, callback)
+        node.listeners.append(entry)
+        self.size += 1
+
+        def unsubscribe():
+            if entry in node.listeners:
+                node.listeners.remove(entry)
+                self.size -= 1
+
+        return unsubscribe
+
+    def match(self, path):
+        """Entradas (seq, callback) afectadas por un cambio en la ruta."""
+        matched = []
+        self._match(self._root, _segments(path), 0, matched)
+        return matched
+
+    def _match(self, node, segments, index, matched):
+        # Suscritos en un ancestro (o en la misma ruta) del cambio
+        matched.extend(node.listeners)
+
+        if index == len(segments):
+            # Cambio en un ancestro: despierta todo el subárbol suscrito
+            for child in node.children.values():
+                _collect(child, matched)
+            return
+
+        segment = segments[index]
+        child = node.children.get(segment)
+        if child is not None:
+            self._match(child, segments, index + 1, matched)
+        if segment != WILDCARD:
+            child = node.children.get(WILDCARD)
+            if child is not None:
+                self._match(child, segments, index + 1, matched)
+
+    def dispatch(self, changes):
+        """
+        Notifica a los listeners afectados, una vez cada uno, con el
+        subconjunto de cambios que les concierne.
+
+        Args:
+            changes: dict {path: (new_value, old_value)}
+        """
+        pending = {}
+        for path, change in changes.items():
+            for seq, callback in self.match(path):
+                if seq not in pending:
+                    pending[seq] = (callback, {})
+                pending[seq][1][path] = change
+
+        # Orden de suscripción
+        for seq in sorted(pending):
+            callback, subset = pending[seq]
+            try:
+                callback(subset)
+            except Exception as e:
+                console.log(f"[State] Listener error: {e}")
+
+        return len(pending)
+
+
+def _segments(path):
+    """Divide una ruta con punto en segmentos."""
+    if not path:
+        return []
+    return path.split('.')
+
+
+def _collect(node, matched):
+    """Agrega los listeners de un subárbol."""
+    matched.extend(node.listeners)
+    for child in node.children.values():
+        _collect(child, matched)
@@ -1,10 +1,11 @@
 # PromptCraft - WebSocket Client for Brython
 # Real-time notifications using browser.websocket
 
-from browser import window, document
+from browser import window
 import json
 
 from brython_modules.api_client import TokenManager
+from brython_modules.components.toast import get_toast_manager
 
 # WebSocket URL
 WS_BASE_URL = "ws://localhost/api/v1/ws"
@@ -206,32 +207,25 @@ def show_daily_goal_notification(data):
     _show_toast("🎯 Daily Goal Complete!", f"You earned {goal} XP today", "success")
 
 
-def _show_toast(title, message, type="info"):
-    """Show toast notification."""
-    # Create toast element
-    toast = document.createElement("div")
-    toast.className = f"toast toast-{type}"
-    toast.innerHTML = f"""
-        <div class="toast-title">{title}</div>
-        <div class="toast-message">{message}</div>
-    """
-
-    # Add to container
-    container = document.getElementById("toast-container")
-    if not container:
-        container = document.createElement("div")
-        container.id = "toast-container"
-        container.className = "fixed top-4 right-4 z-50 flex flex-col gap-2"
-        document.body.appendChild(container)
+# Estilos del gestor de toasts para cada tipo de notificación
+_TOAST_KINDS = {
+    "success": "success",
+    "warning": "warning",
+    "error": "error",
+    "info": "info",
+    "achievement": "badge",
+    "level-up": "xp",
+}
 
-    container.appendChild(toast)
 
-    # Auto remove after 4 seconds
-    def remove_toast():
-        if toast.parentNode:
-            toast.parentNode.removeChild(toast)
-
-    window.setTimeout(remove_toast, 4000)
+def _show_toast(title, message, type="info"):
+    """Show toast notification through the shared toast manager."""
+    get_toast_manager().show(
+        message,
+        kind=_TOAST_KINDS.get(type, "info"),
+        title=title,
+        duration=4000
+    )
 
 
 def setup_notifications():